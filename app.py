@@ -3,14 +3,39 @@ from flask import Flask
 from routes.stock_routes import stock_bp
 from routes.ticker_routes import ticker_bp
 from routes.etf_routes import etf_bp
+from routes.optimize_routes import optimize_bp
+from routes.batch_routes import batch_bp
+from routes.portfolio_routes import portfolio_bp
+from routes.live_routes import live_bp, sock
+from routes.scan_routes import scan_bp
+from routes.job_routes import job_bp
+from routes.bokeh_static import bokeh_static_bp
+from routes.chart_data_routes import chart_data_bp
+from routes.metrics_routes import metrics_bp
+from routes.montecarlo_routes import montecarlo_bp
+from monitoring import timing
 
 app = Flask(__name__)
 
+# 요청/구간별 처리 시간 측정 (Server-Timing 헤더, /metrics)
+timing.init_app(app)
+
 # 블루프린트 등록
 # url_prefix를 지정하면 해당 라우트의 모든 주소 앞에 붙습니다.
 app.register_blueprint(stock_bp, url_prefix='/')      # 메인 백테스트 화면
 app.register_blueprint(ticker_bp) # /ticker 경로 활성화
 app.register_blueprint(etf_bp)
+app.register_blueprint(optimize_bp) # /optimize 파라미터 최적화
+app.register_blueprint(batch_bp)    # /batch 일괄 백테스트
+app.register_blueprint(portfolio_bp)  # /portfolio 여러 종목 공유 현금 포트폴리오 백테스트
+app.register_blueprint(job_bp)      # /api/jobs 비동기 백테스트 작업
+app.register_blueprint(bokeh_static_bp)  # /bokeh/<버전>/static BokehJS 정적 파일
+app.register_blueprint(chart_data_bp)    # /api/chart 클라이언트 차트용 컬럼 데이터
+app.register_blueprint(montecarlo_bp)    # /api/montecarlo 매매 수익률 몬테카를로 (요청 시 계산)
+app.register_blueprint(metrics_bp)       # /metrics Prometheus 수집용 처리 시간
+app.register_blueprint(live_bp)          # /live, /ws/signals 봉 단위 신호 피드 (웹소켓)
+app.register_blueprint(scan_bp)          # /scan 전종목 장 마감 신호 조회
+sock.init_app(app)
 
 if __name__ == '__main__':
     port = int(os.environ.get("PORT", 10000))
@@ -0,0 +1,127 @@
+import zlib
+import threading
+import numpy as np
+import pandas as pd
+
+from data.ohlcv_store import KRX_COLUMNS
+
+# 벤치마크용 합성 데이터 (시드 고정 -> 매번 같은 데이터)
+SEED = 20240101
+DAILY_END = '2025-12-30'
+MINUTES_PER_SESSION = 381   # 09:00 ~ 15:20 1분봉
+INTRADAY_SESSIONS = 20
+
+# 크기 이름 -> 봉 개수 (1년/10년 일봉, 20거래일 1분봉)
+SIZES = {'1y': 245, '10y': 2450, 'intraday': INTRADAY_SESSIONS * MINUTES_PER_SESSION}
+
+N_STOCKS = 2700   # 코스피+코스닥 전종목 수 수준
+N_ETFS = 900
+
+
+def _random_walk(n, seed, start_price=50000):
+    """로그 정규 랜덤워크 OHLCV (가격은 원 단위 정수, 고가/저가가 시가/종가를 감싸도록)"""
+    rng = np.random.default_rng(seed)
+    close = np.round(start_price * np.exp(np.cumsum(rng.normal(0, 0.015, n))))
+    open_ = np.round(close * (1 + rng.normal(0, 0.005, n)))
+    high = np.round(np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.008, n))))
+    low = np.round(np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.008, n))))
+    volume = rng.integers(100_000, 10_000_000, n).astype('float64')
+    return open_, high, low, close, volume
+
+
+def _index(size):
+    if size == 'intraday':
+        days = pd.bdate_range(end=DAILY_END, periods=INTRADAY_SESSIONS)
+        minutes = pd.timedelta_range('09:00:00', periods=MINUTES_PER_SESSION, freq='min')
+        return pd.DatetimeIndex([d + m for d in days for m in minutes], name='Date')
+    return pd.bdate_range(end=DAILY_END, periods=SIZES[size], name='Date')
+
+
+def ohlcv(size, seed=SEED):
+    """전략/지표 벤치마크용 OHLCV DataFrame (Open/High/Low/Close/Volume, Date 인덱스)"""
+    index = _index(size)
+    open_, high, low, close, volume = _random_walk(len(index), seed)
+    return pd.DataFrame({'Open': open_, 'High': high, 'Low': low, 'Close': close, 'Volume': volume}, index=index)
+
+
+def krx_fetcher(seed=SEED):
+    """
+    pykrx get_market_ohlcv_by_date 대체 fetcher (10년 일봉에서 요청 구간만 잘라 반환)
+    티커마다 다른 시드를 써서 종목별로 다른 가격 경로
+    """
+    frames = {}
+
+    def fetch(from_date, to_date, ticker):
+        df = frames.get(ticker)
+        if df is None:
+            df = frames[ticker] = ohlcv('10y', seed + zlib.crc32(ticker.encode()) % 1000).rename(
+                columns={v: k for k, v in KRX_COLUMNS.items()})
+        return df.loc[pd.Timestamp(from_date):pd.Timestamp(to_date)].copy()
+    return fetch
+
+
+def _tickers(n, prefix):
+    return [f'{prefix}{i:05d}' for i in range(n)]
+
+
+def market_price_change(from_date=None, to_date=None, seed=SEED):
+    """pykrx get_market_price_change 형태의 전종목 등락률 스냅샷"""
+    rng = np.random.default_rng(seed)
+    tickers = _tickers(N_STOCKS, '0')
+    open_ = rng.integers(1_000, 500_000, N_STOCKS)
+    change = np.round(rng.normal(0, 3, N_STOCKS), 2)
+    close = np.round(open_ * (1 + change / 100)).astype('int64')
+    volume = rng.integers(1_000, 50_000_000, N_STOCKS)
+    return pd.DataFrame({
+        '종목명': [f'종목{i}' for i in range(N_STOCKS)], '시가': open_, '종가': close,
+        '변동폭': close - open_, '등락률': change, '거래량': volume, '거래대금': volume * close,
+    }, index=pd.Index(tickers, name='티커'))
+
+
+MARKET_SESSIONS = 400   # 전종목 일봉 스냅샷을 만드는 최근 거래일 수 (engine/scanner.py SCAN_BARS 이상)
+_market = {}
+_market_lock = threading.Lock()
+
+
+def _market_walks(seed):
+    """최근 MARKET_SESSIONS 거래일 x 전종목 랜덤워크 (시드별 1회 생성)"""
+    with _market_lock:
+        if seed in _market:
+            return _market[seed]
+        rng = np.random.default_rng(seed)
+        shape = (MARKET_SESSIONS, N_STOCKS)
+        close = np.round(rng.integers(1_000, 500_000, N_STOCKS) * np.exp(np.cumsum(rng.normal(0, 0.02, shape), axis=0)))
+        open_ = np.round(close * (1 + rng.normal(0, 0.005, shape)))
+        high = np.round(np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.008, shape))))
+        low = np.round(np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.008, shape))))
+        volume = rng.integers(1_000, 50_000_000, shape)
+        # 날짜 -> 행 dict (스캐너가 I/O 스레드 풀에서 동시에 조회)
+        rows = {d.strftime('%Y%m%d'): i for i, d in enumerate(pd.bdate_range(end=DAILY_END, periods=MARKET_SESSIONS))}
+        _market[seed] = (rows, open_, high, low, close, volume)
+    return _market[seed]
+
+
+def market_ohlcv(date, market='ALL', seed=SEED):
+    """pykrx get_market_ohlcv_by_ticker 형태의 전종목 일봉 스냅샷 (범위 밖 날짜는 빈 DataFrame)"""
+    rows, open_, high, low, close, volume = _market_walks(seed)
+    i = rows.get(date.replace('-', ''))
+    if i is None:
+        return pd.DataFrame()
+    prev = close[i - 1] if i else close[i]
+    return pd.DataFrame({
+        '시가': open_[i], '고가': high[i], '저가': low[i], '종가': close[i], '거래량': volume[i],
+        '거래대금': volume[i] * close[i], '등락률': np.round((close[i] / prev - 1) * 100, 2),
+    }, index=pd.Index(_tickers(N_STOCKS, '0'), name='티커'))
+
+
+def etf_price_change(from_date=None, to_date=None, seed=SEED):
+    """pykrx get_etf_price_change_by_ticker 형태의 ETF 등락률 스냅샷"""
+    df = market_price_change(seed=seed + 1).iloc[:N_ETFS].drop(columns='종목명')
+    df.index = pd.Index(_tickers(N_ETFS, '1'), name='티커')
+    return df
+
+
+def etf_names():
+    """data/ticker_names.py 의 ETF 티커 -> 종목명 마스터 테이블 형태"""
+    tickers = _tickers(N_ETFS, '1')
+    return pd.DataFrame({'티커': tickers, '종목명': [f'ETF{i}' for i in range(N_ETFS)]})
@@ -0,0 +1,131 @@
+"""
+부하 테스트: gunicorn 워커 수별 처리량 비교 (합성 데이터, pykrx 호출 없음)
+
+    python -m bench.load_test                          # 워커 1,2,4개로 각각 서버를 띄워 측정
+    python -m bench.load_test --workers 1,2 --duration 30 --concurrency 16
+    python -m bench.load_test --url http://host:10000  # 이미 떠 있는 서버에 부하만 발생
+
+- 요청: POST / (종목을 요청마다 바꿔서 결과 캐시를 타지 않는 백테스트+차트 생성)
+- --cached를 주면 같은 종목만 요청 (캐시 히트 경로)
+- 워커당 백테스트 프로세스는 1개로 고정해서 워커 수에 따른 변화만 봄
+"""
+import os
+import sys
+import time
+import socket
+import argparse
+import itertools
+import subprocess
+import threading
+from statistics import median
+
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STRATEGY_NAMES = ['slope', 'cross', 'macd', 'rsi', 'adx', 'vwap']
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def start_server(workers, port, threads):
+    """bench.stub_app을 gunicorn으로 실행하고 응답할 때까지 대기"""
+    env = dict(os.environ, WEB_CONCURRENCY=str(workers), JTRADER_THREADS=str(threads),
+               JTRADER_BACKTEST_WORKERS='1')
+    proc = subprocess.Popen([sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py',
+                             '--bind', f'127.0.0.1:{port}', 'bench.stub_app:app'],
+                            cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.time() + 120
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f'gunicorn 종료됨 (code {proc.returncode})')
+        try:
+            if requests.get(f'http://127.0.0.1:{port}/metrics', timeout=1).ok:
+                return proc
+        except requests.RequestException:
+            time.sleep(0.5)
+    proc.terminate()
+    raise RuntimeError('gunicorn 시작 시간 초과')
+
+
+def run_load(base_url, concurrency, duration, cached=False):
+    """concurrency개 스레드가 duration초 동안 요청 반복, 처리량/지연 통계 반환"""
+    counter = itertools.count()
+    latencies, errors = [], []
+    lock = threading.Lock()
+    stop_at = time.time() + duration
+
+    def worker():
+        session = requests.Session()
+        while time.time() < stop_at:
+            i = next(counter)
+            form = {'ticker': '005930' if cached else f'{i % 100000:06d}',
+                    'from_date': '2024-01-01', 'to_date': '2025-12-30',
+                    'strategy': STRATEGY_NAMES[i % len(STRATEGY_NAMES)]}
+            start = time.perf_counter()
+            try:
+                resp = session.post(base_url + '/', data=form, timeout=300)
+                ok = resp.status_code == 200
+            except requests.RequestException:
+                ok = False
+            elapsed = time.perf_counter() - start
+            with lock:
+                (latencies if ok else errors).append(elapsed)
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    start = time.time()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.time() - start
+
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1] if latencies else float('nan')
+    return {'requests': len(latencies), 'errors': len(errors), 'rps': len(latencies) / wall,
+            'p50_ms': median(latencies) * 1000 if latencies else float('nan'), 'p95_ms': p95 * 1000}
+
+
+def _print_row(label, r, scale=''):
+    print(f"{label:<10} {r['requests']:>9} {r['errors']:>7} {r['rps']:>9.2f} {r['p50_ms']:>10.0f} {r['p95_ms']:>10.0f}"
+          f" {scale:>7}", flush=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='jtrader 부하 테스트')
+    parser.add_argument('--workers', default='1,2,4', help='측정할 gunicorn 워커 수 (콤마 구분)')
+    parser.add_argument('--threads', type=int, default=8, help='워커당 스레드 수')
+    parser.add_argument('--concurrency', type=int, default=8, help='동시 요청 수')
+    parser.add_argument('--duration', type=float, default=20, help='워커 수별 측정 시간(초)')
+    parser.add_argument('--cached', action='store_true', help='같은 요청만 반복 (결과 캐시 경로)')
+    parser.add_argument('--url', help='이미 실행 중인 서버 주소 (지정하면 서버를 띄우지 않음)')
+    args = parser.parse_args(argv)
+
+    print(f"{'workers':<10} {'requests':>9} {'errors':>7} {'req/s':>9} {'p50 ms':>10} {'p95 ms':>10} {'scale':>7}")
+    if args.url:
+        _print_row('-', run_load(args.url.rstrip('/'), args.concurrency, args.duration, args.cached))
+        return 0
+
+    baseline_rps = None
+    for workers in [int(w) for w in args.workers.split(',') if w]:
+        port = _free_port()
+        proc = start_server(workers, port, args.threads)
+        try:
+            base_url = f'http://127.0.0.1:{port}'
+            run_load(base_url, args.concurrency, min(3, args.duration), args.cached)   # 워밍업
+            r = run_load(base_url, args.concurrency, args.duration, args.cached)
+        finally:
+            proc.terminate()
+            proc.wait(timeout=60)
+        # 첫 번째 워커 수 대비 처리량 배율
+        baseline_rps = baseline_rps or r['rps']
+        _print_row(str(workers), r, f"x{r['rps'] / baseline_rps:.2f}" if baseline_rps else '-')
+    print(f'(CPU {os.cpu_count()}개 - 처리량은 CPU 수까지 워커 수에 비례해서 늘어야 정상)')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,285 @@
+"""
+벤치마크 실행 (합성 데이터, pykrx 네트워크 호출 없음)
+
+    python -m bench.run                      # 전체 실행 후 bench/baseline.json과 비교
+    python -m bench.run --quick              # 분봉 제외, 1회 측정 (빠른 확인용)
+    python -m bench.run --only indicators    # indicators / strategies / routes 중 선택 (콤마 구분)
+    python -m bench.run --save-baseline      # 현재 결과를 기준값으로 저장
+
+- 각 항목은 1회 워밍업 후 repeat회 측정한 최솟값, 처리량(봉/초 또는 요청/초), 최대 메모리(tracemalloc)
+- 항목마다 고정 작업(calibrate) 시간도 재서 머신 속도 차이를 보정한 뒤, 기준값보다 tolerance 이상 느려지거나 메모리가 늘면 REGRESSION 표시 후 종료 코드 1
+- 기준값은 측정한 머신에 종속되므로 다른 환경에서는 --save-baseline으로 새로 만들 것
+"""
+import gc
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import tracemalloc
+import warnings
+
+# 앱 모듈 임포트 전에 캐시 디렉터리를 임시 폴더로 분리 (실제 .cache 오염 방지)
+os.environ['JTRADER_CACHE_DIR'] = tempfile.mkdtemp(prefix='jtrader-bench-')
+
+import numpy as np
+import pandas as pd
+import backtesting
+from backtesting import Backtest
+
+from bench import fixtures
+from engine.result_cache import result_cache
+from strategies import indicators
+from strategies.indicators import ADX_Indicator, MACD_Indicator, RSI_Indicator, VWAP_Indicator
+from strategies.registry import STRATEGIES
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+GROUPS = ('indicators', 'strategies', 'routes')
+
+
+_CALIBRATION_SERIES = pd.Series(np.random.default_rng(0).normal(size=200000))
+
+
+def calibrate(repeat=3):
+    """
+    고정 작업(pandas rolling/ewm + 파이썬 루프) 실행 시간 (초)
+    항목마다 측정해서 시간을 이 값으로 나눠 비교 -> 머신 부하/클럭 변동 영향 감소
+    """
+    def work():
+        start = time.perf_counter()
+        _CALIBRATION_SERIES.rolling(20).mean()
+        _CALIBRATION_SERIES.ewm(span=12).mean()
+        x = 0
+        for i in range(200000):
+            x += i
+        return time.perf_counter() - start
+    return min(work() for _ in range(repeat))
+
+
+class Case:
+    """벤치마크 항목: fn() 1회 실행 시간 측정, setup()은 매 실행 전 호출 (캐시 초기화 등)"""
+
+    def __init__(self, group, name, size, fn, units=1, unit='req', setup=None):
+        self.group = group
+        self.name = name
+        self.size = size
+        self.fn = fn
+        self.units = units
+        self.unit = unit
+        self.setup = setup
+
+    @property
+    def key(self):
+        return f'{self.group}:{self.name}:{self.size}'
+
+    def _call(self):
+        if self.setup:
+            self.setup()
+        gc.collect()
+        start = time.perf_counter()
+        self.fn()
+        return time.perf_counter() - start
+
+    def run(self, repeat):
+        self._call()   # 워밍업 (임포트/디스크 캐시 등 1회성 비용 제외)
+        # timeit과 같이 최솟값 사용 (다른 프로세스/GC로 인한 잡음 제외)
+        seconds = min(self._call() for _ in range(repeat))
+        calibration = calibrate()
+        # tracemalloc은 실행을 느리게 하므로 시간 측정과 분리해서 한 번 더 실행
+        if self.setup:
+            self.setup()
+        tracemalloc.start()
+        try:
+            self.fn()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        return {'seconds': seconds, 'throughput': self.units / seconds, 'unit': f'{self.unit}/s',
+                'peak_mb': peak / 1024 / 1024, 'calibration': calibration}
+
+
+# --- 지표 ---
+def _indicator_cases(sizes):
+    cases = []
+    for size in sizes:
+        df = fixtures.ohlcv(size)
+        h, l, c, v = df['High'], df['Low'], df['Close'], df['Volume']
+        calls = {
+            'ADX_Indicator': lambda h=h, l=l, c=c: ADX_Indicator(h, l, c, 14),
+            'MACD_Indicator': lambda c=c: MACD_Indicator(c, 12, 26, 9),
+            'RSI_Indicator': lambda c=c: RSI_Indicator(c, 14),
+            'VWAP_Indicator': lambda h=h, l=l, c=c, v=v: VWAP_Indicator(h, l, c, v),
+        }
+        # 공용 지표 캐시를 매번 비워서 실제 계산 시간 측정
+        cases += [Case('indicators', name, size, fn, len(df), 'bars', indicators.clear_cache)
+                  for name, fn in calls.items()]
+    return cases
+
+
+# --- 전략 (Backtest.run, 화면과 같은 자본금/수수료) ---
+def _strategy_cases(sizes):
+    cases = []
+    for size in sizes:
+        df = fixtures.ohlcv(size)
+        for name, strat in STRATEGIES.items():
+            def fn(df=df, strat=strat):
+                Backtest(df, strat, cash=10000000, commission=.002).run()
+            cases.append(Case('strategies', name, size, fn, len(df), 'bars', indicators.clear_cache))
+    return cases
+
+
+# --- 라우트 (Flask 테스트 클라이언트, pykrx는 합성 데이터로 대체) ---
+def install_stubs():
+    """pykrx 호출 지점을 bench/fixtures.py 합성 데이터로 교체"""
+    from pykrx import stock
+    import data.ticker_names as ticker_names
+    from data.ohlcv_store import ohlcv_store
+    from data.trading_calendar import trading_calendar
+
+    fetch = fixtures.krx_fetcher()
+    ohlcv_store.fetcher = fetch
+    trading_calendar.fetcher = fetch
+    stock.get_market_price_change = fixtures.market_price_change
+    stock.get_market_ohlcv_by_ticker = fixtures.market_ohlcv
+    stock.get_etf_price_change_by_ticker = fixtures.etf_price_change
+    ticker_names._load_etf_names = fixtures.etf_names
+
+
+def _clear_results():
+    result_cache.clear()
+    indicators.clear_cache()
+
+
+def _route_cases(sizes):
+    install_stubs()
+    from app import app
+    client = app.test_client()
+
+    def request(method, url, data=None, json=None):
+        def fn():
+            resp = client.open(url, method=method, data=data, json=json)
+            assert resp.status_code == 200, f'{url}: {resp.status_code}'
+            resp.get_data()
+        return fn
+
+    ranges = {'1y': '2025-01-01', '10y': '2016-01-04'}
+    cases = []
+    for size in sizes:
+        if size not in ranges:
+            continue   # OHLCV 저장소/화면은 일봉만 지원
+        form = {'ticker': '005930', 'from_date': ranges[size], 'to_date': fixtures.DAILY_END, 'strategy': 'macd'}
+        # cold: 결과/지표 캐시 없이 백테스트+차트 생성, cached: 결과 캐시 히트
+        cases.append(Case('routes', 'index', size, request('POST', '/', form), setup=_clear_results))
+        cases.append(Case('routes', 'index_cached', size, request('POST', '/', form)))
+    cases.append(Case('routes', 'ticker', 'default', request('GET', '/ticker')))
+    cases.append(Case('routes', 'ticker', 'all', request('POST', '/ticker', {'date': fixtures.DAILY_END})))
+    cases.append(Case('routes', 'etf', 'default', request('GET', '/etf')))
+    cases.append(Case('routes', 'etf', 'all', request('POST', '/etf', {'date': fixtures.DAILY_END})))
+    # setup에서 전종목 스캔을 끝내 두고(처음 1회만 실제 스캔), 측정은 날짜별 신호 테이블 조회
+    def scan_ready():
+        from data.trading_calendar import trading_calendar
+        from engine.scanner import signal_table
+        signal_table.scan_async(trading_calendar.latest_session(fixtures.DAILY_END)).result()
+    cases.append(Case('routes', 'scan', 'all', request('GET', f'/scan?date={fixtures.DAILY_END}'), setup=scan_ready))
+    # 몬테카를로 (매매 수 x 경로 수 상한 확인)
+    rng = np.random.default_rng(0)
+    for n in (100, 1000):
+        returns = rng.normal(0.005, 0.05, n).round(6).tolist()
+        cases.append(Case('routes', 'montecarlo', f'{n}trades', request('POST', '/api/montecarlo', json={'returns': returns})))
+    return cases
+
+
+BUILDERS = {'indicators': _indicator_cases, 'strategies': _strategy_cases, 'routes': _route_cases}
+
+
+def compare(results, baseline, tolerance):
+    """기준값 대비 변화율, 시간/메모리가 tolerance 이상 늘어난 항목 목록 반환"""
+    regressions = []
+    for key, r in results.items():
+        base = baseline.get(key)
+        if not base:
+            continue
+        # 기준값 측정 당시와 현재의 머신 속도 차이(calibration 비율)를 보정
+        r['time_change'] = (r['seconds'] / r['calibration']) / (base['seconds'] / base['calibration']) - 1
+        r['mem_change'] = r['peak_mb'] / base['peak_mb'] - 1 if base['peak_mb'] else 0.0
+        # 1MB 미만 메모리 차이는 측정 잡음으로 보고 무시
+        mem_regressed = r['mem_change'] > tolerance and r['peak_mb'] - base['peak_mb'] > 1
+        if r['time_change'] > tolerance or mem_regressed:
+            regressions.append(key)
+    return regressions
+
+
+def _format_row(key, r, regressed):
+    change = f"{r['time_change']:+.0%}" if 'time_change' in r else '-'
+    mem_change = f"{r['mem_change']:+.0%}" if 'mem_change' in r else '-'
+    flag = 'REGRESSION' if regressed else ''
+    return (f"{key:<40} {r['seconds'] * 1000:>10.2f} {r['throughput']:>14,.0f} {r['unit']:<8} "
+            f"{r['peak_mb']:>9.1f} {change:>7} {mem_change:>7}  {flag}")
+
+
+def _meta():
+    return {'python': platform.python_version(), 'platform': platform.platform(), 'cpus': os.cpu_count(),
+            'numpy': np.__version__, 'pandas': pd.__version__, 'backtesting': backtesting.__version__}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='jtrader 벤치마크')
+    parser.add_argument('--only', default=','.join(GROUPS), help='실행할 그룹 (콤마 구분)')
+    parser.add_argument('--sizes', default=','.join(fixtures.SIZES), help='데이터 크기 (1y,10y,intraday)')
+    parser.add_argument('--repeat', type=int, default=5, help='항목별 측정 횟수 (최솟값 사용)')
+    parser.add_argument('--quick', action='store_true', help='분봉 제외, 1회 측정')
+    parser.add_argument('--baseline', default=BASELINE_PATH, help='비교할 기준값 JSON')
+    parser.add_argument('--save-baseline', action='store_true', help='결과를 기준값 파일로 저장')
+    parser.add_argument('--tolerance', type=float, default=0.5, help='회귀 판정 기준 (0.5 = 50%% 느려짐)')
+    parser.add_argument('--json', help='결과를 JSON 파일로도 저장')
+    args = parser.parse_args(argv)
+
+    groups = [g for g in args.only.split(',') if g]
+    sizes = [s for s in args.sizes.split(',') if s]
+    repeat = args.repeat
+    if args.quick:
+        sizes = [s for s in sizes if s != 'intraday']
+        repeat = 1
+    unknown = [g for g in groups if g not in BUILDERS] + [s for s in sizes if s not in fixtures.SIZES]
+    if unknown:
+        parser.error(f'알 수 없는 그룹/크기: {", ".join(unknown)}')
+
+    baseline = {}
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+
+    warnings.filterwarnings('ignore')
+    print(f"{'benchmark':<40} {'ms':>10} {'throughput':>14} {'':<8} {'peak MB':>9} {'time':>7} {'mem':>7}")
+    results, regressions = {}, []
+    for group in groups:
+        for case in BUILDERS[group](sizes):
+            r = results[case.key] = case.run(repeat)
+            regressed = compare({case.key: r}, baseline, args.tolerance)
+            regressions += regressed
+            print(_format_row(case.key, r, regressed), flush=True)
+
+    report = {'meta': _meta(), 'results': results}
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump({'meta': report['meta'],
+                       'results': {k: {'seconds': r['seconds'], 'peak_mb': r['peak_mb'], 'calibration': r['calibration']}
+                                   for k, r in results.items()}},
+                      f, indent=2, sort_keys=True)
+        print(f'기준값 저장: {args.baseline}')
+    elif not baseline:
+        print('기준값 없음: --save-baseline으로 생성')
+
+    if regressions:
+        print(f'\n{len(regressions)}개 항목 성능 저하 (허용 {args.tolerance:.0%}): {", ".join(regressions)}')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,6 @@
+"""부하 테스트용 WSGI 앱: pykrx를 합성 데이터로 대체한 wsgi.app (gunicorn bench.stub_app:app)"""
+from bench.run import install_stubs
+
+install_stubs()
+
+from wsgi import app  # noqa: E402
@@ -0,0 +1,123 @@
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from pykrx.website.comm import webio
+
+# 동시 조회 스레드 수 / KRX 초당 요청 수 (환경변수로 변경 가능)
+KRX_WORKERS = int(os.environ.get('JTRADER_KRX_WORKERS', 4))
+KRX_RATE = float(os.environ.get('JTRADER_KRX_RATE', 5))
+KRX_TIMEOUT = float(os.environ.get('JTRADER_KRX_TIMEOUT', 30))
+
+
+class TokenBucket:
+    """
+    토큰 버킷 속도 제한: 초당 rate개 충전, 최대 capacity개까지 연속 허용
+    rate가 0 이하이면 제한 없음
+    """
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """토큰 1개를 얻을 때까지 대기"""
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class _PooledRequests:
+    """pykrx webio 모듈의 requests 자리에 들어가는 대체 객체 (get/post만 가로채고 나머지는 requests 그대로)"""
+
+    def __init__(self, client):
+        self._client = client
+
+    def get(self, url, **kwargs):
+        return self._client.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self._client.request('POST', url, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(requests, name)
+
+
+class KrxClient:
+    """
+    pykrx 호출 공용 창구
+    - HTTP: 연결을 재사용하는 Session 하나 (pykrx는 호출마다 새 연결을 엶) + 5xx/429 재시도
+    - 속도 제한: 모든 KRX 요청이 토큰 버킷을 거침 (KRX 차단 방지)
+    - call(): 전용 스레드 풀(workers개)에서 실행, 같은 key로 진행 중인 조회가 있으면 그 결과를 함께 기다림
+    프로세스마다 따로 동작하므로 프로세스 풀 워커는 각자 속도 제한을 가짐
+    """
+
+    def __init__(self, workers=KRX_WORKERS, rate=KRX_RATE, timeout=KRX_TIMEOUT):
+        self.workers = workers
+        self.rate = rate
+        self.timeout = timeout
+        self._reset()
+
+    def _reset(self):
+        # fork된 자식 프로세스는 부모의 스레드/소켓을 쓸 수 없으므로 새로 생성
+        self.bucket = TokenBucket(self.rate)
+        self.session = requests.Session()
+        retry = Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504), allowed_methods=None)
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.workers, max_retries=retry)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='jtrader-krx')
+        self._inflight = {}   # key -> Future
+        self._lock = threading.Lock()
+
+    def request(self, method, url, **kwargs):
+        """속도 제한을 거쳐 공용 Session으로 HTTP 요청"""
+        kwargs.setdefault('timeout', self.timeout)
+        self.bucket.acquire()
+        return self.session.request(method, url, **kwargs)
+
+    def install(self):
+        """pykrx가 쓰는 requests.get/post를 이 클라이언트로 교체"""
+        webio.requests = _PooledRequests(self)
+
+    def _forget(self, key, future):
+        with self._lock:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    def submit(self, key, fn, *args):
+        """fn(*args)를 스레드 풀에 제출 (같은 key가 진행 중이면 기존 Future 반환)"""
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                return future
+            future = self._inflight[key] = self._pool.submit(fn, *args)
+        # 이미 끝났으면 콜백이 바로 실행되므로 락 밖에서 등록
+        future.add_done_callback(lambda f: self._forget(key, f))
+        return future
+
+    def call(self, key, fn, *args):
+        """submit() 후 결과 대기 (공유되는 결과이므로 호출측에서 직접 수정하지 말 것)"""
+        return self.submit(key, fn, *args).result()
+
+
+# 앱 전역 KRX 클라이언트 (임포트 시 pykrx에 연결)
+krx_client = KrxClient()
+krx_client.install()
+os.register_at_fork(after_in_child=krx_client._reset)
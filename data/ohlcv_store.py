@@ -0,0 +1,259 @@
+import os
+import json
+import time
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+import numpy as np
+import pandas as pd
+from pykrx import stock
+
+try:
+    import fcntl
+except ImportError:    # Windows 개발 환경: 프로세스 간 잠금 없이 스레드 잠금만 사용
+    fcntl = None
+
+from data.krx_client import krx_client
+from monitoring.timing import span
+
+# 캐시 루트 디렉터리 (환경변수로 변경 가능)
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_DIR = os.environ.get('JTRADER_CACHE_DIR', os.path.join(BASE_DIR, '.cache'))
+
+COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+KRX_COLUMNS = {'시가': 'Open', '고가': 'High', '저가': 'Low', '종가': 'Close', '거래량': 'Volume'}
+
+
+def krx_fetcher(from_date, to_date, ticker):
+    """
+    기본 fetcher: pykrx 일봉 조회 (YYYYMMDD 문자열)
+    data/krx_client.py 스레드 풀에서 실행, 같은 종목/구간을 동시에 요청하면 한 번만 조회
+    """
+    with span('pykrx'):
+        return krx_client.call(('ohlcv', ticker, from_date, to_date),
+                               stock.get_market_ohlcv_by_date, from_date, to_date, ticker)
+
+
+def normalize_ohlcv(df, intraday=False):
+    """pykrx 컬럼명을 영문 OHLCV로 맞추고 Date 인덱스로 정리 (일봉은 날짜 단위로 절사)"""
+    df = df.rename(columns=KRX_COLUMNS).reindex(columns=COLUMNS).astype('float64')
+    df.index = pd.DatetimeIndex(df.index) if intraday else pd.DatetimeIndex(df.index).normalize()
+    df.index.name = 'Date'
+    return df.sort_index()
+
+
+def compact_array(values, column):
+    """
+    저장용 dtype 축소 (값이 그대로 보존될 때만)
+    가격: float32 / 거래량: int32 / 보존이 안 되면 float64 유지
+    줄어드는 것은 디스크/페이지 캐시 크기뿐, 읽을 때 float64로 다시 올림
+    """
+    arr = np.asarray(values, dtype='float64')
+    if column == 'Volume':
+        if np.isfinite(arr).all() and (arr == np.round(arr)).all() \
+                and (not len(arr) or (arr.min() >= 0 and arr.max() <= np.iinfo(np.int32).max)):
+            return arr.astype('int32')
+        return arr
+    small = arr.astype('float32')
+    return small if np.array_equal(small.astype('float64'), arr, equal_nan=True) else arr
+
+
+@contextmanager
+def file_lock(path):
+    """path 잠금 파일에 대한 프로세스 간 배타 잠금 (fcntl이 없는 환경에서는 잠금 없음)"""
+    if fcntl is None:
+        yield
+        return
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'a') as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def empty_ohlcv():
+    return pd.DataFrame(columns=COLUMNS, index=pd.DatetimeIndex([], name='Date'), dtype='float64')
+
+
+def _to_date(s):
+    return datetime.strptime(s.replace('-', ''), '%Y%m%d')
+
+
+def _to_str(d):
+    return d.strftime('%Y%m%d')
+
+
+class OhlcvStore:
+    """
+    종목별 OHLCV 로컬 저장소
+    - 컬럼별 .npy 파일로 저장하고 memory-map으로 읽음 (Date.npy 하나를 모든 컬럼이 공유)
+    - 저장된 구간 밖의 날짜만 fetcher로 증분 조회 (빈 결과는 저장 구간에 넣지 않음)
+    - 당일(장중) 데이터는 확정 전이므로 디스크에 저장하지 않고 live_ttl(초) 동안만 메모리에 보관
+    - compact: 가격 float32 / 거래량 int32로 저장 (값이 보존될 때만)
+      조회 결과는 항상 float64 (백테스트/지표 계산과 클라이언트 차트 인코딩이 float64 기준)
+    - intraday: 분봉 등 시각이 있는 인덱스 (fetcher가 해당 봉을 반환해야 함, pykrx는 일봉만 제공)
+    """
+
+    def __init__(self, root=None, fetcher=krx_fetcher, live_ttl=60, compact=None, intraday=False):
+        self.root = root or os.path.join(CACHE_DIR, 'ohlcv')
+        self.fetcher = fetcher
+        self.live_ttl = live_ttl
+        if compact is None:
+            compact = os.environ.get('JTRADER_OHLCV_COMPACT', '1') != '0'
+        self.compact = compact
+        self.intraday = intraday
+        self._live = {}
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+
+    def _lock(self, ticker):
+        with self._locks_guard:
+            return self._locks.setdefault(ticker, threading.Lock())
+
+    @contextmanager
+    def _locked(self, ticker):
+        """
+        종목 디렉터리 잠금 (스레드 잠금 + <ticker>/.lock 파일 flock)
+        프로세스 풀 워커/gunicorn 워커끼리도 컬럼 파일을 섞어 쓰거나 쓰는 도중에 읽지 않도록 함
+        """
+        with self._lock(ticker), file_lock(os.path.join(self._dir(ticker), '.lock')):
+            yield
+
+    def _dir(self, ticker):
+        return os.path.join(self.root, ticker)
+
+    def _fetch(self, ticker, from_dt, to_dt):
+        if from_dt > to_dt:
+            return empty_ohlcv()
+        return normalize_ohlcv(self.fetcher(_to_str(from_dt), _to_str(to_dt), ticker), self.intraday)
+
+    def _fetch_live(self, ticker, from_dt, to_dt):
+        key = (ticker, from_dt, to_dt)
+        hit = self._live.get(key)
+        if hit and time.time() - hit[0] < self.live_ttl:
+            return hit[1]
+        df = self._fetch(ticker, from_dt, to_dt)
+        # 날짜가 바뀌면 이전 당일 데이터는 의미 없으므로 정리
+        self._live = {k: v for k, v in self._live.items() if k[1] >= from_dt}
+        self._live[key] = (time.time(), df)
+        return df
+
+    # --- 디스크 입출력 ---
+    def _read_meta(self, ticker):
+        path = os.path.join(self._dir(ticker), 'meta.json')
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+
+    def _read(self, ticker):
+        d = self._dir(ticker)
+        dates = np.load(os.path.join(d, 'Date.npy'), mmap_mode='r')
+        cols = {c: np.load(os.path.join(d, f'{c}.npy'), mmap_mode='r') for c in COLUMNS}
+        return dates, cols
+
+    def _write(self, ticker, df, start, end):
+        d = self._dir(ticker)
+        os.makedirs(d, exist_ok=True)
+        arrays = {'Date': df.index.values.astype('datetime64[ns]')}
+        if self.compact:
+            arrays.update({c: compact_array(df[c], c) for c in COLUMNS})
+        else:
+            arrays.update({c: df[c].to_numpy(dtype='float64') for c in COLUMNS})
+        # 임시 파일에 쓴 뒤 교체 (읽는 쪽이 깨진 파일을 보지 않도록)
+        for name, arr in arrays.items():
+            tmp = os.path.join(d, f'{name}.tmp.npy')
+            np.save(tmp, arr)
+            os.replace(tmp, os.path.join(d, f'{name}.npy'))
+        tmp = os.path.join(d, 'meta.tmp.json')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'start': _to_str(start), 'end': _to_str(end)}, f)
+        os.replace(tmp, os.path.join(d, 'meta.json'))
+
+    def _load_frame(self, ticker):
+        dates, cols = self._read(ticker)
+        return pd.DataFrame({c: np.asarray(cols[c], dtype='float64') for c in COLUMNS},
+                            index=pd.DatetimeIndex(np.asarray(dates), name='Date'))
+
+    def _ensure(self, ticker, from_dt, to_dt):
+        """
+        [from_dt, to_dt] 구간(확정된 과거 일자)이 디스크에 있도록 보장
+        빈 조회 결과(상장 전, 조회 실패 등)로는 저장 구간을 넓히지 않음 -> 다음 요청에서 다시 조회
+        반환: 디스크에 저장된 데이터가 있는지 여부
+        """
+        meta = self._read_meta(ticker)
+        if meta is None:
+            df = self._fetch(ticker, from_dt, to_dt)
+            if df.empty:
+                return False
+            self._write(ticker, df, from_dt, to_dt)
+            return True
+
+        start, end = _to_date(meta['start']), _to_date(meta['end'])
+        if start <= from_dt and to_dt <= end:
+            return True
+
+        stored = self._load_frame(ticker)
+        parts = [stored]
+        if from_dt < start:
+            head = self._fetch(ticker, from_dt, start - timedelta(days=1))
+            if head.empty:
+                from_dt = start
+            parts.insert(0, head)
+        if to_dt > end:
+            # 마지막 저장 봉부터 다시 받아 수정주가(분할/병합) 변동 여부 확인
+            tail_from = stored.index[-1].to_pydatetime() if not stored.empty else end + timedelta(days=1)
+            tail = self._fetch(ticker, tail_from, to_dt)
+            if tail.empty:
+                to_dt = end
+            if not stored.empty and not tail.empty and tail.index[0] == stored.index[-1] \
+                    and not tail.iloc[0].equals(stored.iloc[-1]):
+                # 과거 가격이 재조정됨 -> 전체 구간 재수집
+                lo, hi = min(from_dt, start), max(to_dt, end)
+                refetched = self._fetch(ticker, lo, hi)
+                if not refetched.empty:
+                    self._write(ticker, refetched, lo, hi)
+                return True
+            parts.append(tail)
+
+        if min(from_dt, start) == start and max(to_dt, end) == end:
+            return True   # 새로 받은 봉 없음
+        merged = pd.concat(parts)
+        merged = merged[~merged.index.duplicated(keep='last')].sort_index()
+        self._write(ticker, merged, min(from_dt, start), max(to_dt, end))
+        return True
+
+    def get(self, ticker, from_date, to_date):
+        """
+        [from_date, to_date] 구간 OHLCV 반환 (YYYYMMDD 또는 YYYY-MM-DD)
+        컬럼: Open, High, Low, Close, Volume / 인덱스: Date
+        """
+        from_dt, to_dt = _to_date(from_date), _to_date(to_date)
+        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        closed_to = min(to_dt, today - timedelta(days=1))
+
+        parts = []
+        if from_dt <= closed_to:
+            with self._locked(ticker):
+                if self._ensure(ticker, from_dt, closed_to):
+                    dates, cols = self._read(ticker)
+                    lo = np.searchsorted(dates, np.datetime64(from_dt, 'ns'), side='left')
+                    # closed_to 당일의 장중 봉까지 포함
+                    hi = np.searchsorted(dates, np.datetime64(closed_to + timedelta(days=1), 'ns'), side='left')
+                    parts.append(pd.DataFrame({c: np.array(cols[c][lo:hi], dtype='float64') for c in COLUMNS},
+                                              index=pd.DatetimeIndex(np.array(dates[lo:hi]), name='Date')))
+
+        # 당일 구간은 실시간 조회 (live_ttl 동안은 메모리 재사용)
+        if to_dt >= today:
+            parts.append(self._fetch_live(ticker, max(from_dt, today), to_dt))
+
+        if not parts:
+            return empty_ohlcv()
+        df = pd.concat(parts) if len(parts) > 1 else parts[0]
+        return df[~df.index.duplicated(keep='last')]
+
+
+# 앱 전역 저장소
+ohlcv_store = OhlcvStore()
@@ -0,0 +1,114 @@
+import os
+import time
+import threading
+from collections import OrderedDict
+from datetime import datetime
+import pandas as pd
+
+from data.ohlcv_store import CACHE_DIR
+from monitoring.timing import span
+
+# 이 시각(HHMM, 시간외 단일가 종료) 이후에 조회한 데이터만 그 거래일의 확정 데이터로 봄
+SESSION_FINAL = os.environ.get('JTRADER_SESSION_FINAL', '1800')
+
+
+def session_final_at(date):
+    """date(YYYYMMDD) 데이터가 확정되는 시각 (epoch 초)"""
+    return datetime.strptime(date + SESSION_FINAL, '%Y%m%d%H%M').timestamp()
+
+
+class SnapshotCache:
+    """
+    일자별 전종목 스냅샷(DataFrame) 캐시
+    - 1단계: 프로세스 내 LRU / 2단계: 디스크 pickle
+    - 그 거래일 장 마감(SESSION_FINAL) 이후에 조회한 데이터는 바뀌지 않으므로 영구 보관
+    - 장중에 조회한 데이터는 today_ttl(초)이 지나면 다시 조회
+      (날짜가 지났어도 장중에 받아 둔 스냅샷이면 한 번 더 조회해 확정 데이터로 교체)
+    - 빈 결과(KRX 조회 실패/호출 제한 등)는 디스크에 저장하지 않고 empty_ttl(초) 동안만 메모리에 보관
+    반환된 DataFrame은 캐시와 공유되므로 호출측에서 직접 수정하지 말 것
+    """
+
+    def __init__(self, root=None, maxsize=32, today_ttl=300, empty_ttl=60):
+        self.root = root or os.path.join(CACHE_DIR, 'snapshots')
+        self.maxsize = maxsize
+        self.today_ttl = today_ttl
+        self.empty_ttl = empty_ttl
+        self._mem = OrderedDict()
+        self._guard = threading.Lock()
+        self._key_locks = {}
+
+    def _path(self, kind, date):
+        return os.path.join(self.root, kind, f'{date}.pkl')
+
+    def _is_fresh(self, date, loaded_at, ttl=None):
+        final_at = session_final_at(date)
+        if loaded_at >= final_at:
+            return True
+        # 장중 데이터는 TTL 안이라도 마감 시각이 지나면 만료
+        now = time.time()
+        return now < final_at and now - loaded_at < (self.today_ttl if ttl is None else ttl)
+
+    def _usable(self, date, hit, ttl=None):
+        if hit is None:
+            return False
+        loaded_at, df = hit
+        if df.empty:
+            return time.time() - loaded_at < self.empty_ttl
+        return self._is_fresh(date, loaded_at, ttl)
+
+    def _remember(self, key, loaded_at, df):
+        with self._guard:
+            self._mem[key] = (loaded_at, df)
+            self._mem.move_to_end(key)
+            while len(self._mem) > self.maxsize:
+                self._mem.popitem(last=False)
+
+    def get(self, kind, date, loader, ttl=None):
+        """
+        kind/date(YYYYMMDD) 스냅샷 반환, 없거나 만료되면 loader()로 조회
+        ttl: 장중 데이터 만료 시간(초), None이면 today_ttl 사용
+        """
+        key = (kind, date)
+        with self._guard:
+            hit = self._mem.get(key)
+            if self._usable(date, hit, ttl):
+                self._mem.move_to_end(key)
+                return hit[1]
+            lock = self._key_locks.setdefault(key, threading.Lock())
+
+        # 같은 키는 한 번만 조회하도록 직렬화
+        try:
+            with lock:
+                return self._load(key, date, loader, ttl)
+        finally:
+            # 조회가 끝난 키의 잠금은 정리 (요청된 날짜 수만큼 쌓이지 않도록)
+            with self._guard:
+                if self._key_locks.get(key) is lock:
+                    del self._key_locks[key]
+
+    def _load(self, key, date, loader, ttl):
+        with self._guard:
+            hit = self._mem.get(key)
+        if self._usable(date, hit, ttl):
+            return hit[1]
+
+        path = self._path(key[0], date)
+        if os.path.exists(path) and self._is_fresh(date, os.path.getmtime(path), ttl):
+            df = pd.read_pickle(path)
+            if not df.empty:
+                self._remember(key, os.path.getmtime(path), df)
+                return df
+
+        with span('pykrx'):
+            df = loader()
+        if not df.empty:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = path + '.tmp'
+            df.to_pickle(tmp)
+            os.replace(tmp, path)
+        self._remember(key, time.time(), df)
+        return df
+
+
+# 앱 전역 스냅샷 캐시
+snapshot_cache = SnapshotCache()
@@ -0,0 +1,25 @@
+from datetime import datetime
+import pandas as pd
+from pykrx.website.krx.etx.core import ETF_전종목기본종목
+
+from data.snapshot_cache import snapshot_cache
+
+
+def _load_etf_names():
+    # KRX 전종목 기본정보 1회 호출로 전체 티커/종목명 테이블 생성
+    df = ETF_전종목기본종목().fetch()
+    return pd.DataFrame({'티커': df['ISU_SRT_CD'].astype(str), '종목명': df['ISU_ABBRV'].astype(str)})
+
+
+def etf_name_table():
+    """ETF 티커 -> 종목명 마스터 테이블 (하루 1회 갱신)"""
+    today = datetime.now().strftime('%Y%m%d')
+    return snapshot_cache.get('etf_names', today, _load_etf_names, ttl=24 * 60 * 60)
+
+
+def attach_etf_names(df):
+    """'티커' 컬럼 기준으로 '종목명' 컬럼을 한 번의 merge로 붙여서 반환"""
+    names = etf_name_table()
+    out = df.merge(names, on='티커', how='left')
+    out['종목명'] = out['종목명'].fillna('')
+    return out
@@ -0,0 +1,103 @@
+import os
+import time
+import threading
+from datetime import datetime
+import numpy as np
+
+from data.ohlcv_store import CACHE_DIR, krx_fetcher
+
+# 거래일 판별 기준 종목 (pykrx 내부 영업일 조회와 동일)
+CALENDAR_TICKER = '000020'
+
+
+class TradingCalendar:
+    """
+    KRX 거래일 인덱스
+    - 최초 1회 기준 종목 일봉으로 거래일 목록을 만들고 디스크에 저장
+    - 이후 조회는 정렬된 배열에 대한 이진 탐색(O(log n))으로 처리
+    - 저장된 마지막 거래일 이후를 물을 때만 refresh_interval(초) 간격으로 증분 갱신
+    """
+
+    def __init__(self, path=None, fetcher=krx_fetcher, first_date='20000101', refresh_interval=60 * 60):
+        self.path = path or os.path.join(CACHE_DIR, 'calendar', 'sessions.npy')
+        self.fetcher = fetcher
+        self.first_date = first_date
+        self.refresh_interval = refresh_interval
+        self._sessions = None
+        self._refreshed_at = 0
+        self._lock = threading.Lock()
+
+    def _fetch_sessions(self, from_date, to_date):
+        df = self.fetcher(from_date, to_date, CALENDAR_TICKER)
+        return np.asarray(df.index.values, dtype='datetime64[D]')
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp = self.path + '.tmp.npy'
+        np.save(tmp, self._sessions)
+        os.replace(tmp, self.path)
+        self._refreshed_at = time.time()
+
+    def _load(self):
+        if self._sessions is not None:
+            return
+        if os.path.exists(self.path):
+            self._sessions = np.load(self.path)
+            self._refreshed_at = os.path.getmtime(self.path)
+            return
+        self._sessions = np.unique(self._fetch_sessions(self.first_date, datetime.now().strftime('%Y%m%d')))
+        self._save()
+
+    def _refresh(self):
+        last = self._sessions[-1].astype(datetime).strftime('%Y%m%d') if len(self._sessions) else self.first_date
+        new = self._fetch_sessions(last, datetime.now().strftime('%Y%m%d'))
+        self._sessions = np.unique(np.concatenate([self._sessions, new]))
+        self._save()
+
+    def sessions(self, day=None):
+        """거래일 배열(datetime64[D]) 반환, day가 마지막 거래일 이후면 필요 시 갱신"""
+        with self._lock:
+            self._load()
+            stale = time.time() - self._refreshed_at >= self.refresh_interval
+            if stale and (day is None or len(self._sessions) == 0 or day > self._sessions[-1]):
+                self._refresh()
+            return self._sessions
+
+    def _outside(self, day):
+        # first_date 이전은 캘린더에 없는 구간 (거래일을 모르므로 날짜를 그대로 씀)
+        return day < np.datetime64(datetime.strptime(self.first_date, '%Y%m%d'), 'D')
+
+    def latest_session(self, date):
+        """
+        date(YYYYMMDD / YYYY-MM-DD) 당일 또는 그 이전의 가장 최근 거래일 (없으면 None)
+        캘린더 시작(first_date) 이전 날짜는 YYYYMMDD로 그대로 반환
+        """
+        day = np.datetime64(datetime.strptime(date.replace('-', ''), '%Y%m%d'), 'D')
+        if self._outside(day):
+            return date.replace('-', '')
+        sessions = self.sessions(day)
+        i = np.searchsorted(sessions, day, side='right')
+        return None if i == 0 else sessions[i - 1].astype(datetime).strftime('%Y%m%d')
+
+    def next_session(self, date):
+        """date 당일 또는 그 이후의 가장 가까운 거래일 (없으면 None, 캘린더 시작 이전 날짜는 그대로 반환)"""
+        day = np.datetime64(datetime.strptime(date.replace('-', ''), '%Y%m%d'), 'D')
+        if self._outside(day):
+            return date.replace('-', '')
+        sessions = self.sessions(day)
+        i = np.searchsorted(sessions, day, side='left')
+        return None if i == len(sessions) else sessions[i].astype(datetime).strftime('%Y%m%d')
+
+    def trim(self, from_date, to_date):
+        """
+        [from_date, to_date]를 실제 거래일 구간으로 좁혀서 반환 (거래일이 없으면 None, None)
+        캘린더 시작 이전 끝점은 보정하지 않고 그대로 둠 (pykrx가 해당 구간의 거래일만 반환)
+        """
+        start, end = self.next_session(from_date), self.latest_session(to_date)
+        if start is None or end is None or start > end:
+            return None, None
+        return start, end
+
+
+# 앱 전역 거래일 캘린더
+trading_calendar = TradingCalendar()
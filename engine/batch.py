@@ -0,0 +1,72 @@
+import os
+from concurrent.futures import wait, FIRST_COMPLETED
+import numpy as np
+from backtesting import Backtest
+
+from data.ohlcv_store import ohlcv_store
+from engine import vectorized
+from engine.pool import get_process_pool, get_io_pool
+from strategies.registry import STRATEGIES
+
+# 요약표 컬럼
+SUMMARY_METRICS = ['Return [%]', 'Buy & Hold Return [%]', 'Sharpe Ratio', 'Max. Drawdown [%]', 'Win Rate [%]', '# Trades']
+# 한 번에 백테스트할 최대 종목 수 (요청 하나가 프로세스 풀을 오래 붙잡지 않도록)
+MAX_TICKERS = int(os.environ.get('JTRADER_BATCH_MAX_TICKERS', 500))
+
+
+def parse_tickers(text):
+    """콤마/공백/줄바꿈으로 구분된 티커 목록 (중복 제거, 입력 순서 유지)"""
+    tokens = text.replace(',', ' ').split()
+    return list(dict.fromkeys(t.strip() for t in tokens if t.strip()))
+
+
+def run_one(ticker, df, strat_name, cash=10000000, commission=.002):
+    """단일 종목 백테스트 결과 요약 (프로세스 풀 워커에서 실행)"""
+    row = {'ticker': ticker, 'bars': len(df)}
+    if len(df) < 2:
+        row.update({m: np.nan for m in SUMMARY_METRICS}, error='데이터 없음')
+        return row
+    if vectorized.supports(strat_name):
+        stats = vectorized.run_quick(df, strat_name, cash=cash, commission=commission)
+    else:
+        stats = Backtest(df, STRATEGIES[strat_name], cash=cash, commission=commission).run()
+    row.update({m: float(stats[m]) for m in SUMMARY_METRICS}, error='')
+    return row
+
+
+def _error_row(ticker, message):
+    return {'ticker': ticker, 'bars': 0, **{m: np.nan for m in SUMMARY_METRICS}, 'error': message}
+
+
+def iter_batch(tickers, strat_name, from_date, to_date, store=ohlcv_store):
+    """
+    여러 종목을 병렬로 백테스트하고 끝나는 순서대로 요약 행을 yield
+    - 시세 조회: I/O 스레드 풀에서 동시에 prefetch
+    - 백테스트: 데이터가 도착하는 대로 프로세스 풀에 제출
+    """
+    io_pool, cpu_pool = get_io_pool(), get_process_pool()
+    fetches = {io_pool.submit(store.get, t, from_date, to_date): t for t in tickers}
+    runs = {}
+    pending = set(fetches)
+    try:
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for f in done:
+                if f in fetches:
+                    ticker = fetches[f]
+                    try:
+                        run = cpu_pool.submit(run_one, ticker, f.result(), strat_name)
+                    except Exception as e:
+                        yield _error_row(ticker, str(e))
+                        continue
+                    runs[run] = ticker
+                    pending.add(run)
+                else:
+                    try:
+                        yield f.result()
+                    except Exception as e:
+                        yield _error_row(runs[f], str(e))
+    finally:
+        # 클라이언트가 중간에 끊으면 남은 작업 취소
+        for f in pending:
+            f.cancel()
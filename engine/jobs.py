@@ -0,0 +1,127 @@
+import json
+import time
+import uuid
+import hashlib
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+from concurrent.futures.process import BrokenProcessPool
+
+from engine.pool import get_process_pool, reset_process_pool
+
+
+def _run_backtest_job(ticker, from_date, to_date, strat_name, params):
+    # 워커 프로세스에서 실행 (Flask/Bokeh 모듈은 워커 안에서 임포트)
+    from routes.backtest_view import render_backtest
+    return render_backtest(ticker, from_date, to_date, strat_name, params)
+
+
+def request_hash(ticker, from_date, to_date, strat_name, params):
+    """동일 요청 판별용 해시 (파라미터 순서와 무관)"""
+    payload = json.dumps([ticker, from_date.replace('-', ''), to_date.replace('-', ''), strat_name, params or {}],
+                         sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+class BacktestJobQueue:
+    """
+    백테스트 비동기 작업 큐
+    - submit()은 바로 job id를 반환하고 실제 작업은 프로세스 풀에서 실행
+    - 같은 요청 해시는 진행 중/완료된 작업을 그대로 재사용
+    - 당일이 포함된 요청의 완료 결과는 live_ttl(초) 이후 다시 계산
+    """
+
+    def __init__(self, max_jobs=512, live_ttl=60):
+        self.max_jobs = max_jobs
+        self.live_ttl = live_ttl
+        self._jobs = OrderedDict()   # job_id -> job dict
+        self._by_hash = {}           # request hash -> job_id
+        self._lock = threading.Lock()
+
+    def _is_reusable(self, job):
+        if job['status'] == 'error':
+            return False
+        if job['status'] != 'done' or not job['live']:
+            return True
+        return time.time() - job['finished_at'] < self.live_ttl
+
+    def submit(self, ticker, from_date, to_date, strat_name, params=None):
+        key = request_hash(ticker, from_date, to_date, strat_name, params)
+        with self._lock:
+            job_id = self._by_hash.get(key)
+            if job_id in self._jobs and self._is_reusable(self._jobs[job_id]):
+                self._jobs.move_to_end(job_id)
+                return self._jobs[job_id]
+
+            job = {'id': uuid.uuid4().hex, 'hash': key, 'status': 'queued', 'result': None, 'error': None,
+                   'submitted_at': time.time(), 'finished_at': None,
+                   'live': to_date.replace('-', '') >= datetime.now().strftime('%Y%m%d'),
+                   'event': threading.Event()}
+            self._jobs[job['id']] = job
+            self._by_hash[key] = job['id']
+            while len(self._jobs) > self.max_jobs:
+                _, old = self._jobs.popitem(last=False)
+                if self._by_hash.get(old['hash']) == old['id']:
+                    del self._by_hash[old['hash']]
+
+        pool = get_process_pool()
+        try:
+            future = pool.submit(_run_backtest_job, ticker, from_date, to_date, strat_name, params)
+        except Exception as e:
+            # 풀이 깨졌거나 종료된 경우: 풀을 버리고, 대기 중인 요청이 멈추지 않도록 바로 에러로 완료 (재사용 안 됨)
+            reset_process_pool(pool)
+            job['error'] = f'작업 제출 실패: {e}'
+            job['status'] = 'error'
+            job['finished_at'] = time.time()
+            job['event'].set()
+            return job
+        job['status'] = 'running'
+        future.add_done_callback(lambda f: self._finish(job, f, pool))
+        return job
+
+    def _finish(self, job, future, pool=None):
+        try:
+            job['result'] = future.result()
+            job['status'] = 'done'
+        except BrokenProcessPool as e:
+            # 워커 프로세스가 죽으면 풀 전체가 깨지므로 다음 작업부터 새 풀 사용
+            reset_process_pool(pool)
+            job['error'] = f'워커 프로세스 종료: {e}'
+            job['status'] = 'error'
+        except Exception as e:
+            job['error'] = str(e)
+            job['status'] = 'error'
+        job['finished_at'] = time.time()
+        job['event'].set()
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def run(self, ticker, from_date, to_date, strat_name, params=None, timeout=None):
+        """submit() 후 완료까지 대기해서 작업 dict 반환 (요청 스레드는 대기만 하고 계산은 프로세스 풀에서)"""
+        job = self.submit(ticker, from_date, to_date, strat_name, params)
+        job['event'].wait(timeout)
+        return job
+
+    def wait(self, job_id, timeout=None):
+        """작업 완료까지 대기 (timeout 초과 시 현재 상태 그대로 반환)"""
+        job = self.get(job_id)
+        if job is not None:
+            job['event'].wait(timeout)
+        return job
+
+
+def job_view(job):
+    """API 응답용 dict (내부 필드 제외)"""
+    view = {'job_id': job['id'], 'status': job['status']}
+    if job['status'] == 'done':
+        view['result'] = job['result']
+    elif job['status'] == 'error':
+        view['error'] = job['error']
+    return view
+
+
+# 앱 전역 작업 큐
+job_queue = BacktestJobQueue()
@@ -0,0 +1,65 @@
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+# 앱 전역 실행 풀 (최초 사용 시 생성)
+_process_pool = None
+_io_pool = None
+_lock = threading.Lock()
+
+
+def get_process_pool():
+    """CPU 작업(백테스트)용 프로세스 풀 (워커가 죽어 깨진 풀은 새로 만듦)"""
+    global _process_pool
+    with _lock:
+        if _process_pool is not None and (getattr(_process_pool, '_broken', False)
+                                          or getattr(_process_pool, '_shutdown_thread', False)):
+            _process_pool.shutdown(wait=False, cancel_futures=True)
+            _process_pool = None
+        if _process_pool is None:
+            workers = int(os.environ.get('JTRADER_BACKTEST_WORKERS', 0)) or os.cpu_count() or 1
+            _process_pool = ProcessPoolExecutor(max_workers=workers)
+        return _process_pool
+
+
+def reset_process_pool(pool=None):
+    """BrokenProcessPool을 받은 호출측에서 풀을 버림 (pool을 주면 아직 그 풀일 때만), 다음 호출에서 새로 생성"""
+    global _process_pool
+    with _lock:
+        if _process_pool is not None and (pool is None or _process_pool is pool):
+            _process_pool.shutdown(wait=False, cancel_futures=True)
+            _process_pool = None
+
+
+def get_io_pool():
+    """네트워크/디스크 I/O(시세 조회)용 스레드 풀"""
+    global _io_pool
+    with _lock:
+        if _io_pool is None:
+            _io_pool = ThreadPoolExecutor(max_workers=int(os.environ.get('JTRADER_IO_WORKERS', 8)),
+                                          thread_name_prefix='jtrader-io')
+        return _io_pool
+
+
+def _warm_task():
+    # 워커 프로세스에서 전략/백테스트 모듈을 미리 임포트
+    import routes.backtest_view  # noqa: F401
+    return os.getpid()
+
+
+def warm_process_pool():
+    """프로세스 풀 워커를 미리 띄우고 모듈을 임포트 (첫 백테스트 요청의 지연 제거)"""
+    pool = get_process_pool()
+    workers = pool._max_workers
+    return sorted(set(f.result() for f in [pool.submit(_warm_task) for _ in range(workers)]))
+
+
+def _reset_after_fork():
+    # fork된 자식(gunicorn 워커 등)은 부모의 풀을 쓸 수 없으므로 새로 만들도록 초기화
+    global _process_pool, _io_pool, _lock
+    _process_pool = None
+    _io_pool = None
+    _lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
@@ -0,0 +1,317 @@
+import warnings
+from concurrent.futures import wait
+import numpy as np
+import pandas as pd
+from backtesting import Backtest
+from backtesting._stats import compute_stats
+
+from data.ohlcv_store import ohlcv_store
+from engine import vectorized
+from engine.pool import get_process_pool, get_io_pool
+from engine.screener import top_n
+from strategies.registry import STRATEGIES
+
+# 종목 비중 방식: 균등 / 변동성 역비례 (단면 중앙값 변동성 대비, 균등 비중의 0~2배)
+WEIGHTINGS = ['equal', 'inverse_vol']
+SUMMARY_METRICS = ['Return [%]', 'Buy & Hold Return [%]', 'CAGR [%]', 'Sharpe Ratio', 'Max. Drawdown [%]',
+                   'Win Rate [%]', '# Trades', 'Exposure Time [%]', 'Commissions [$]']
+FIELDS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+
+class Panel:
+    """
+    여러 종목 OHLCV를 날짜 x 종목 2차원으로 정렬한 것
+    - 날짜: 전 종목 거래일 합집합 (상장 전은 NaN)
+    - 상장 기간 중 빠진 날(거래정지 등)은 직전 종가로 채우고 거래량 0, 체결 불가(tradable=False)
+    - 마지막 거래일 이후(상장 폐지 등)도 마지막 종가로 채우고 체결 불가 -> simulate에서 그날 종가로 강제 청산
+    - frame['Close'] 등은 열이 종목인 DataFrame -> vectorized의 신호 함수를 그대로 적용
+    """
+
+    def __init__(self, index, tickers, frame, tradable):
+        self.index = index
+        self.tickers = list(tickers)
+        self.frame = frame
+        self.tradable = tradable
+        self.open = frame['Open'].to_numpy(dtype='float64')
+        self.close = frame['Close'].to_numpy(dtype='float64')
+
+    @classmethod
+    def from_frames(cls, frames):
+        """종목별 일봉 DataFrame dict -> Panel"""
+        frames = {t: df for t, df in frames.items() if len(df)}
+        raw = {f: pd.concat({t: df[f] for t, df in frames.items()}, axis=1).sort_index() for f in FIELDS}
+        return cls.from_raw(raw)
+
+    @classmethod
+    def from_raw(cls, raw):
+        """
+        필드별 날짜 x 종목 DataFrame(결측 NaN) -> Panel
+        상장 이후 빠진 날(거래정지, 마지막 거래일 이후)은 직전 종가로 채우고 거래량 0
+        """
+        close = raw['Close'].ffill()
+        listed = close.notna()
+        frame = {'Close': close}
+        for f in ['Open', 'High', 'Low']:
+            frame[f] = raw[f].fillna(close)
+        frame['Volume'] = raw['Volume'].fillna(0).where(listed)
+        return cls(close.index, close.columns, frame, raw['Close'].notna().to_numpy())
+
+    def __len__(self):
+        return len(self.index)
+
+    @property
+    def shape(self):
+        return self.close.shape
+
+    def ticker_frame(self, j):
+        """j번째 종목의 원래 일봉 (채운 날 제외)"""
+        rows = self.tradable[:, j]
+        return pd.DataFrame({f: self.frame[f].iloc[rows, j].to_numpy() for f in FIELDS}, index=self.index[rows])
+
+
+def load_panel(tickers, from_date, to_date, store=ohlcv_store):
+    """
+    I/O 스레드 풀에서 종목별 일봉을 동시에 조회해 Panel 생성 -> (Panel, {티커: 에러 메시지})
+    조회된 종목이 하나도 없으면 Panel 대신 None
+    """
+    io_pool = get_io_pool()
+    fetches = {t: io_pool.submit(store.get, t, from_date, to_date) for t in tickers}
+    frames, errors = {}, {}
+    for ticker, f in fetches.items():
+        try:
+            df = f.result()
+        except Exception as e:
+            errors[ticker] = str(e)
+            continue
+        if len(df) < 2:
+            errors[ticker] = '데이터 없음'
+            continue
+        frames[ticker] = df
+    if not frames:
+        return None, errors
+    return Panel.from_frames(frames), errors
+
+
+def _backtest_signals(df, strat_name, params):
+    """
+    상태가 있는 전략(돌파 후 리테스트, 지정가 등)용: 단일 종목 Backtest 매매 내역을 신호로 역변환
+    진입/청산이 체결된 봉의 직전 봉을 신호 봉으로 봄 (프로세스 풀 워커에서 실행)
+    """
+    trades = Backtest(df, STRATEGIES[strat_name], cash=10000000, commission=.002).run(**(params or {}))['_trades']
+    entries = np.zeros(len(df), dtype=bool)
+    exits = np.zeros(len(df), dtype=bool)
+    entries[trades['EntryBar'].to_numpy(dtype=int) - 1] = True
+    exits[trades['ExitBar'].to_numpy(dtype=int) - 1] = True
+    return entries, exits
+
+
+def panel_signals(panel, strat_name, params=None):
+    """
+    전 종목 신호를 한 번에 계산 -> (진입 2차원 마스크, 청산 2차원 마스크, 종목별 워밍업 봉 수)
+    vectorized.SIGNALS에 있는 전략은 날짜 x 종목 배열로 지표/신호를 계산하고,
+    나머지 전략은 종목별 Backtest 매매 내역에서 신호를 뽑아 같은 모양으로 맞춤
+    """
+    if vectorized.supports(strat_name):
+        entries, exits, indicators = vectorized.signal_arrays(panel.frame, strat_name, params)
+        # 열마다 첫 유효 지표 위치 (상장 전 NaN 구간 포함) = 종목별 워밍업
+        warmup = np.max([np.isnan(ind).argmin(axis=0) for ind in indicators], axis=0) if indicators \
+            else np.zeros(panel.shape[1], dtype=int)
+        return np.asarray(entries, dtype=bool), np.asarray(exits, dtype=bool), warmup
+
+    entries = np.zeros(panel.shape, dtype=bool)
+    exits = np.zeros(panel.shape, dtype=bool)
+    pool = get_process_pool()
+    futures = [pool.submit(_backtest_signals, panel.ticker_frame(j), strat_name, params) for j in range(panel.shape[1])]
+    wait(futures)
+    for j, f in enumerate(futures):
+        rows = np.flatnonzero(panel.tradable[:, j])
+        e, x = f.result()
+        entries[rows[e], j] = True
+        exits[rows[x], j] = True
+    return entries, exits, np.zeros(panel.shape[1], dtype=int)
+
+
+def _scores(close, lookback):
+    """순위 점수: lookback 봉 수익률 / 비중용 변동성: lookback 봉 일간 수익률 표준편차"""
+    prev = np.full_like(close, np.nan)
+    prev[lookback:] = close[:-lookback]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        momentum = close / prev - 1
+        returns = np.diff(close, axis=0, prepend=np.nan) / np.vstack([np.full((1, close.shape[1]), np.nan), close[:-1]])
+    vol = pd.DataFrame(returns).rolling(lookback).std().to_numpy()
+    return momentum, vol
+
+
+def simulate(panel, entries, exits, warmup=0, top=10, rebalance=21, lookback=60, weighting='equal',
+             cash=10000000, commission=.002):
+    """
+    공유 현금 하나로 여러 종목을 운용하는 롱 전용 포트폴리오 시뮬레이션
+    - i번째 봉 신호 -> i+1번째 봉 시가 체결 (vectorized.simulate와 같은 규칙, 수수료는 진입/청산 각각)
+    - 보유 종목 수는 최대 top개, 신규 진입 1건의 목표 금액 = 체결 시점 평가자산 x 비중 (정수 주, 현금 한도 내)
+    - 청산 신호: 보유 종목을 다음 봉 시가에 전량 매도
+    - 리밸런싱 봉(rebalance 봉마다, 0이면 리밸런싱 없이 신호로만 매매): 신호상 보유 구간(진입 후 청산 전)인 종목 중 lookback 수익률 상위 top개로 교체
+    - 그 사이 봉: 새 진입 신호가 난 종목을 빈 자리만큼 수익률 순으로 편입
+    - 패널 끝보다 먼저 거래가 끝난 종목(상장 폐지 등): 보유분을 마지막 거래일 종가로 강제 청산
+    반환: (매매 DataFrame(Ticker 컬럼 포함), 자산 곡선 ndarray, 봉별 보유 종목 수 ndarray, 마지막 봉 보유 종목 DataFrame)
+    """
+    o, c = panel.open, panel.close
+    n_bars, n_tickers = panel.shape
+    bars = np.arange(n_bars)[:, None]
+
+    live = bars >= 1 + np.asarray(warmup)
+    entries = entries & live
+    exits = exits & live & ~entries   # next()에서 진입 조건 다음 elif로 청산 조건을 봄
+
+    # 신호상 보유 구간: 진입 신호 이후 청산 신호 전까지
+    state = np.where(entries, 1.0, np.where(exits, 0.0, np.nan))
+    active = pd.DataFrame(state).ffill().to_numpy() == 1
+
+    momentum, vol = _scores(c, lookback)
+    fillable = np.zeros_like(panel.tradable)
+    fillable[:-1] = panel.tradable[1:]
+    rebalance_bar = np.zeros(n_bars, dtype=bool)
+    if rebalance > 0:
+        rebalance_bar[max(1, lookback)::rebalance] = True
+    base_weight = 1 / top
+    # 종목별 마지막 거래일, 패널 끝 전에 끝났으면 그 봉에서 강제 청산
+    last_traded = n_bars - 1 - panel.tradable[::-1].argmax(axis=0)
+    delisted_bar = np.zeros(n_bars, dtype=bool)
+    delisted_bar[last_traded[last_traded < n_bars - 1]] = True
+
+    shares = np.zeros(n_tickers, dtype=np.int64)
+    entry_price = np.zeros(n_tickers)
+    entry_bar = np.zeros(n_tickers, dtype=np.int64)
+    entry_commission = np.zeros(n_tickers)
+    holdings = np.zeros((n_bars, n_tickers), dtype=np.int64)
+    cash_curve = np.full(n_bars, float(cash))
+    cash_now = float(cash)
+    closed = []     # (종목, 수량, 진입봉, 청산봉, 진입가, 청산가, 수수료) 배열 묶음
+    last = 0        # 아직 보유 수량을 기록하지 않은 첫 봉
+
+    # 신호나 리밸런싱이 있는 봉만 순회 (종목 단위 루프 없음)
+    candidates = np.flatnonzero(rebalance_bar | delisted_bar | entries.any(axis=1) | exits.any(axis=1))
+    for i in candidates[candidates < n_bars - 1]:
+        forced = (shares > 0) & (last_traded == i) if delisted_bar[i] else None
+        if forced is not None and forced.any():
+            # 다음 봉이 없으므로 이 봉 종가에 청산 (이 봉부터 현금으로 평가)
+            holdings[last:i] = shares
+            cash_curve[last:i] = cash_now
+            last = i
+            j = np.flatnonzero(forced)
+            exit_commission = shares[j] * c[i, j] * commission
+            cash_now += float(np.sum(shares[j] * c[i, j] - exit_commission))
+            closed.append((j, shares[j], entry_bar[j], np.full(len(j), i), entry_price[j], c[i, j],
+                           entry_commission[j] + exit_commission))
+            shares[j] = 0
+
+        fill = i + 1
+        price = o[fill]
+        can_fill = fillable[i]
+        held = shares > 0
+        sell = held & exits[i] & can_fill
+
+        if rebalance_bar[i]:
+            # 체결할 수 없는 보유 종목(거래정지 등)은 그대로 두고 나머지 자리만 교체
+            slots = top - int((held & ~can_fill).sum())
+            pool = np.flatnonzero(active[i] & can_fill & np.isfinite(momentum[i]))
+            target = pool[top_n(momentum[i, pool], max(slots, 0))]
+            in_target = np.zeros(n_tickers, dtype=bool)
+            in_target[target] = True
+            sell |= held & ~in_target & can_fill
+            buy = target[~held[target]]
+        else:
+            pool = np.flatnonzero(entries[i] & ~held & can_fill)
+            slots = top - int((held & ~sell).sum())
+            buy = pool[top_n(momentum[i, pool], slots)] if slots > 0 else pool[:0]
+
+        if not sell.any() and not len(buy):
+            continue
+        holdings[last:fill] = shares
+        cash_curve[last:fill] = cash_now
+        last = fill
+
+        if sell.any():
+            j = np.flatnonzero(sell)
+            exit_commission = shares[j] * price[j] * commission
+            cash_now += float(np.sum(shares[j] * price[j] - exit_commission))
+            closed.append((j, shares[j], entry_bar[j], np.full(len(j), fill), entry_price[j], price[j],
+                           entry_commission[j] + exit_commission))
+            shares[j] = 0
+
+        if len(buy):
+            # 체결 시점 평가자산 (체결 못 하는 종목은 직전 종가로 평가)
+            mark = np.where(np.isnan(price), c[i], price)
+            equity = cash_now + float(np.nansum(shares * mark))
+            weights = np.full(len(buy), base_weight)
+            if weighting == 'inverse_vol':
+                median_vol = np.nanmedian(vol[i, can_fill]) if can_fill.any() else np.nan
+                with np.errstate(invalid='ignore', divide='ignore'):
+                    weights = base_weight * np.clip(np.nan_to_num(median_vol / vol[i, buy], nan=1.0), 0, 2)
+            for j, w in zip(buy, weights):
+                price_plus_commission = price[j] * (1 + commission)
+                size = int(min(equity * w, cash_now) // price_plus_commission)
+                if size <= 0:
+                    continue
+                shares[j] = size
+                entry_price[j] = price[j]
+                entry_bar[j] = fill
+                entry_commission[j] = size * price[j] * commission
+                cash_now -= size * price_plus_commission
+
+    holdings[last:] = shares
+    cash_curve[last:] = cash_now
+    # 상장 전 종가(NaN) x 보유 0주는 제외하고 평가
+    equity = cash_curve + np.nansum(np.where(holdings > 0, holdings * c, 0), axis=1)
+
+    j = np.flatnonzero(shares)
+    open_positions = pd.DataFrame({'Ticker': np.asarray(panel.tickers)[j], 'Size': shares[j],
+                                   'EntryTime': panel.index[entry_bar[j]], 'EntryPrice': entry_price[j],
+                                   'Close': c[-1, j], 'Value': shares[j] * c[-1, j],
+                                   'ReturnPct': c[-1, j] / entry_price[j] - 1})
+    open_positions = open_positions.sort_values('Value', ascending=False, kind='stable').reset_index(drop=True)
+    return _trade_frame(panel, closed), equity, (holdings > 0).sum(axis=1), open_positions
+
+
+def _trade_frame(panel, closed):
+    columns = ['Ticker'] + vectorized.TRADE_COLUMNS
+    if not closed:
+        trades = pd.DataFrame(columns=columns)
+        trades['Duration'] = pd.Series(dtype='timedelta64[ns]')
+        return trades
+    j, size, entry_bar, exit_bar, entry, exit_price, commissions = (np.concatenate(a) for a in zip(*closed))
+    trades = pd.DataFrame({
+        'Ticker': np.asarray(panel.tickers)[j], 'Size': size, 'EntryBar': entry_bar, 'ExitBar': exit_bar,
+        'EntryPrice': entry, 'ExitPrice': exit_price, 'SL': None, 'TP': None,
+        'PnL': size * (exit_price - entry) - commissions, 'Commission': commissions,
+        'ReturnPct': exit_price / entry - 1 - commissions / (size * entry),
+        'EntryTime': panel.index[entry_bar], 'ExitTime': panel.index[exit_bar], 'Tag': None,
+    }, columns=columns)
+    trades['Duration'] = trades['ExitTime'] - trades['EntryTime']
+    return trades.sort_values(['ExitBar', 'EntryBar'], kind='stable').reset_index(drop=True)
+
+
+def benchmark(panel, cash=10000000):
+    """비교 기준: 상장된 종목을 매일 균등 비중으로 보유한 자산 곡선"""
+    c = panel.close
+    with np.errstate(invalid='ignore', divide='ignore'), warnings.catch_warnings():
+        warnings.simplefilter('ignore', category=RuntimeWarning)   # 상장 종목이 없는 날의 nanmean
+        daily = np.nan_to_num(np.nanmean(np.diff(c, axis=0) / c[:-1], axis=1))
+    return cash * np.concatenate([[1.0], np.cumprod(1 + daily)])
+
+
+def run(panel, strat_name, params=None, top=10, rebalance=21, lookback=60, weighting='equal',
+        cash=10000000, commission=.002):
+    """
+    포트폴리오 백테스트 결과
+    {'stats': compute_stats 결과, 'equity': 자산 곡선 Series, 'benchmark': 균등 비중 기준 Series,
+     'trades': 매매 내역, 'holdings': 마지막 봉 보유 종목 DataFrame, 'positions': 봉별 보유 종목 수 Series}
+    """
+    entries, exits, warmup = panel_signals(panel, strat_name, params)
+    trades, equity, positions, holdings = simulate(panel, entries, exits, warmup, top, rebalance, lookback,
+                                                   weighting, cash, commission)
+    bench = benchmark(panel, cash)
+    stats = compute_stats(trades=trades, equity=equity, ohlc_data=pd.DataFrame({'Close': bench}, index=panel.index),
+                          strategy_instance=None)
+    return {'stats': vectorized.add_commissions(stats, trades), 'equity': pd.Series(equity, index=panel.index),
+            'benchmark': pd.Series(bench, index=panel.index), 'trades': trades, 'holdings': holdings,
+            'positions': pd.Series(positions, index=panel.index)}
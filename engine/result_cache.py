@@ -0,0 +1,58 @@
+import sys
+import threading
+from collections import OrderedDict
+
+
+def _result_size(result):
+    # 캐시 용량 계산용 (script/div 문자열이 대부분을 차지)
+    return sum(sys.getsizeof(v) for v in result.values())
+
+
+class ResultCache:
+    """
+    렌더링된 백테스트 결과(script, div, stats) 캐시
+    - 전체 크기가 max_bytes를 넘으면 가장 오래 안 쓴 항목부터 제거 (LRU)
+    - version이 있는 항목(당일 포함 구간)은 조회 시 version이 다르면 무효 처리
+    """
+
+    def __init__(self, max_bytes=128 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()   # key -> (version, result, size)
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key, version=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] != version:
+                # 새 봉이 들어와서 데이터가 바뀜
+                self._bytes -= entry[2]
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key, result, version=None):
+        size = _result_size(result)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old:
+                self._bytes -= old[2]
+            self._entries[key] = (version, result, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, _, s) = self._entries.popitem(last=False)
+                self._bytes -= s
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+# 앱 전역 결과 캐시
+result_cache = ResultCache()
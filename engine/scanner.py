@@ -0,0 +1,400 @@
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from pykrx import stock
+
+from data.ohlcv_store import CACHE_DIR, file_lock
+from data.snapshot_cache import session_final_at, snapshot_cache
+from data.trading_calendar import trading_calendar
+from engine import portfolio, vectorized
+from engine.pool import get_io_pool
+from monitoring.timing import span
+from strategies.indicators import RSI_Indicator, HIGHEST, LOWEST
+from strategies.registry import STRATEGIES
+
+# 전종목 장 마감 신호 스캐너
+# - 데이터: 거래일별 전종목 OHLCV 스냅샷(pykrx get_market_ohlcv_by_ticker, 하루 1회 호출)을 스냅샷 캐시에 보관하고
+#   최근 SCAN_BARS 거래일을 날짜 x 종목 2차원 배열로 쌓음 (종목별 일봉 조회 없음)
+# - 계산: 전략마다 지표를 2차원 배열로 한 번에 계산하고 마지막 봉의 진입/청산 조건만 읽음
+# - 결과: 날짜별 신호 테이블(.npz)과 날짜 -> 전략별 종목 수 인덱스(index.json)로 저장, 화면은 조회만 함
+SCAN_BARS = int(os.environ.get('JTRADER_SCAN_BARS', 300))
+SCAN_DIR = os.path.join(CACHE_DIR, 'scan')
+SIDES = ['entry', 'exit']
+KRX_FIELDS = {'시가': 'Open', '고가': 'High', '저가': 'Low', '종가': 'Close', '거래량': 'Volume'}
+# 액면분할 등으로 기준가가 전일 종가와 이만큼 넘게 다르면 이전 봉 가격을 보정
+ADJUST_THRESHOLD = 0.02
+
+
+def market_snapshot(date):
+    """date(YYYYMMDD) 전종목 OHLCV (지난 거래일은 디스크에 영구 보관)"""
+    return snapshot_cache.get('market_ohlcv', date, lambda: stock.get_market_ohlcv_by_ticker(date, market='ALL'))
+
+
+def scan_sessions(date, bars=SCAN_BARS):
+    """date 이전(포함) 최근 bars개 거래일 (YYYYMMDD 목록)"""
+    day = np.datetime64(datetime.strptime(date, '%Y%m%d'), 'D')
+    sessions = trading_calendar.sessions(day)
+    end = np.searchsorted(sessions, day, side='right')
+    return [d.astype(datetime).strftime('%Y%m%d') for d in sessions[max(0, end - bars):end]]
+
+
+def build_panel(date, bars=SCAN_BARS):
+    """
+    최근 bars 거래일 스냅샷을 쌓아 portfolio.Panel 생성 (종목: date 당일 스냅샷에 있는 종목)
+    - 거래정지(시가 0) 봉은 종가만 사용
+    - 스냅샷 가격은 수정주가가 아니므로 등락률의 기준가로 분할/병합 이전 가격을 보정
+    """
+    sessions = scan_sessions(date, bars)
+    io_pool = get_io_pool()
+    snapshots = list(io_pool.map(market_snapshot, sessions))
+    universe = snapshots[-1].index
+
+    arrays = {f: np.full((len(sessions), len(universe)), np.nan) for f in KRX_FIELDS.values()}
+    change = np.full((len(sessions), len(universe)), np.nan)
+    for i, df in enumerate(snapshots):
+        if df.empty:
+            continue
+        df = df.reindex(universe)
+        for krx, field in KRX_FIELDS.items():
+            arrays[field][i] = df[krx].to_numpy(dtype='float64')
+        change[i] = df['등락률'].to_numpy(dtype='float64')
+    suspended = arrays['Open'] == 0
+    for field in ['Open', 'High', 'Low']:
+        arrays[field][suspended] = np.nan
+
+    # 기준가(종가 / (1 + 등락률)) / 전일 종가 = 보정 비율, 이후 보정 비율의 누적곱을 이전 봉에 적용
+    close = arrays['Close']
+    with np.errstate(invalid='ignore', divide='ignore'):
+        ratio = close[1:] / (1 + change[1:] / 100) / close[:-1]
+    ratio = np.where(np.abs(ratio - 1) > ADJUST_THRESHOLD, ratio, 1.0)
+    factor = np.ones_like(close)
+    factor[:-1] = np.cumprod(ratio[::-1], axis=0)[::-1]
+    for field in ['Open', 'High', 'Low', 'Close']:
+        arrays[field] *= factor
+    arrays['Volume'] /= factor
+
+    index = pd.DatetimeIndex(pd.to_datetime(sessions), name='Date')
+    raw = {f: pd.DataFrame(a, index=index, columns=universe) for f, a in arrays.items()}
+    return portfolio.Panel.from_raw(raw)
+
+
+# --- 마지막 봉 조건: (panel, params) -> (진입 bool 배열, 청산 bool 배열), 종목 단위 ---
+def _last_row(panel, field):
+    return panel.frame[field].to_numpy(dtype='float64')[-1]
+
+
+def _bars_listed(panel):
+    # 종목별로 마지막 봉까지 쌓인 봉 수 (상장 전 NaN 제외)
+    return np.isfinite(panel.close).sum(axis=0)
+
+
+def _vectorized_last(panel, strat_name, p):
+    entries, exits, warmup = portfolio.panel_signals(panel, strat_name, p)
+    live = len(panel) - 1 >= 1 + warmup
+    entry, exit_ = entries[-1] & live, exits[-1] & live
+    return entry, exit_ & ~entry   # next()에서 진입 조건 다음 elif로 청산 조건을 봄
+
+
+def _fibonacci_last(panel, p):
+    hh = HIGHEST(panel.frame['High'], p['n_lookback'], 1)[-1]
+    ll = LOWEST(panel.frame['Low'], p['n_lookback'], 1)[-1]
+    o, low, c = _last_row(panel, 'Open'), _last_row(panel, 'Low'), panel.close[-1]
+    diff = hh - ll
+    with np.errstate(invalid='ignore'):
+        valid = np.isfinite(diff) & (diff != 0)
+        entry = valid & (hh - diff * 0.618 <= low) & (low <= hh - diff * 0.382) & (c > o)
+        exit_ = valid & ((c >= hh * 0.98) | (c < hh - diff * 0.786))
+    return entry, exit_
+
+
+def _v_breakout_last(panel, p):
+    high = panel.frame['High'].to_numpy(dtype='float64')
+    low = panel.frame['Low'].to_numpy(dtype='float64')
+    target = _last_row(panel, 'Open') + (high[-2] - low[-2]) * p['k']
+    with np.errstate(invalid='ignore'):
+        entry = high[-1] >= target
+    # 보유 다음 날 시가에 무조건 청산하는 전략이라 청산 신호는 따로 없음
+    return entry, np.zeros_like(entry)
+
+
+def _rsi_div_last(panel, p):
+    close = panel.close
+    rsi = RSI_Indicator(panel.frame['Close'], p['n_rsi'])
+    t = len(panel) - 1
+    lookback = p['lookback']
+    warmup = np.isnan(rsi).argmin(axis=0)
+    live = (_bars_listed(panel) >= lookback + 5) & (t >= 1 + warmup)
+    if t < 4:
+        return np.zeros(close.shape[1], dtype=bool), np.zeros(close.shape[1], dtype=bool)
+
+    def divergence(sign, level):
+        # sign=1: 저점(매수), -1: 고점(매도) / 직전 봉이 RSI 꼭지점이고 lookback 안의 이전 꼭지점과 비교
+        with np.errstate(invalid='ignore'):
+            r = sign * rsi
+            pivot = (r[1:-1] < r[:-2]) & (r[1:-1] < r[2:])
+            current = (r[t - 1] < r[t - 2]) & (r[t - 1] < r[t]) & (sign * rsi[t - 1] < sign * level)
+            # 4봉 전까지의 마지막 꼭지점 (pivot[k]는 k+1번째 봉)
+            first = max(0, t + 2 - lookback)
+            window = pivot[max(0, first - 1):t - 4]
+            rows = np.arange(max(0, first - 1), t - 4)[:, None] + 1
+            prev = np.where(window, rows, -1).max(axis=0, initial=-1)
+            found = prev >= first
+            prev = np.where(found, prev, 0)
+            cols = np.arange(rsi.shape[1])
+            prev_rsi, prev_close = rsi[prev, cols], close[prev, cols]
+            return (live & current & found & (prev_rsi != 0) & (sign * rsi[t - 1] > sign * prev_rsi)
+                    & (sign * close[t - 1] < sign * prev_close))
+
+    return divergence(1, 40), divergence(-1, 60)
+
+
+def _sr_flip_last(panel, p):
+    """상태 기계를 봉 순서대로 진행 (종목 방향은 배열 연산)"""
+    resistance = HIGHEST(panel.frame['High'], p['n_lookback'], 1)
+    low = panel.frame['Low'].to_numpy(dtype='float64')
+    o, c = panel.open, panel.close
+    n_bars, n = c.shape
+    start = 1 + np.isnan(resistance).argmin(axis=0)
+    IDLE, BREAKOUT, RETEST, LONG = 0, 1, 2, 3
+    state = np.zeros(n, dtype=np.int8)
+    level = np.zeros(n)
+    entry_price = np.full(n, np.nan)
+    bought = np.zeros(n, dtype=bool)
+    threshold = p['retest_threshold']
+    entry = exit_ = np.zeros(n, dtype=bool)
+
+    with np.errstate(invalid='ignore'):
+        for i in range(n_bars):
+            live = i >= start
+            # 직전 봉 매수 주문을 이번 봉 시가에 체결
+            entry_price = np.where(bought, o[i], entry_price)
+
+            idle, breakout, retest, long_ = (state == IDLE) & live, (state == BREAKOUT) & live, \
+                (state == RETEST) & live, (state == LONG) & live
+            up = idle & (c[i] > resistance[i])
+            level = np.where(up, resistance[i], level)
+
+            to_retest = breakout & (low[i] <= level * (1 + threshold)) & (c[i] >= level * (1 - threshold))
+            to_idle = breakout & (c[i] < level * 0.97)
+            entry = retest & (c[i] > level)
+            exit_ = long_ & ((c[i] < level * 0.98) | (c[i] > entry_price * 1.10))
+
+            state = np.where(up, BREAKOUT, state)
+            state = np.where(to_retest, RETEST, state)
+            state = np.where(to_idle | exit_, IDLE, state)
+            state = np.where(entry, LONG, state)
+            bought = entry
+    return entry, exit_
+
+
+# 상태가 있거나 체결 방식이 다른 전략의 마지막 봉 조건 (나머지는 vectorized.SIGNALS)
+LAST_BAR = {
+    'fibonacci': _fibonacci_last,
+    'v_breakout': _v_breakout_last,
+    'rsi_div': _rsi_div_last,
+    'sr_flip': _sr_flip_last,
+}
+
+
+def scan_panel(panel, strategies=None):
+    """panel 마지막 봉 기준 전략별 (진입, 청산) 마스크 dict"""
+    out = {}
+    for name in strategies or STRATEGIES:
+        p = vectorized.resolve_params(name, None)
+        with span(f'scan_{name}'):
+            if name in LAST_BAR:
+                out[name] = LAST_BAR[name](panel, p)
+            else:
+                out[name] = _vectorized_last(panel, name, p)
+    return out
+
+
+class SignalTable:
+    """
+    날짜별 신호 테이블 저장소
+    - 날짜 파일(scan/YYYYMMDD.npz): 티커 배열 + 전략/방향별 bool 마스크 + 종가/등락률
+    - 인덱스(scan/index.json): 날짜 -> 전략 -> {'entry': 종목 수, 'exit': 종목 수}
+    - 그 거래일 장 마감(SESSION_FINAL) 이후에 한 스캔만 영구 보관
+    - 장중 스캔은 today_ttl(초) 동안만 메모리에 보관 (마감 시각이 지나면 다시 스캔)
+    """
+
+    def __init__(self, root=None, maxsize=8, today_ttl=300):
+        self.root = root or SCAN_DIR
+        self.maxsize = maxsize
+        self.today_ttl = today_ttl
+        self._mem = OrderedDict()   # 날짜 -> (생성 시각, 테이블 dict)
+        self._guard = threading.Lock()
+        self._date_locks = {}
+        self._scans = {}            # 날짜 -> 백그라운드 스캔 Future (실패한 것은 다음 요청 때까지 남김)
+        self._executor = None
+
+    def _path(self, date):
+        return os.path.join(self.root, f'{date}.npz')
+
+    def _index_path(self):
+        return os.path.join(self.root, 'index.json')
+
+    def index(self):
+        """저장된 날짜별 전략 신호 종목 수"""
+        try:
+            with open(self._index_path(), encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self, date, table):
+        os.makedirs(self.root, exist_ok=True)
+        arrays = {'tickers': table['tickers'], 'close': table['close'], 'change': table['change']}
+        for name, masks in table['signals'].items():
+            for side, mask in zip(SIDES, masks):
+                arrays[f'{name}:{side}'] = mask
+        tmp = self._path(date) + '.tmp.npz'
+        np.savez_compressed(tmp, **arrays)
+        os.replace(tmp, self._path(date))
+
+        # 인덱스 읽기-수정-쓰기는 다른 워커 프로세스와도 겹치지 않도록 파일 잠금
+        with self._guard, file_lock(self._index_path() + '.lock'):
+            index = self.index()
+            index[date] = table['counts']
+            tmp = self._index_path() + '.tmp'
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(dict(sorted(index.items())), f, ensure_ascii=False)
+            os.replace(tmp, self._index_path())
+
+    def _load(self, date):
+        path = self._path(date)
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as data:
+            signals = {}
+            for key in data.files:
+                if ':' in key:
+                    name, side = key.split(':')
+                    signals.setdefault(name, [None, None])[SIDES.index(side)] = data[key]
+            table = {'tickers': data['tickers'], 'close': data['close'], 'change': data['change']}
+        table['signals'] = {name: tuple(masks) for name, masks in signals.items()}
+        table['counts'] = _counts(table['signals'])
+        return table
+
+    def _remember(self, date, table, created):
+        with self._guard:
+            self._mem[date] = (created, table)
+            self._mem.move_to_end(date)
+            while len(self._mem) > self.maxsize:
+                self._mem.popitem(last=False)
+
+    def _fresh(self, date, created):
+        final_at = session_final_at(date)
+        if created >= final_at:
+            return True
+        now = time.time()
+        return now < final_at and now - created < self.today_ttl
+
+    def get(self, date, scan=True):
+        """date(YYYYMMDD, 거래일) 신호 테이블, 없으면 스캔해서 저장 (scan=False면 None)"""
+        with self._guard:
+            hit = self._mem.get(date)
+            if hit and self._fresh(date, hit[0]):
+                self._mem.move_to_end(date)
+                return hit[1]
+            lock = self._date_locks.setdefault(date, threading.Lock())
+
+        # 같은 날짜는 한 번만 스캔
+        with lock:
+            with self._guard:
+                hit = self._mem.get(date)
+            if hit and self._fresh(date, hit[0]):
+                return hit[1]
+            # 디스크에는 마감 이후 스캔만 있음
+            table = self._load(date)
+            if table is not None:
+                self._remember(date, table, os.path.getmtime(self._path(date)))
+                return table
+            if not scan:
+                return None
+            created = time.time()
+            table = run_scan(date)
+            if created >= session_final_at(date):
+                self._save(date, table)
+            self._remember(date, table, created)
+            return table
+
+    def scan_async(self, date):
+        """
+        백그라운드 스레드에서 get(date) 실행 -> Future (같은 날짜가 진행 중이면 그 Future)
+        전종목 스냅샷 조회가 오래 걸리므로 화면 요청 스레드에서는 스캔하지 않음
+        """
+        with self._guard:
+            future = self._scans.get(date)
+            if future is None or (future.done() and future.exception() is not None):
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='jtrader-scan')
+                future = self._scans[date] = self._executor.submit(self.get, date)
+                future.add_done_callback(lambda f: self._forget_scan(date, f))
+            return future
+
+    def pending(self, date):
+        """진행 중이거나 실패한 백그라운드 스캔 Future (없으면 None)"""
+        with self._guard:
+            return self._scans.get(date)
+
+    def _forget_scan(self, date, future):
+        if future.exception() is not None:
+            return
+        with self._guard:
+            if self._scans.get(date) is future:
+                del self._scans[date]
+
+    def lookup(self, date, strat_name, side='entry', scan=True):
+        """date에 strat_name 진입/청산 신호가 난 종목 DataFrame (티커, 종가, 등락률)"""
+        table = self.get(date, scan)
+        if table is None or strat_name not in table['signals']:
+            return None
+        rows = np.flatnonzero(table['signals'][strat_name][SIDES.index(side)])
+        return pd.DataFrame({'티커': table['tickers'][rows], '종가': table['close'][rows],
+                             '등락률': table['change'][rows]})
+
+
+def _counts(signals):
+    return {name: {side: int(mask.sum()) for side, mask in zip(SIDES, masks)} for name, masks in signals.items()}
+
+
+def run_scan(date, strategies=None):
+    """date 전종목 스캔 -> 신호 테이블 dict (저장은 SignalTable이 담당)"""
+    with span('scan_panel'):
+        panel = build_panel(date)
+    signals = scan_panel(panel, strategies)
+    snapshot = market_snapshot(date).reindex(panel.tickers)
+    return {'tickers': np.asarray(panel.tickers, dtype=str), 'signals': signals, 'counts': _counts(signals),
+            'close': snapshot['종가'].to_numpy(dtype='float64'), 'change': snapshot['등락률'].to_numpy(dtype='float64')}
+
+
+# 앱 전역 신호 테이블
+signal_table = SignalTable()
+
+
+def main(argv=None):
+    """장 마감 후 스캔 (cron 등): python -m engine.scanner [YYYYMMDD ...]"""
+    parser = argparse.ArgumentParser(description='전종목 장 마감 신호 스캔')
+    parser.add_argument('dates', nargs='*', help='스캔할 날짜 (YYYYMMDD, 기본: 최근 거래일)')
+    args = parser.parse_args(argv)
+    for date in args.dates or [datetime.now().strftime('%Y%m%d')]:
+        session = trading_calendar.latest_session(date)
+        started = time.perf_counter()
+        table = signal_table.get(session)
+        print(f'{session}: {len(table["tickers"])}종목 {time.perf_counter() - started:.1f}초', flush=True)
+        for name, counts in table['counts'].items():
+            print(f'  {name:<12} 진입 {counts["entry"]:>5}  청산 {counts["exit"]:>5}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,131 @@
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+
+# 필터 파라미터 -> (컬럼, 비교 연산, 값 변환)
+FILTERS = {
+    'min_close': ('종가', np.greater_equal, int),
+    'max_close': ('종가', np.less_equal, int),
+    'min_volume': ('거래량', np.greater_equal, int),
+    'max_volume': ('거래량', np.less_equal, int),
+    'min_amount': ('거래대금', np.greater_equal, int),
+    'max_amount': ('거래대금', np.less_equal, int),
+    'min_change': ('등락률', np.greater_equal, float),
+    'max_change': ('등락률', np.less_equal, float),
+}
+# 정렬 가능한 컬럼 (sort 쿼리 파라미터 허용 목록, 그 밖의 값은 DEFAULT_SORT)
+SORT_COLUMNS = ['시가', '종가', '등락률', '거래량', '거래대금']
+DEFAULT_SORT = '등락률'
+PER_PAGE = 100
+MAX_PER_PAGE = 500
+
+
+class ScreenTable:
+    """
+    스냅샷 DataFrame(인덱스: 티커)의 숫자 컬럼을 float64 NumPy 배열로 한 번만 변환해 둔 것
+    필터/정렬은 이 배열로 계산하고 원본 DataFrame은 화면에 보낼 행을 꺼낼 때만 사용
+    """
+
+    def __init__(self, df):
+        self.df = df
+        self.tickers = df.index.astype(str).to_numpy()
+        self.columns = {c: df[c].to_numpy(dtype='float64') for c in df.columns
+                        if pd.api.types.is_numeric_dtype(df[c])}
+
+    def __len__(self):
+        return len(self.tickers)
+
+
+_tables = OrderedDict()   # (kind, date) -> ScreenTable
+_tables_lock = threading.Lock()
+
+
+def screen_table(kind, date, df, maxsize=16):
+    """
+    (kind, date) 스냅샷의 ScreenTable (스냅샷 캐시가 같은 DataFrame을 주는 동안 재사용)
+    당일 스냅샷이 TTL로 다시 조회되면 DataFrame 객체가 바뀌므로 새로 변환
+    """
+    key = (kind, date)
+    with _tables_lock:
+        table = _tables.get(key)
+        if table is not None and table.df is df:
+            _tables.move_to_end(key)
+            return table
+    table = ScreenTable(df)
+    with _tables_lock:
+        _tables[key] = table
+        while len(_tables) > maxsize:
+            _tables.popitem(last=False)
+    return table
+
+
+def build_mask(table, params):
+    """
+    조건 전체를 하나의 bool 마스크로 계산 (DataFrame 복사 없음)
+    빈 값은 조건 없음, 숫자로 바꿀 수 없는 값은 해당 조건만 무시, NaN 행은 조건이 있으면 제외
+    """
+    mask = np.ones(len(table), dtype=bool)
+    tmp = np.empty(len(table), dtype=bool)
+    for name, (column, op, cast) in FILTERS.items():
+        raw = params.get(name)
+        if not raw or column not in table.columns:
+            continue
+        try:
+            value = cast(raw)
+        except ValueError:
+            continue
+        op(table.columns[column], value, out=tmp)
+        mask &= tmp
+    return mask
+
+
+def top_n(values, n, descending=True):
+    """
+    values 중 정렬 순서상 앞쪽 n개의 위치 (argpartition 후 n개만 정렬, 전체 정렬 없음)
+    NaN은 항상 맨 뒤, 같은 값은 원래 순서(위치) 순 -> 페이지 경계가 요청마다 바뀌지 않음
+    """
+    keys = np.where(np.isnan(values), np.inf, -values if descending else values)
+    positions = np.arange(len(keys))
+    if n < len(keys):
+        part = np.argpartition(keys, n - 1)
+        kth = keys[part[n - 1]]
+        # 경계값과 같은 값이 여러 개면 argpartition 선택이 임의이므로 위치가 앞선 것부터 채움
+        better = np.flatnonzero(keys < kth)
+        ties = np.flatnonzero(keys == kth)[:n - len(better)]
+        positions = np.concatenate([better, ties])
+    return positions[np.lexsort((positions, keys[positions]))][:n]
+
+
+def screen(table, params, sort=DEFAULT_SORT, descending=True, page=1, per_page=PER_PAGE):
+    """
+    필터 -> 정렬 -> 페이지 자르기
+    반환: {'rows': 해당 페이지 DataFrame(티커 컬럼 포함), 'tickers': 조건에 맞는 전체 티커,
+          'total', 'page', 'pages', 'per_page', 'sort', 'order'}
+    """
+    if sort not in SORT_COLUMNS or sort not in table.columns:
+        sort = DEFAULT_SORT
+    per_page = max(1, min(per_page, MAX_PER_PAGE))
+
+    matched = np.flatnonzero(build_mask(table, params))
+    total = len(matched)
+    pages = max(1, -(-total // per_page))
+    page = max(1, min(page, pages))
+
+    start = (page - 1) * per_page
+    # 현재 페이지 끝까지만 부분 정렬
+    order = top_n(table.columns[sort][matched], min(total, page * per_page), descending)[start:]
+    rows = table.df.iloc[matched[order]].reset_index()
+    return {'rows': rows, 'tickers': table.tickers[matched].tolist(), 'total': total, 'page': page,
+            'pages': pages, 'per_page': per_page, 'sort': sort, 'order': 'desc' if descending else 'asc'}
+
+
+def page_args(values):
+    """요청 값(request.values)에서 정렬/페이지 인자 추출"""
+    def to_int(name, default):
+        try:
+            return int(values.get(name, default))
+        except (TypeError, ValueError):
+            return default
+    return {'sort': values.get('sort', DEFAULT_SORT), 'descending': values.get('order', 'desc') != 'asc',
+            'page': to_int('page', 1), 'per_page': to_int('per_page', PER_PAGE)}
@@ -0,0 +1,356 @@
+import re
+import math
+import time
+from datetime import datetime
+import pandas as pd
+
+from data.ohlcv_store import ohlcv_store, COLUMNS
+from engine.vectorized import resolve_params
+from strategies.incremental import RollingMean, RollingExtreme, RSI, MACD, ADX, VWAP
+
+
+class CrossUp:
+    """a가 b를 상향 돌파한 봉인지 (vectorized.cross_up과 같은 조건, 매 봉 호출해야 직전 값이 유지됨)"""
+
+    def __init__(self):
+        self.prev = (math.nan, math.nan)
+
+    def update(self, a, b):
+        prev_a, prev_b = self.prev
+        self.prev = (a, b)
+        return prev_a < prev_b and a > b
+
+
+# --- 전략별 증분 신호: indicators(bar) -> {지표: 값}, signals(bar, 값, 준비 여부, 진입가) -> (진입, 청산) ---
+# 지표 목록은 vectorized.SIGNALS / 전략 self.I와 같은 것 (워밍업 판정에 사용)
+# 신호는 i번째 봉 종가 시점 조건 (체결은 다음 봉 시가)
+class _Stream:
+    # True: next()가 진입 조건 다음 elif로 청산을 봄 -> 진입 조건이 참인 봉은 청산 없음
+    exit_after_entry = True
+
+    def __init__(self, p):
+        self.p = p
+
+
+class _SlopeStream(_Stream):
+    def __init__(self, p):
+        super().__init__(p)
+        self.sma = RollingMean(p['n1'])
+        self.prev_sma = self.prev_slope = math.nan
+
+    def indicators(self, bar):
+        return {'sma': self.sma.update(bar['Close'])}
+
+    def signals(self, bar, v, ready, entry_price):
+        slope, prev = v['sma'] - self.prev_sma, self.prev_slope
+        self.prev_sma, self.prev_slope = v['sma'], slope
+        return prev < 0 < slope, prev > 0 > slope
+
+
+class _CrossStream(_Stream):
+    def __init__(self, p):
+        super().__init__(p)
+        self.fast, self.slow = RollingMean(p['n_fast']), RollingMean(p['n_slow'])
+        self.up, self.down = CrossUp(), CrossUp()
+
+    def indicators(self, bar):
+        return {'fast': self.fast.update(bar['Close']), 'slow': self.slow.update(bar['Close'])}
+
+    def signals(self, bar, v, ready, entry_price):
+        return self.up.update(v['fast'], v['slow']), self.down.update(v['slow'], v['fast'])
+
+
+class _MacdStream(_Stream):
+    def __init__(self, p):
+        super().__init__(p)
+        self.macd = MACD(p['n_fast'], p['n_slow'], p['n_signal'])
+        self.up, self.down = CrossUp(), CrossUp()
+
+    def indicators(self, bar):
+        return dict(zip(['macd', 'signal', 'hist'], self.macd.update(bar['Close'])))
+
+    def signals(self, bar, v, ready, entry_price):
+        return self.up.update(v['macd'], v['signal']), self.down.update(v['signal'], v['macd'])
+
+
+class _RsiStream(_Stream):
+    def __init__(self, p):
+        super().__init__(p)
+        self.rsi = RSI(p['n_rsi'])
+        self.up, self.down = CrossUp(), CrossUp()
+
+    def indicators(self, bar):
+        return {'rsi': self.rsi.update(bar['Close'])}
+
+    def signals(self, bar, v, ready, entry_price):
+        return self.up.update(v['rsi'], self.p['rsi_low']), self.down.update(self.p['rsi_high'], v['rsi'])
+
+
+class _VwapStream(_Stream):
+    def __init__(self, p):
+        super().__init__(p)
+        self.vwap = VWAP()
+        self.up, self.down = CrossUp(), CrossUp()
+
+    def indicators(self, bar):
+        return {'vwap': self.vwap.update(bar['High'], bar['Low'], bar['Close'], bar['Volume'])}
+
+    def signals(self, bar, v, ready, entry_price):
+        return self.up.update(bar['Close'], v['vwap']), self.down.update(v['vwap'], bar['Close'])
+
+
+class _AdxStream(_Stream):
+    def __init__(self, p):
+        super().__init__(p)
+        self.adx = ADX(p['n'])
+        self.up, self.down = CrossUp(), CrossUp()
+
+    def indicators(self, bar):
+        return dict(zip(['adx', 'plus_di', 'minus_di'], self.adx.update(bar['High'], bar['Low'], bar['Close'])))
+
+    def signals(self, bar, v, ready, entry_price):
+        up = self.up.update(v['plus_di'], v['minus_di'])
+        return v['adx'] > self.p['adx_threshold'] and up, self.down.update(v['minus_di'], v['plus_di'])
+
+
+class _ComplexStream(_Stream):
+    def __init__(self, p):
+        super().__init__(p)
+        self.sma, self.rsi = RollingMean(p['n_sma']), RSI(p['n_rsi'])
+        self.macd = MACD(p['n_macd_f'], p['n_macd_s'], p['n_macd_sig'], adjust=True)
+        self.up, self.down = CrossUp(), CrossUp()
+
+    def indicators(self, bar):
+        macd, signal, _ = self.macd.update(bar['Close'])
+        return {'sma': self.sma.update(bar['Close']), 'rsi': self.rsi.update(bar['Close']),
+                'macd': macd, 'signal': signal}
+
+    def signals(self, bar, v, ready, entry_price):
+        up = self.up.update(v['macd'], v['signal'])
+        entry = bar['Close'] > v['sma'] and 50 <= v['rsi'] <= 60 and up
+        return entry, self.down.update(v['signal'], v['macd'])
+
+
+class _RsiSupportStream(_Stream):
+    def __init__(self, p):
+        super().__init__(p)
+        self.rsi = RSI(p['n_rsi'])
+        self.fast, self.slow = RollingMean(p['n_fast']), RollingMean(p['n_slow'])
+        self.down = CrossUp()
+
+    def indicators(self, bar):
+        return {'rsi': self.rsi.update(bar['Close']), 'fast': self.fast.update(bar['Close']),
+                'slow': self.slow.update(bar['Close'])}
+
+    def signals(self, bar, v, ready, entry_price):
+        broken = self.down.update(v['slow'], bar['Close'])
+        entry = v['fast'] > v['slow'] and 40 <= v['rsi'] <= 50 and bar['Close'] > bar['Open']
+        return entry, v['rsi'] >= 70 or broken
+
+
+class _FibonacciStream(_Stream):
+    exit_after_entry = False   # 매수 조건과 별개로 익절/손절 조건을 매 봉 확인
+
+    def __init__(self, p):
+        super().__init__(p)
+        self.hh = RollingExtreme(p['n_lookback'], 'max', shift=1)
+        self.ll = RollingExtreme(p['n_lookback'], 'min', shift=1)
+
+    def indicators(self, bar):
+        return {'hh': self.hh.update(bar['High']), 'll': self.ll.update(bar['Low'])}
+
+    def signals(self, bar, v, ready, entry_price):
+        hh, diff = v['hh'], v['hh'] - v['ll']
+        if diff != diff or diff == 0:
+            return False, False
+        entry = hh - diff * 0.618 <= bar['Low'] <= hh - diff * 0.382 and bar['Close'] > bar['Open']
+        return entry, bar['Close'] >= hh * 0.98 or bar['Close'] < hh - diff * 0.786
+
+
+class _SrFlipStream(_Stream):
+    """돌파 -> 리테스트 -> 반등 매수 상태 기계 (SrFlipStrategy.next와 같은 전이)"""
+    exit_after_entry = False
+
+    def __init__(self, p):
+        super().__init__(p)
+        self.resistance = RollingExtreme(p['n_lookback'], 'max', shift=1)
+        self.state = 'IDLE'
+        self.level = 0
+
+    def indicators(self, bar):
+        return {'resistance': self.resistance.update(bar['High'])}
+
+    def signals(self, bar, v, ready, entry_price):
+        if not ready:
+            return False, False
+        close = bar['Close']
+        if self.state == 'IDLE':
+            if close > v['resistance']:
+                self.state, self.level = 'BREAKOUT', v['resistance']
+        elif self.state == 'BREAKOUT':
+            threshold = self.p['retest_threshold']
+            if bar['Low'] <= self.level * (1 + threshold) and close >= self.level * (1 - threshold):
+                self.state = 'RETEST'
+            if close < self.level * 0.97:
+                self.state = 'IDLE'
+        elif self.state == 'RETEST':
+            if close > self.level:
+                self.state = 'LONG'
+                return True, False
+        elif self.state == 'LONG':
+            if entry_price is None:
+                self.state = 'IDLE'
+            elif close < self.level * 0.98 or close > entry_price * 1.10:
+                self.state = 'IDLE'
+                return False, True
+        return False, False
+
+
+# 전략 이름 -> 증분 신호 클래스
+# rsi_div(피벗 탐색)와 v_breakout(봉 중간 지정가 체결)은 봉 종가 신호로 옮길 수 없어 제외
+STREAMS = {
+    'slope': _SlopeStream,
+    'cross': _CrossStream,
+    'macd': _MacdStream,
+    'rsi': _RsiStream,
+    'vwap': _VwapStream,
+    'adx': _AdxStream,
+    'complex': _ComplexStream,
+    'rsi_support': _RsiSupportStream,
+    'fibonacci': _FibonacciStream,
+    'sr_flip': _SrFlipStream,
+}
+
+
+def supports(strat_name):
+    return strat_name in STREAMS
+
+
+def _clean(value):
+    # JSON 전송용 (NaN/inf -> None)
+    return value if isinstance(value, (bool, str)) or math.isfinite(value) else None
+
+
+def _date_str(ts):
+    return ts.strftime('%Y-%m-%d') if ts == ts.normalize() else ts.strftime('%Y-%m-%d %H:%M')
+
+
+def check_params(strat_name, params):
+    """
+    사용자 지정 파라미터 검증 (스트림 시작 전에 걸러서 신호 도중에 깨지지 않도록)
+    - dict가 아니거나 기본값과 타입이 맞지 않으면 ValueError, 없는 이름은 AttributeError
+    - 정수 기본값에는 정수(1.0 같은 정수 실수 포함), 실수 기본값에는 유한한 숫자만 허용
+    - 기간 파라미터(n, n1, n_*)는 1 이상
+    """
+    if params is None:
+        return {}
+    if not isinstance(params, dict):
+        raise ValueError("params는 {이름: 값} 객체여야 합니다.")
+    resolve_params(strat_name, params)
+    defaults = resolve_params(strat_name, None)
+    checked = {}
+    for name, value in params.items():
+        default = defaults[name]
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+            raise ValueError(f"{name}: 숫자가 필요합니다 ({value!r})")
+        if isinstance(default, int) and not isinstance(default, bool):
+            if not float(value).is_integer():
+                raise ValueError(f"{name}: 정수가 필요합니다 ({value!r})")
+            value = int(value)
+        if re.fullmatch(r'n(\d*|_\w+)', name) and value < 1:
+            raise ValueError(f"{name}: 기간은 1 이상이어야 합니다 ({value!r})")
+        checked[name] = value
+    return checked
+
+
+class SignalStream:
+    """
+    전략 하나를 봉 단위로 진행시키는 신호 피드 (봉당 O(1), 전체 이력 재계산 없음)
+    - 워밍업: 모든 지표가 한 번씩 유효해진 봉의 다음 봉부터 신호 (Backtest와 같은 시작 봉)
+    - 포지션: 무포지션 + 진입 신호 -> buy, 보유 + 청산 신호 -> sell (다음 봉 시가 체결로 가정)
+    update(bar)는 봉 하나의 결과 메시지(dict)를 반환
+    """
+
+    def __init__(self, strat_name, params=None):
+        self.strat_name = strat_name
+        self.params = resolve_params(strat_name, check_params(strat_name, params))
+        self.stream = STREAMS[strat_name](self.params)
+        self.count = 0
+        self.pending = set()     # 아직 유효값이 안 나온 지표
+        self.ready_at = None     # 모든 지표가 유효해진 봉 번호
+        self.entry_price = None  # 보유 중이면 진입 체결가
+        self.order = None        # 직전 봉에서 낸 주문 ('buy' / 'sell')
+
+    def update(self, bar):
+        i = self.count
+        self.count += 1
+        # 직전 봉 주문을 이번 봉 시가에 체결
+        if self.order == 'buy':
+            self.entry_price = bar['Open']
+        elif self.order == 'sell':
+            self.entry_price = None
+        self.order = None
+
+        values = self.stream.indicators(bar)
+        if i == 0:
+            self.pending = set(values)
+        if self.ready_at is None:
+            self.pending -= {k for k, v in values.items() if v == v}
+            if not self.pending:
+                self.ready_at = i
+        ready = self.ready_at is not None and i > self.ready_at
+
+        entry, exit_ = self.stream.signals(bar, values, ready, self.entry_price)
+        entry, exit_ = bool(ready and entry), bool(ready and exit_)
+        if self.stream.exit_after_entry and entry:
+            exit_ = False
+        if entry and self.entry_price is None:
+            self.order = 'buy'
+        elif exit_ and self.entry_price is not None:
+            self.order = 'sell'
+
+        return {'type': 'bar', 'date': _date_str(bar['Date']), 'bar': {k: _clean(bar[k]) for k in COLUMNS},
+                'indicators': {k: _clean(v) for k, v in values.items()}, 'entry': entry, 'exit': exit_,
+                'action': self.order, 'position': 'long' if self.entry_price is not None else 'flat'}
+
+    def tick(self, bar):
+        """확정 전(장중) 봉: 지표 상태는 바꾸지 않고 시세만 전달"""
+        return {'type': 'tick', 'date': _date_str(bar['Date']), 'bar': {k: _clean(bar[k]) for k in COLUMNS}}
+
+
+def _bars(df):
+    columns = [df[c].to_numpy(dtype='float64') for c in COLUMNS]
+    for ts, *values in zip(df.index, *columns):
+        yield {'Date': ts, **dict(zip(COLUMNS, map(float, values)))}
+
+
+def replay_feed(df, interval=0.0, sleep=time.sleep):
+    """저장된 봉을 interval초 간격으로 한 봉씩 내보내는 재생 피드 -> ('bar', 봉)"""
+    for bar in _bars(df):
+        yield 'bar', bar
+        if interval:
+            sleep(interval)
+
+
+def live_feed(ticker, from_date, store=ohlcv_store, poll=60, sleep=time.sleep, now=datetime.now):
+    """
+    실시간 피드: poll초마다 일봉을 다시 조회
+    - 이력 봉과 새로 확정된 봉 -> ('bar', 봉)
+    - 오늘 봉은 장중 확정 전이므로 ('tick', 봉), 날짜가 바뀌어 다시 조회될 때 확정
+    - 조회할 때마다 ('wait', None) (새 봉이 없어도 호출측이 연결 상태/수명을 확인할 수 있도록)
+    (ohlcv_store는 당일 봉을 live_ttl 동안만 메모리에 두므로 poll이 그보다 짧으면 같은 값이 반복됨)
+    """
+    confirmed = None
+    while True:
+        today = pd.Timestamp(now()).normalize()
+        df = store.get(ticker, from_date, today.strftime('%Y%m%d'))
+        if confirmed is not None:
+            df = df[df.index > confirmed]
+        for bar in _bars(df):
+            if bar['Date'].normalize() >= today:
+                yield 'tick', bar
+            else:
+                confirmed = bar['Date']
+                yield 'bar', bar
+        yield 'wait', None
+        sleep(poll)
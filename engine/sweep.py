@@ -0,0 +1,115 @@
+import os
+import math
+import itertools
+from concurrent.futures.process import BrokenProcessPool
+import numpy as np
+import pandas as pd
+from backtesting import Backtest
+
+from engine import vectorized
+from engine.pool import get_process_pool, reset_process_pool
+from strategies.registry import STRATEGIES
+
+# 결과표에 남길 지표
+METRICS = ['Return [%]', 'Sharpe Ratio', 'Max. Drawdown [%]', 'Win Rate [%]', '# Trades', 'Equity Final [$]']
+# 한 번에 탐색할 수 있는 최대 조합 수 (요청 하나가 공유 프로세스 풀을 오래 점유하지 않도록)
+MAX_COMBOS = int(os.environ.get('JTRADER_MAX_COMBOS', 5000))
+
+
+def _run_chunk(df, strat_name, combos, cash, commission):
+    """
+    워커에서 조합 묶음을 순서대로 실행 (같은 워커 안에서는 지표 캐시도 공유됨)
+    벡터화 엔진이 지원하는 전략은 봉 단위 next() 없이 마스크로 계산 (engine/vectorized.py)
+    실패한 조합은 지표를 NaN으로 두고 Error 컬럼에 메시지를 남김
+    """
+    if vectorized.supports(strat_name):
+        def run(params):
+            return vectorized.run_quick(df, strat_name, params, cash, commission)
+    else:
+        bt = Backtest(df, STRATEGIES[strat_name], cash=cash, commission=commission)
+        def run(params):
+            return bt.run(**params)
+
+    rows = []
+    for params in combos:
+        try:
+            stats = run(params)
+            rows.append({**params, **{m: stats[m] for m in METRICS}, 'Error': ''})
+        except Exception as e:
+            rows.append({**params, **{m: np.nan for m in METRICS}, 'Error': f'{type(e).__name__}: {e}'})
+    return rows
+
+
+def parse_grid_values(spec, max_values=MAX_COMBOS):
+    """
+    '5:30:5' -> [5, 10, ..., 30] (stop 포함), '0.3,0.5,0.7' -> [0.3, 0.5, 0.7]
+    정수로 표현 가능한 값은 int로 변환
+    범위는 값 개수를 먼저 계산해 max_values를 넘으면 목록을 만들기 전에 ValueError
+    """
+    spec = spec.strip()
+    if ':' in spec:
+        start, stop, step = (float(x) for x in spec.split(':'))
+        if not (math.isfinite(start) and math.isfinite(stop) and math.isfinite(step)) or step <= 0:
+            raise ValueError(f"잘못된 범위: {spec} (step은 0보다 커야 함)")
+        count = max(0, math.floor((stop - start) / step + 1e-9) + 1)
+        if count > max_values:
+            raise ValueError(f"값이 너무 많습니다: {spec} ({count:,}개, 최대 {max_values:,}개)")
+        values = (start + step * np.arange(count)).round(10).tolist()
+    else:
+        values = [float(x) for x in spec.split(',') if x.strip()]
+    return [int(v) if float(v).is_integer() else v for v in values]
+
+
+def parse_grid(text):
+    """'이름=값범위' 줄 단위 입력을 {파라미터: [값, ...]} 로 변환"""
+    grid = {}
+    for line in text.splitlines():
+        if '=' not in line:
+            continue
+        name, spec = line.split('=', 1)
+        grid[name.strip()] = parse_grid_values(spec)
+    return grid
+
+
+def combo_count(grid):
+    """grid의 파라미터 조합 수"""
+    return math.prod(len(v) for v in grid.values())
+
+
+def run_sweep(df, strat_name, grid, metric='Return [%]', cash=10000000, commission=.002, max_workers=None):
+    """
+    grid의 모든 파라미터 조합을 공유 프로세스 풀에서 병렬 백테스트하고
+    metric 기준 내림차순으로 정렬된 DataFrame 반환 (Error: 실패한 조합의 메시지, 성공하면 '')
+    """
+    strategy = STRATEGIES[strat_name]
+    for name in grid:
+        if not hasattr(strategy, name):
+            raise ValueError(f"{strategy.__name__}에 '{name}' 파라미터가 없습니다.")
+    if combo_count(grid) > MAX_COMBOS:
+        raise ValueError(f"조합이 너무 많습니다 ({combo_count(grid):,}개, 최대 {MAX_COMBOS:,}개)")
+
+    names = list(grid)
+    combos = [dict(zip(names, values)) for values in itertools.product(*grid.values())]
+    if not combos:
+        return pd.DataFrame(columns=names + METRICS + ['Error'])
+
+    pool = get_process_pool()
+    workers = max_workers or pool._max_workers
+    # 워커당 여러 묶음으로 나눠 부하 분산 (조합 1개씩 보내는 IPC 비용 방지)
+    n_chunks = min(len(combos), workers * 4)
+    chunks = [combos[i::n_chunks] for i in range(n_chunks)]
+
+    try:
+        futures = [pool.submit(_run_chunk, df, strat_name, chunk, cash, commission) for chunk in chunks]
+        rows = [row for f in futures for row in f.result()]
+    except BrokenProcessPool:
+        reset_process_pool(pool)
+        raise
+
+    result = pd.DataFrame(rows, columns=names + METRICS + ['Error'])
+    return result.sort_values(metric, ascending=False, na_position='last').reset_index(drop=True)
+
+
+def heatmap_frame(result, x, y, metric='Return [%]'):
+    """두 파라미터 축에 대해 나머지 파라미터는 최댓값으로 집계한 히트맵용 DataFrame"""
+    return result.groupby([x, y], as_index=False)[metric].max()
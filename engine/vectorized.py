@@ -0,0 +1,289 @@
+import sys
+import numpy as np
+import pandas as pd
+from backtesting._stats import compute_stats, geometric_mean, _Stats
+from backtesting._util import _data_period
+
+from strategies.indicators import SMA, RSI_Indicator, MACD_Indicator, ADX_Indicator, VWAP_Indicator
+from strategies.registry import STRATEGIES
+
+# backtesting.py의 buy() 기본 size (가용 자금 전체, 정수 주 단위로 내림)
+_FULL_EQUITY = 1 - sys.float_info.epsilon
+
+TRADE_COLUMNS = ['Size', 'EntryBar', 'ExitBar', 'EntryPrice', 'ExitPrice', 'SL', 'TP', 'PnL', 'Commission',
+                 'ReturnPct', 'EntryTime', 'ExitTime', 'Duration', 'Tag']
+
+
+# --- 배열 단위 크로스 판정 (backtesting.lib.crossover와 동일 조건) ---
+def cross_up(a, b):
+    """out[i] = a[i-1] < b[i-1] and a[i] > b[i] (NaN 비교는 False, 2차원이면 열마다)"""
+    a = np.asarray(a, dtype='float64')
+    b = np.broadcast_to(np.asarray(b, dtype='float64'), a.shape)
+    out = np.zeros(a.shape, dtype=bool)
+    with np.errstate(invalid='ignore'):
+        out[1:] = (a[:-1] < b[:-1]) & (a[1:] > b[1:])
+    return out
+
+
+def _shift(values, n=1):
+    out = np.full(np.shape(values), np.nan)
+    out[n:] = values[:-n]
+    return out
+
+
+# --- 전략별 신호 계산: (df, params) -> (진입 마스크, 청산 마스크, 지표 목록) ---
+# 마스크는 i번째 봉 종가 시점에 next()가 주문을 내는 조건 (체결은 i+1번째 봉 시가)
+# 입력이 날짜 x 종목 DataFrame이면 같은 계산이 열마다 적용됨 (engine/portfolio.py)
+def _slope_signals(d, p):
+    sma = SMA(d['Close'], p['n1'])
+    slope = np.diff(sma, axis=0, prepend=np.nan)
+    prev = _shift(slope)
+    with np.errstate(invalid='ignore'):
+        return (prev < 0) & (slope > 0), (prev > 0) & (slope < 0), [sma]
+
+
+def _cross_signals(d, p):
+    fast, slow = SMA(d['Close'], p['n_fast']), SMA(d['Close'], p['n_slow'])
+    return cross_up(fast, slow), cross_up(slow, fast), [fast, slow]
+
+
+def _macd_signals(d, p):
+    macd, signal, hist = MACD_Indicator(d['Close'], p['n_fast'], p['n_slow'], p['n_signal'])
+    return cross_up(macd, signal), cross_up(signal, macd), [macd, signal, hist]
+
+
+def _rsi_signals(d, p):
+    rsi = RSI_Indicator(d['Close'], p['n_rsi'])
+    return cross_up(rsi, p['rsi_low']), cross_up(np.full(rsi.shape, p['rsi_high'], dtype='float64'), rsi), [rsi]
+
+
+def _vwap_signals(d, p):
+    close = d['Close'].to_numpy(dtype='float64')
+    vwap = VWAP_Indicator(d['High'], d['Low'], d['Close'], d['Volume'])
+    return cross_up(close, vwap), cross_up(vwap, close), [vwap]
+
+
+def _adx_signals(d, p):
+    adx, plus_di, minus_di = ADX_Indicator(d['High'], d['Low'], d['Close'], p['n'])
+    with np.errstate(invalid='ignore'):
+        entries = (adx > p['adx_threshold']) & cross_up(plus_di, minus_di)
+    return entries, cross_up(minus_di, plus_di), [adx, plus_di, minus_di]
+
+
+def _complex_signals(d, p):
+    close = d['Close'].to_numpy(dtype='float64')
+    sma = SMA(d['Close'], p['n_sma'])
+    rsi = RSI_Indicator(d['Close'], p['n_rsi'])
+    macd, signal, _ = MACD_Indicator(d['Close'], p['n_macd_f'], p['n_macd_s'], p['n_macd_sig'], adjust=True)
+    with np.errstate(invalid='ignore'):
+        entries = (close > sma) & (50 <= rsi) & (rsi <= 60) & cross_up(macd, signal)
+    return entries, cross_up(signal, macd), [sma, rsi, macd, signal]
+
+
+def _rsi_support_signals(d, p):
+    close, open_ = d['Close'].to_numpy(dtype='float64'), d['Open'].to_numpy(dtype='float64')
+    rsi = RSI_Indicator(d['Close'], p['n_rsi'])
+    fast, slow = SMA(d['Close'], p['n_fast']), SMA(d['Close'], p['n_slow'])
+    with np.errstate(invalid='ignore'):
+        entries = (fast > slow) & (40 <= rsi) & (rsi <= 50) & (close > open_)
+        exits = (rsi >= 70) | cross_up(slow, close)
+    return entries, exits, [rsi, fast, slow]
+
+
+# 전략 이름 -> (신호 함수, 포지션이 없을 때만 진입하는지)
+# SmaCrossStrategy는 포지션 보유 여부와 관계없이 buy()를 호출하므로 False
+SIGNALS = {
+    'slope': (_slope_signals, True),
+    'cross': (_cross_signals, False),
+    'macd': (_macd_signals, True),
+    'rsi': (_rsi_signals, True),
+    'vwap': (_vwap_signals, True),
+    'adx': (_adx_signals, True),
+    'complex': (_complex_signals, True),
+    'rsi_support': (_rsi_support_signals, True),
+}
+
+
+def supports(strat_name):
+    return strat_name in SIGNALS
+
+
+def _warmup_bars(indicators):
+    # backtesting._util._indicator_warmup_nbars와 동일 (지표별 첫 유효값 위치의 최댓값)
+    return max((int(np.isnan(ind).argmin()) for ind in indicators), default=0)
+
+
+def resolve_params(strat_name, params):
+    """전략 기본 파라미터 + 지정 파라미터 (Backtest.run과 같이 없는 이름은 AttributeError)"""
+    strategy = STRATEGIES[strat_name]
+    for name in params or {}:
+        if not hasattr(strategy, name):
+            raise AttributeError(f"Strategy '{strategy.__name__}' is missing parameter '{name}'.")
+    defaults = {k: v for k, v in vars(strategy).items() if not k.startswith('_') and not callable(v)}
+    return {**defaults, **(params or {})}
+
+
+def signal_arrays(df, strat_name, params=None):
+    """(진입 마스크, 청산 마스크, 지표 목록) - df가 날짜 x 종목 DataFrame 묶음이면 모두 2차원"""
+    func, _ = SIGNALS[strat_name]
+    return func(df, resolve_params(strat_name, params))
+
+
+def signals(df, strat_name, params=None):
+    """(진입 마스크, 청산 마스크, 워밍업 봉 수, 무포지션 진입 여부)"""
+    entries, exits, indicators = signal_arrays(df, strat_name, params)
+    return entries, exits, _warmup_bars(indicators), SIGNALS[strat_name][1]
+
+
+def simulate(df, entries, exits, warmup=0, flat_only=True, cash=10000000, commission=.002):
+    """
+    진입/청산 마스크로 체결·수수료를 계산 (롱 전용, spread 0, margin 1 기준)
+    backtesting.Backtest와 같은 규칙:
+    - i번째 봉 신호 -> i+1번째 봉 시가 체결, 마지막 봉 신호는 미체결
+    - 진입 수량: (가용 자금 * (1 - eps)) // (가격 * (1 + 수수료율)) 정수 주
+    - 진입·청산 시 각각 수수료 차감, 청산은 열린 매매 전체(FIFO)
+    - 끝까지 열린 매매는 매매 내역에서 제외 (자산 곡선에는 평가손익 반영)
+    반환: (매매 DataFrame, 자산 곡선 ndarray)
+    """
+    o = df['Open'].to_numpy(dtype='float64')
+    c = df['Close'].to_numpy(dtype='float64')
+    n = len(df)
+    start = 1 + warmup
+
+    entries = np.asarray(entries, dtype=bool).copy()
+    exits = np.asarray(exits, dtype=bool).copy()
+    entries[:start] = False
+    exits[:start] = False
+    exits &= ~entries   # next()에서 진입 조건 다음 elif로 청산 조건을 봄
+
+    equity = np.full(n, np.nan)
+    cash_now = cash
+    open_trades = []    # [size, entry_price, entry_bar]
+    closed = []
+    last = start        # 아직 자산을 기록하지 않은 첫 봉
+
+    def record(stop):
+        # [last, stop) 구간 자산 = 현금 + 열린 매매 평가손익
+        pl = np.zeros(stop - last)
+        for size, entry, _ in open_trades:
+            pl = pl + size * (c[last:stop] - entry)
+        equity[last:stop] = cash_now + pl
+
+    # 신호가 있는 봉만 순회 (봉 단위 루프 없음)
+    for i in np.flatnonzero(entries | exits):
+        fill = i + 1
+        if fill >= n:
+            break
+        if entries[i]:
+            if flat_only and open_trades:
+                continue
+        elif not open_trades:
+            continue
+
+        record(fill)
+        last = fill
+        price = o[fill]
+
+        if entries[i]:
+            pl = sum(size * (c[fill] - entry) for size, entry, _ in open_trades)
+            margin_used = sum(abs(size) * c[fill] / 1.0 for size, _, _ in open_trades)
+            available = max(0, cash_now + pl - margin_used)
+            price_plus_commission = price + abs(_FULL_EQUITY) * price * commission / abs(_FULL_EQUITY)
+            size = int((available * 1.0 * abs(_FULL_EQUITY)) // price_plus_commission)
+            # 1주도 못 사면 주문 취소
+            if not size or size * price_plus_commission > available * 1.0:
+                continue
+            open_trades.append([size, price, fill])
+            cash_now -= abs(size) * price * commission
+        else:
+            for size, entry, entry_bar in open_trades:
+                exit_commission = abs(size) * price * commission
+                cash_now += size * (price - entry) - exit_commission
+                closed.append((size, entry_bar, fill, entry, price, exit_commission + abs(size) * entry * commission))
+            open_trades = []
+
+    if last < n:
+        record(n)
+    equity = pd.Series(equity).bfill().fillna(cash_now).values
+
+    index = df.index
+    rows = []
+    for size, entry_bar, exit_bar, entry, exit_price, commissions in closed:
+        rows.append({
+            'Size': size, 'EntryBar': entry_bar, 'ExitBar': exit_bar, 'EntryPrice': entry, 'ExitPrice': exit_price,
+            'SL': None, 'TP': None, 'PnL': size * (exit_price - entry) - commissions, 'Commission': commissions,
+            'ReturnPct': np.copysign(1, size) * (exit_price / entry - 1) - commissions / (abs(size) * entry),
+            'EntryTime': index[entry_bar], 'ExitTime': index[exit_bar], 'Tag': None,
+        })
+    trades = pd.DataFrame(rows, columns=TRADE_COLUMNS)
+    trades['Duration'] = trades['ExitTime'] - trades['EntryTime']
+    return trades, equity
+
+
+def run(df, strat_name, params=None, cash=10000000, commission=.002):
+    """
+    Backtest(df, STRATEGIES[strat_name], cash, commission).run(**params)와 같은 통계를 반환
+    (_trades에 Entry_/Exit_ 지표 컬럼은 없음)
+    """
+    entries, exits, warmup, flat_only = signals(df, strat_name, params)
+    trades, equity = simulate(df, entries, exits, warmup, flat_only, cash, commission)
+
+    stats = compute_stats(trades=trades, equity=equity, ohlc_data=df, strategy_instance=None)
+    # compute_stats는 strategy_instance 없이 워밍업을 0으로 보므로 B&H/Alpha를 다시 계산
+    c = df['Close'].values
+    bh = (c[-1] - c[warmup]) / c[warmup] * 100
+    stats.loc['Buy & Hold Return [%]'] = bh
+    stats.loc['Alpha [%]'] = stats.loc['Return [%]'] - 0 * 100 - stats.loc['Beta'] * (bh - 0 * 100)
+
+    return add_commissions(stats, trades)
+
+
+def add_commissions(stats, trades):
+    """DataFrame으로 넘긴 매매 내역은 compute_stats에서 수수료 합계가 빠지므로 같은 위치에 추가"""
+    total_commission = sum(trades['Commission'])
+    if not total_commission:
+        return stats
+    pos = stats.index.get_loc('Equity Peak [$]') + 1
+    return _Stats(pd.concat([stats.iloc[:pos], pd.Series({'Commissions [$]': total_commission}, dtype=object),
+                             stats.iloc[pos:]]))
+
+
+def quick_stats(df, trades, equity, warmup=0):
+    """
+    최적화/일괄 실행용 요약 지표만 계산 (compute_stats와 같은 식, pandas Series 생성 비용 생략)
+    키: Return [%], Equity Final [$], Buy & Hold Return [%], Sharpe Ratio, Max. Drawdown [%], Win Rate [%], # Trades
+    """
+    index = df.index
+    c = df['Close'].values
+    s = {'Equity Final [$]': equity[-1], 'Return [%]': (equity[-1] - equity[0]) / equity[0] * 100,
+         'Buy & Hold Return [%]': (c[-1] - c[warmup]) / c[warmup] * 100}
+
+    gmean_day_return = 0
+    day_returns = np.array(np.nan)
+    annual_trading_days = np.nan
+    if isinstance(index, pd.DatetimeIndex):
+        freq_days = _data_period(index).days
+        have_weekends = index.dayofweek.to_series().between(5, 6).mean() > 2 / 7 * .6
+        annual_trading_days = (52 if freq_days == 7 else 12 if freq_days == 31 else 1 if freq_days == 365
+                               else (365 if have_weekends else 252))
+        freq = {7: 'W', 31: 'ME', 365: 'YE'}.get(freq_days, 'D')
+        day_returns = pd.Series(equity, index=index).resample(freq).last().dropna().pct_change()
+        gmean_day_return = geometric_mean(day_returns)
+    annualized_return = (1 + gmean_day_return)**annual_trading_days - 1
+    volatility = np.sqrt((day_returns.var(ddof=int(bool(day_returns.shape))) + (1 + gmean_day_return)**2)**annual_trading_days
+                         - (1 + gmean_day_return)**(2 * annual_trading_days)) * 100
+    s['Sharpe Ratio'] = annualized_return * 100 / (volatility or np.nan)
+
+    dd = 1 - equity / np.maximum.accumulate(equity)
+    s['Max. Drawdown [%]'] = -np.nan_to_num(dd.max()) * 100
+    n_trades = len(trades)
+    s['Win Rate [%]'] = (np.nan if not n_trades else (trades['PnL'] > 0).mean()) * 100
+    s['# Trades'] = n_trades
+    return s
+
+
+def run_quick(df, strat_name, params=None, cash=10000000, commission=.002):
+    """신호 계산 + 체결 시뮬레이션 + quick_stats"""
+    entries, exits, warmup, flat_only = signals(df, strat_name, params)
+    trades, equity = simulate(df, entries, exits, warmup, flat_only, cash, commission)
+    return quick_stats(df, trades, equity, warmup)
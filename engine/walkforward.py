@@ -0,0 +1,161 @@
+import itertools
+import numpy as np
+import pandas as pd
+
+from engine import vectorized
+from engine.pool import get_process_pool
+from engine.portfolio import _backtest_signals
+from strategies.registry import STRATEGIES
+
+# 워크 포워드 최적화
+# - 전체 구간을 (학습 train봉 -> 검증 test봉) 폴드로 나누고 test봉씩 밀면서 반복
+# - 학습 구간에서 metric이 가장 좋은 파라미터로 바로 뒤 검증 구간을 거래 (표본 외 성과)
+# - 폴드 묶음을 프로세스 풀 워커에서 동시에 실행
+# - 파라미터 조합별 신호는 전체 구간에서 한 번만 계산하고 폴드마다 잘라서 체결만 다시 계산
+#   (겹치는 학습 구간의 지표를 재사용, 폴드 시작 전 이력으로 지표 워밍업)
+DEFAULT_TRAIN = 250
+DEFAULT_TEST = 60
+FOLD_METRICS = ['Return [%]', 'Buy & Hold Return [%]', 'Sharpe Ratio', 'Max. Drawdown [%]', 'Win Rate [%]',
+                '# Trades']
+
+
+def make_folds(n_bars, train=DEFAULT_TRAIN, test=DEFAULT_TEST):
+    """[(학습 시작, 검증 시작, 검증 끝), ...] 봉 위치, 마지막 폴드 검증 구간은 남은 봉까지"""
+    folds = []
+    start = 0
+    while start + train + 1 < n_bars:
+        end = min(start + train + test, n_bars)
+        # 남은 봉이 test의 절반도 안 되면 마지막 폴드에 붙임
+        if n_bars - end < test // 2:
+            end = n_bars
+        folds.append((start, start + train, end))
+        if end == n_bars:
+            break
+        start += test
+    return folds
+
+
+def _combo_signals(df, strat_name, params):
+    """전체 구간 신호 -> (진입, 청산, 워밍업 봉 수, 무포지션 진입 여부)"""
+    if vectorized.supports(strat_name):
+        return vectorized.signals(df, strat_name, params)
+    # 상태가 있는 전략은 전체 구간 Backtest 매매 내역을 신호로 변환
+    entries, exits = _backtest_signals(df, strat_name, params)
+    return entries, exits, 0, True
+
+
+def _window(df, sig, a, b, cash, commission):
+    """신호를 [a, b) 구간으로 잘라 체결 -> (구간 df, 매매, 자산 곡선, 구간 기준 워밍업)"""
+    entries, exits, warmup, flat_only = sig
+    part = df.iloc[a:b]
+    warmup = min(max(0, warmup - a), len(part) - 1)
+    trades, equity = vectorized.simulate(part, entries[a:b], exits[a:b], warmup, flat_only, cash, commission)
+    return part, trades, equity, warmup
+
+
+def _score(part, trades, equity, warmup, metric):
+    """학습 구간 점수 (Sharpe Ratio 외에는 자산 곡선/매매에서 바로 계산, quick_stats와 같은 식)"""
+    if metric == 'Return [%]':
+        return (equity[-1] - equity[0]) / equity[0] * 100
+    if metric == 'Equity Final [$]':
+        return equity[-1]
+    if metric == 'Max. Drawdown [%]':
+        return -np.nan_to_num((1 - equity / np.maximum.accumulate(equity)).max()) * 100
+    if metric == '# Trades':
+        return len(trades)
+    if metric == 'Win Rate [%]':
+        return (trades['PnL'] > 0).mean() * 100 if len(trades) else np.nan
+    return vectorized.quick_stats(part, trades, equity, warmup)[metric]
+
+
+def _run_folds(df, strat_name, combos, folds, metric, cash, commission):
+    """
+    워커에서 폴드 묶음 실행: 조합마다 신호를 한 번 계산해 모든 폴드 학습 구간에 재사용
+    반환: 폴드별 {best, train, test, equity, trades}
+    """
+    scores = np.full((len(folds), len(combos)), -np.inf)
+    cache = {}
+    for k, params in enumerate(combos):
+        try:
+            sig = cache[k] = _combo_signals(df, strat_name, params)
+        except Exception:
+            continue
+        for f, (a, b, _) in enumerate(folds):
+            part, trades, equity, warmup = _window(df, sig, a, b, cash, commission)
+            value = _score(part, trades, equity, warmup, metric)
+            if np.isfinite(value):
+                scores[f, k] = value
+
+    results = []
+    for f, (a, b, end) in enumerate(folds):
+        k = int(np.argmax(scores[f]))
+        if k not in cache:
+            results.append(None)
+            continue
+        part, trades, equity, warmup = _window(df, cache[k], a, b, cash, commission)
+        train = vectorized.quick_stats(part, trades, equity, warmup)
+        # 검증 구간 자산은 학습 마지막 봉(현금)에서 시작, 신호는 검증 첫 봉부터 봄
+        part, trades, equity, warmup = _window(df, cache[k], b - 1, end, cash, commission)
+        test = vectorized.quick_stats(part, trades, equity, warmup)
+        results.append({'best': combos[k], 'train': train, 'test': test,
+                        'equity': pd.Series(equity, index=part.index), 'trades': trades})
+    return results
+
+
+def run_walkforward(df, strat_name, grid, metric='Return [%]', train=DEFAULT_TRAIN, test=DEFAULT_TEST,
+                    cash=10000000, commission=.002, max_workers=None):
+    """
+    워크 포워드 최적화
+    반환: {'folds': 폴드별 결과 DataFrame, 'equity': 이어 붙인 표본 외 자산 곡선,
+           'benchmark': 같은 구간 보유 자산, 'stats': 표본 외 전체 지표 dict, 'params': 파라미터 이름}
+    """
+    strategy = STRATEGIES[strat_name]
+    for name in grid:
+        if not hasattr(strategy, name):
+            raise ValueError(f"{strategy.__name__}에 '{name}' 파라미터가 없습니다.")
+    names = list(grid)
+    combos = [dict(zip(names, values)) for values in itertools.product(*grid.values())]
+    folds = make_folds(len(df), train, test)
+    if not combos or not folds:
+        raise ValueError(f"데이터가 부족합니다 (학습 {train}봉 + 검증 1봉 이상 필요, 현재 {len(df)}봉)")
+
+    # 워커마다 폴드를 나눠 맡김 (워커 안에서는 조합별 신호와 지표 캐시를 폴드끼리 공유)
+    pool = get_process_pool()
+    n_groups = min(len(folds), max_workers or pool._max_workers)
+    groups = [list(range(g, len(folds), n_groups)) for g in range(n_groups)]
+    futures = [pool.submit(_run_folds, df, strat_name, combos, [folds[f] for f in group], metric, cash, commission)
+               for group in groups]
+    results = [None] * len(folds)
+    for group, future in zip(groups, futures):
+        for f, result in zip(group, future.result()):
+            results[f] = result
+
+    rows, pieces, trades = [], [], []
+    capital = cash
+    index = df.index
+    for f, ((a, b, end), result) in enumerate(zip(folds, results)):
+        row = {'Fold': f + 1, 'Train': f"{index[a]:%Y-%m-%d} ~ {index[b - 1]:%Y-%m-%d}",
+               'Test': f"{index[b]:%Y-%m-%d} ~ {index[end - 1]:%Y-%m-%d}"}
+        if result is None:
+            rows.append(row)
+            continue
+        row.update(result['best'])
+        row[f'Train {metric}'] = result['train'][metric]
+        row.update({m: result['test'][m] for m in FOLD_METRICS})
+        rows.append(row)
+        # 폴드 자산 곡선을 직전 폴드 최종 자산 기준으로 이어 붙임
+        # (첫 봉은 학습 구간 마지막 봉 = 직전 폴드 마지막 봉, 끝까지 열린 매매는 마지막 종가로 평가)
+        equity = result['equity'] / cash * capital
+        pieces.append(equity if not pieces else equity.iloc[1:])
+        capital = equity.iloc[-1]
+        trades.append(result['trades'])
+
+    if not pieces:
+        raise ValueError("모든 파라미터 조합이 실패했습니다.")
+    equity = pd.concat(pieces)
+    oos = df.loc[equity.index]
+    stats = vectorized.quick_stats(oos, pd.concat(trades, ignore_index=True), equity.to_numpy())
+    benchmark = cash * oos['Close'] / oos['Close'].iloc[0]
+
+    fold_frame = pd.DataFrame(rows, columns=['Fold', 'Train', 'Test'] + names + [f'Train {metric}'] + FOLD_METRICS)
+    return {'folds': fold_frame, 'equity': equity, 'benchmark': benchmark, 'stats': stats, 'params': names}
@@ -0,0 +1,39 @@
+# gunicorn 설정 (실행: gunicorn -c gunicorn.conf.py wsgi:app)
+import os
+
+cpus = os.cpu_count() or 1
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 10000)}"
+
+# 워커 프로세스 x 스레드: 요청 스레드는 I/O와 대기만 하고, 백테스트는 워커별 프로세스 풀에서 실행
+workers = int(os.environ.get('WEB_CONCURRENCY', min(cpus, 4)))
+worker_class = 'gthread'
+threads = int(os.environ.get('JTRADER_THREADS', 8))
+
+# 워커별 백테스트 프로세스 수: 전체 합이 CPU 수를 넘지 않도록 나눔
+os.environ.setdefault('JTRADER_BACKTEST_WORKERS', str(max(1, cpus // workers)))
+
+# 워커별 지표를 한 디렉터리에 모아서 /metrics가 전체 워커 합계를 보여주도록 (monitoring/timing.py)
+os.environ.setdefault('JTRADER_METRICS_DIR', os.path.join(
+    os.environ.get('JTRADER_CACHE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache')),
+    'metrics'))
+
+# 마스터에서 앱 임포트 + 캐시 준비(wsgi.warm_caches) 후 fork
+preload_app = True
+
+timeout = 120          # 긴 구간 백테스트 허용
+graceful_timeout = 30
+keepalive = 5
+# 메모리 누적 방지용 주기적 워커 교체
+max_requests = 2000
+max_requests_jitter = 200
+
+accesslog = '-'
+errorlog = '-'
+
+
+def post_worker_init(worker):
+    # 워커가 뜨자마자 백테스트 프로세스 풀을 띄워서 첫 요청이 프로세스 생성 비용을 물지 않도록
+    from engine.pool import warm_process_pool
+    pids = warm_process_pool()
+    worker.log.info(f'backtest pool ready: {len(pids)} process(es)')
@@ -0,0 +1,64 @@
+import os
+import time
+import cProfile
+import threading
+
+from flask import g
+
+from data.ohlcv_store import CACHE_DIR
+
+try:  # pyinstrument가 설치된 경우에만 ?_profile=pyinstrument 지원
+    import pyinstrument
+except ImportError:
+    pyinstrument = None
+
+# 기본은 꺼짐 - 켜져 있어도 ?_profile=1 (또는 pyinstrument)을 붙인 요청만 프로파일링
+ENABLED = os.environ.get('JTRADER_PROFILE') == '1'
+PROFILE_DIR = os.environ.get('JTRADER_PROFILE_DIR', os.path.join(CACHE_DIR, 'profiles'))
+
+# 프로파일러는 프로세스당 하나만 켤 수 있으므로 동시에 들어온 요청은 건너뜀
+_lock = threading.Lock()
+
+
+def start(request):
+    """요청에 ?_profile이 있으면 프로파일링 시작"""
+    mode = request.args.get('_profile')
+    if not ENABLED or not mode or not _lock.acquire(blocking=False):
+        return
+    if mode == 'pyinstrument' and pyinstrument is not None:
+        prof = pyinstrument.Profiler()
+        prof.start()
+    else:
+        prof = cProfile.Profile()
+        prof.enable()
+    g._profiler = prof
+
+
+def stop(request, save=True):
+    """
+    프로파일링 종료 후 파일 저장, 저장 경로 반환 (프로파일링 중이 아니면 None)
+    cProfile: .prof (snakeviz / python -m pstats로 확인), pyinstrument: .html
+    """
+    prof = g.pop('_profiler', None)
+    if prof is None:
+        return None
+    try:
+        if isinstance(prof, cProfile.Profile):
+            prof.disable()
+        else:
+            prof.stop()
+        if not save:
+            return None
+
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}-{(request.endpoint or 'unknown').replace('.', '_')}"
+        if isinstance(prof, cProfile.Profile):
+            path = os.path.join(PROFILE_DIR, name + '.prof')
+            prof.dump_stats(path)
+        else:
+            path = os.path.join(PROFILE_DIR, name + '.html')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(prof.output_html())
+        return path
+    finally:
+        _lock.release()
@@ -0,0 +1,270 @@
+import os
+import json
+import time
+import threading
+from contextlib import contextmanager
+
+from flask import g, has_request_context, request
+
+# 히스토그램 버킷 (초) - 캐시 히트(ms 단위)부터 pykrx 전체 조회(수 초)까지
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class Histogram:
+    """Prometheus 히스토그램 (라벨 조합별 버킷 누적 카운트/합계/개수)"""
+
+    def __init__(self, name, help_text, labels, buckets=BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self.buckets = buckets
+        self._series = {}   # 라벨 값 튜플 -> [버킷별 카운트..., 합계, 개수]
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {k: list(v) for k, v in self._series.items()}
+
+    def reset(self):
+        with self._lock:
+            self._series = {}
+
+    @staticmethod
+    def merge(total, series):
+        for key, values in series.items():
+            if key in total:
+                total[key] = [a + b for a, b in zip(total[key], values)]
+            else:
+                total[key] = list(values)
+
+    def render(self, series=None):
+        """series: 여러 프로세스를 합친 라벨 -> 값 (None이면 이 프로세스 값)"""
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} histogram']
+        items = sorted((self.snapshot() if series is None else series).items())
+        for label_values, series in items:
+            labels = ','.join(f'{k}="{_escape(v)}"' for k, v in zip(self.labels, label_values))
+            sep = ',' if labels else ''
+            for bound, count in zip(self.buckets, series):
+                lines.append(f'{self.name}_bucket{{{labels}{sep}le="{bound}"}} {count}')
+            lines.append(f'{self.name}_bucket{{{labels}{sep}le="+Inf"}} {series[-1]}')
+            lines.append(f'{self.name}_sum{{{labels}}} {series[-2]:.6f}')
+            lines.append(f'{self.name}_count{{{labels}}} {series[-1]}')
+        return '\n'.join(lines)
+
+
+class Counter:
+    """Prometheus 카운터 (라벨 조합별 누적 값)"""
+
+    def __init__(self, name, help_text, labels):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._series[label_values] = self._series.get(label_values, 0) + amount
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self._series)
+
+    def reset(self):
+        with self._lock:
+            self._series = {}
+
+    @staticmethod
+    def merge(total, series):
+        for key, value in series.items():
+            total[key] = total.get(key, 0) + value
+
+    def render(self, series=None):
+        """series: 여러 프로세스를 합친 라벨 -> 값 (None이면 이 프로세스 값)"""
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} counter']
+        items = sorted((self.snapshot() if series is None else series).items())
+        for label_values, value in items:
+            labels = ','.join(f'{k}="{_escape(v)}"' for k, v in zip(self.labels, label_values))
+            lines.append(f'{self.name}{{{labels}}} {value}')
+        return '\n'.join(lines)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+REQUESTS = Counter('jtrader_http_requests_total', '요청 수', ('endpoint', 'method', 'status'))
+REQUEST_SECONDS = Histogram('jtrader_http_request_seconds', '요청 처리 시간(초)', ('endpoint', 'method'))
+STAGE_SECONDS = Histogram('jtrader_stage_seconds', '구간별 처리 시간(초)', ('stage',))
+METRICS = [REQUESTS, REQUEST_SECONDS, STAGE_SECONDS]
+
+# --- 프로세스 간 집계 ---
+# gunicorn 워커/프로세스 풀 워커마다 값이 따로 쌓이므로, METRICS_DIR이 있으면 프로세스마다
+# <pid>.json으로 FLUSH_INTERVAL초 간격으로 내보내고 /metrics는 모든 파일을 합산
+# (종료된 프로세스 파일도 남겨서 카운터가 줄어들지 않음, 서버 시작 시 clear_shared_metrics로 비움)
+METRICS_DIR = os.environ.get('JTRADER_METRICS_DIR')
+FLUSH_INTERVAL = 1.0
+_flush_lock = threading.Lock()
+_flusher_pid = None
+
+
+def _metrics_path(pid):
+    return os.path.join(METRICS_DIR, f'{pid}.json')
+
+
+def flush_metrics():
+    """이 프로세스 값을 METRICS_DIR/<pid>.json으로 저장 (METRICS_DIR이 없으면 아무것도 안 함)"""
+    if not METRICS_DIR:
+        return
+    data = {m.name: [[list(k), v] for k, v in m.snapshot().items()] for m in METRICS}
+    with _flush_lock:
+        os.makedirs(METRICS_DIR, exist_ok=True)
+        path = _metrics_path(os.getpid())
+        tmp = path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp, path)
+
+
+def _flush_loop():
+    pid = os.getpid()
+    while _flusher_pid == pid:
+        time.sleep(FLUSH_INTERVAL)
+        try:
+            flush_metrics()
+        except OSError:
+            pass
+
+
+def _ensure_flusher():
+    # 프로세스마다 (fork 후 자식 포함) 백그라운드 저장 스레드 1개
+    global _flusher_pid
+    if not METRICS_DIR or _flusher_pid == os.getpid():
+        return
+    with _flush_lock:
+        if _flusher_pid != os.getpid():
+            _flusher_pid = os.getpid()
+            threading.Thread(target=_flush_loop, name='jtrader-metrics', daemon=True).start()
+
+
+def clear_shared_metrics():
+    """이전 서버 실행이 남긴 프로세스별 파일 삭제 (gunicorn 마스터에서 워커 fork 전에 호출)"""
+    if not METRICS_DIR or not os.path.isdir(METRICS_DIR):
+        return
+    for name in os.listdir(METRICS_DIR):
+        if name.endswith('.json') or name.endswith('.tmp'):
+            try:
+                os.remove(os.path.join(METRICS_DIR, name))
+            except OSError:
+                pass
+
+
+def _collect():
+    """모든 프로세스 파일 합산 -> {지표 이름: {라벨 튜플: 값}}"""
+    flush_metrics()
+    totals = {m.name: {} for m in METRICS}
+    for name in os.listdir(METRICS_DIR):
+        if not name.endswith('.json'):
+            continue
+        try:
+            with open(os.path.join(METRICS_DIR, name), encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            continue
+        for m in METRICS:
+            m.merge(totals[m.name], {tuple(k): v for k, v in data.get(m.name, [])})
+    return totals
+
+
+def render_metrics():
+    """Prometheus 텍스트 포맷 (text/plain; version=0.0.4), METRICS_DIR이 있으면 전체 프로세스 합산"""
+    if not METRICS_DIR:
+        return '\n'.join(m.render() for m in METRICS) + '\n'
+    totals = _collect()
+    return '\n'.join(m.render(totals[m.name]) for m in METRICS) + '\n'
+
+
+def _reset_after_fork():
+    # fork된 자식은 부모가 쌓은 값을 물려받으므로 비움 (부모 값은 부모 파일에서 합산됨)
+    for m in METRICS:
+        m._lock = threading.Lock()
+        m.reset()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+@contextmanager
+def span(stage):
+    """
+    구간 시간 측정: with span('backtest'): ...
+    - 구간별 히스토그램(jtrader_stage_seconds)에 항상 기록
+    - 요청 처리 중이면 Server-Timing 헤더용으로 요청별 합계에도 누적 (같은 이름은 합산)
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        STAGE_SECONDS.observe(elapsed, stage)
+        _ensure_flusher()
+        if has_request_context() and '_timing_stages' in g:
+            stages = g._timing_stages
+            stages[stage] = stages.get(stage, 0.0) + elapsed
+
+
+def _server_timing(stages, total):
+    parts = [f'{name};dur={sec * 1000:.1f}' for name, sec in stages.items()]
+    parts.append(f'total;dur={total * 1000:.1f}')
+    return ', '.join(parts)
+
+
+def init_app(app):
+    """
+    Flask 앱에 요청 시간 측정 훅 등록
+    - 모든 응답에 Server-Timing 헤더 (브라우저 개발자 도구 Network > Timing 탭에서 확인)
+    - 엔드포인트별 요청 수/처리 시간을 /metrics로 노출 (routes/metrics_routes.py)
+    - JTRADER_PROFILE=1이면 ?_profile=1 요청마다 프로파일 파일 저장 (monitoring/profiler.py)
+    """
+    from monitoring import profiler
+
+    @app.before_request
+    def _start_timer():
+        g._timing_start = time.perf_counter()
+        g._timing_stages = {}
+        profiler.start(request)
+
+    @app.after_request
+    def _finish_timer(response):
+        start = g.pop('_timing_start', None)
+        if start is None:
+            return response
+        total = time.perf_counter() - start
+        stages = g.pop('_timing_stages', {})
+        profile_path = profiler.stop(request)
+        if profile_path:
+            response.headers['X-Profile-File'] = profile_path
+
+        endpoint = request.endpoint or 'unknown'
+        REQUESTS.inc(endpoint, request.method, response.status_code)
+        REQUEST_SECONDS.observe(total, endpoint, request.method)
+        _ensure_flusher()
+        # 스트리밍 응답은 본문 생성 전이라 total이 첫 바이트까지의 시간
+        response.headers['Server-Timing'] = _server_timing(stages, total)
+        return response
+
+    @app.teardown_request
+    def _stop_profiler(exc):
+        # after_request가 실행되지 않은 경우(처리되지 않은 예외) 프로파일러 정리
+        profiler.stop(request, save=False)
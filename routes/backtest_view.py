@@ -0,0 +1,323 @@
+import json
+import hashlib
+from datetime import datetime
+from functools import lru_cache
+import pandas as pd
+from bokeh.plotting import figure
+from bokeh.embed import components, json_item
+from bokeh.layouts import column
+from bokeh.models import HoverTool, ColumnDataSource
+from backtesting import Backtest
+from data.ohlcv_store import COLUMNS, ohlcv_store
+from data.trading_calendar import trading_calendar
+from engine import montecarlo
+from engine.result_cache import result_cache
+from monitoring.timing import span
+
+# --- [중요] 전략 모듈 임포트 ---
+from strategies.indicators import SMA
+from strategies.sma_strategies import SmaSlopeStrategy
+from strategies.registry import STRATEGIES
+from routes.chart_overlays import strategy_params, overlay_values, add_price_overlays, build_panel
+from routes.columnar import encode_frame
+from routes.decimate import DAY_MS, bucket_starts, decimate_ohlc, decimate_lines, bar_width_ms
+
+# 매매 내역 중 차트(연결선/마커/손익 막대/툴팁)에서 쓰는 컬럼
+TRADE_COLUMNS = ['EntryTime', 'ExitTime', 'EntryPrice', 'ExitPrice', 'EntryEquity', 'ExitEquity',
+                 'ReturnPct', 'PnL', 'pl_color', 'dash_pattern']
+
+# 클라이언트 차트(chart_data)로 보내는 컬럼 - color/pl_color/dash_pattern은 브라우저에서 계산
+PRICE_COLUMNS = ['Date'] + COLUMNS
+LINE_COLUMNS = ['Date', 'SMA20', 'SMA60', 'SMA200']
+TRADE_NUMERIC_COLUMNS = [c for c in TRADE_COLUMNS if c not in ('pl_color', 'dash_pattern')]
+
+
+def _run_cached(kind, ticker, from_date, to_date, strat_name, params, build):
+    """
+    거래일 보정 -> 결과 캐시 조회 -> 데이터 조회 -> build(df) 실행 후 캐시 저장
+    kind는 결과 형태(html/data)별 캐시 키 구분용, 데이터가 없으면 None
+    """
+    # 조회 구간은 거래일 캘린더로 실제 거래일에 맞춰 보정
+    with span('calendar'):
+        pykrx_from, pykrx_to = trading_calendar.trim(from_date, to_date)
+    if pykrx_from is None:
+        return None
+
+    # 결과 캐시: 지난 구간은 데이터 조회 없이 바로 반환
+    cache_key = (kind, ticker, pykrx_from, pykrx_to, strat_name, json.dumps(params or {}, sort_keys=True))
+    live = pykrx_to >= datetime.now().strftime('%Y%m%d')
+    if not live:
+        cached = result_cache.get(cache_key)
+        if cached:
+            return cached
+
+    # 로컬 OHLCV 저장소 -> 없는 구간만 pykrx 조회
+    with span('ohlcv'):
+        df = ohlcv_store.get(ticker, pykrx_from, pykrx_to)
+    if df.empty:
+        return None
+
+    version = None
+    if live:
+        # 당일 포함 구간은 마지막 봉이 바뀌었을 때(새 봉/체결)만 다시 계산
+        version = (len(df), df.index[-1], tuple(df.iloc[-1]))
+        cached = result_cache.get(cache_key, version)
+        if cached:
+            return cached
+
+    result = build(df, version)
+    result_cache.put(cache_key, result, version)
+    return result
+
+
+def _run_frames(df, strat_name, params):
+    """
+    백테스트 실행 후 차트용 데이터 반환
+    (stats, 캔들 df, 선 df, 자산 df, 매매 df, 봉 간격 ms)
+    봉 수가 MAX_POINTS를 넘으면 캔들은 버킷 OHLC, 선/자산은 버킷별 최솟값·최댓값으로 축소
+    """
+    # 선택된 전략 클래스 할당
+    selected_strat = STRATEGIES.get(strat_name, SmaSlopeStrategy)
+    bt = Backtest(df, selected_strat, cash=10000000, commission=.002)
+    with span('backtest'):
+        stats = bt.run(**(params or {}))
+
+    # 차트용 지표는 전체 구간으로 계산 (전략에서 이미 계산한 값은 공용 지표 캐시에서 재사용)
+    # 선택된 전략이 그리는 지표만 계산
+    with span('indicators'):
+        lines = {'SMA20': SMA(df['Close'], 20), 'SMA60': SMA(df['Close'], 60), 'SMA200': SMA(df['Close'], 200)}
+        lines.update(overlay_values(strat_name, df, strategy_params(selected_strat, params)))
+    equity = stats['_equity_curve']['Equity']
+
+    with span('frames'):
+        starts = bucket_starts(len(df))
+        if starts is None:
+            price_df = df.reset_index()
+            line_df = pd.DataFrame({'Date': price_df['Date'], **lines})
+            equity_df = equity.reset_index()[['Date', 'Equity']]
+        else:
+            price_df = decimate_ohlc(df, starts)
+            line_df = decimate_lines(df.index.values, lines, starts)
+            equity_df = decimate_lines(equity.index.values, {'Equity': equity.values}, starts)
+        # 색상 같은 파생 컬럼은 축소된 행에 대해서만 계산
+        price_df['color'] = ["#26a69a" if c >= o else "#ef5350" for o, c in zip(price_df.Open, price_df.Close)]
+
+        trades = stats['_trades'].copy()
+        if not trades.empty:
+            trades['EntryEquity'] = trades['EntryTime'].map(equity)
+            trades['ExitEquity'] = trades['ExitTime'].map(equity)
+            trades['pl_color'] = ["#26a69a" if p > 0 else "#ef5350" for p in trades['PnL']]
+            # [2, 2] 패턴 추가
+            trades['dash_pattern'] = [(2, 2)] * len(trades)
+    return stats, price_df, line_df, equity_df, trades, bar_width_ms(price_df['Date'])
+
+
+def _summary(stats, trades):
+    # 몬테카를로는 화면에서 요청할 때만 계산 (매매별 수익률만 실어 보내고 /api/montecarlo로 돌려받음)
+    return {"Return": f"{stats['Return [%]']:.2f}%", "WinRate": f"{stats['Win Rate [%]']:.2f}%", "Trades": len(trades),
+            "TradeReturns": montecarlo.trade_returns(trades)}
+
+
+def build_layout(strat_name, title, source, equity_source, trade_source=None, line_source=None, bar_ms=DAY_MS,
+                 params=None):
+    """
+    가격/거래량/자산/손익/보조지표 차트 구성
+    - source: 캔들/거래량, line_source: 이평선·전략 지표 (None이면 source 공용)
+    - trade_source가 None이면 매매 관련 glyph(연결선/마커/손익 막대)는 생략
+    - bar_ms: 봉(버킷) 간격, 캔들/막대 폭은 그 절반
+    - params: 전략 파라미터 (오버레이 범례용, None이면 전략 기본값)
+    """
+    line_source = line_source or source
+    p1 = figure(title=title, x_axis_type='datetime', name='price_fig',
+                height=400, sizing_mode='stretch_width', tools="pan,wheel_zoom,box_zoom,reset,save")
+    w = bar_ms / 2
+    p1.segment('Date', 'High', 'Date', 'Low', color="black", source=source)
+    candle_r = p1.vbar('Date', w, 'Open', 'Close', fill_color='color', line_color='color', source=source, alpha=0.5,
+                       name='candles')
+    sma20_r = p1.line('Date', 'SMA20', source=line_source, color='orange', line_width=2, legend_label="SMA 20")
+    sma60_r = p1.line('Date', 'SMA60', source=line_source, color='purple', line_width=1.5, legend_label="SMA 60")
+    p1.line('Date', 'SMA200', source=line_source, color='red', line_dash='dashed', legend_label="SMA 200")
+    # 전략별 가격 차트 오버레이 (routes/chart_overlays.py)
+    add_price_overlays(p1, strat_name, line_source, w,
+                       strategy_params(STRATEGIES.get(strat_name, SmaSlopeStrategy), params))
+
+    # --- [범례 위치 및 스타일 설정] ---
+    p1.legend.location = "top_left"      # 범례를 왼쪽 상단으로 이동
+    p1.legend.click_policy = "hide"      # 범례 클릭 시 해당 지표 숨기기 기능
+    p1.legend.background_fill_alpha = 0.5 # 범례 배경을 살짝 투명하게 (차트 가림 방지)
+    p1.legend.label_text_font_size = "9pt" # 범례 글자 크기 조절 (선택 사항)
+    
+    # 매매 연결선 (파이프 점선 패턴 적용)
+    if trade_source is not None:
+        p1.segment(x0='EntryTime', y0='EntryPrice', x1='ExitTime', y1='ExitPrice',
+                   line_dash='dash_pattern', line_color='#7f8c8d', line_width=1.5,
+                   source=trade_source, legend_label="매매 연결선")
+
+    # 캔들 전용 툴팁 (기존 유지)
+    hover_candle = HoverTool(
+        renderers=[candle_r], 
+        tooltips=[
+            ("날짜", "@Date{%F}"),
+            ("시가", "@Open{0,0}"),
+            ("고가", "@High{0,0}"),
+            ("저가", "@Low{0,0}"),
+            ("종가", "@Close{0,0}"),
+            ("거래량", "@Volume{0,0}")
+        ], 
+        formatters={'@Date': 'datetime'}, 
+        mode='vline',  # 세로선상에 마우스가 있으면 팝업
+        attachment='left',      # 툴팁 박스가 마우스 왼쪽에 나타남
+        show_arrow=True         # 박스 방향 화살표 표시
+    )
+    
+    # 이평선 전용 툴팁 (기존 유지)
+    hover_sma = HoverTool(
+        renderers=[sma20_r], # 만약 sma20_r 변수가 있다면
+        tooltips=[("이평선", "SMA 20"), ("가격", "$y{0,0}")], 
+        mode='mouse',  # 마우스가 이평선 위에 올라가면 팝업
+        attachment='right',     # 툴팁 박스가 마우스 오른쪽에 나타남
+        point_policy='snap_to_data' # 마커가 선에 딱 붙어서 표시됨
+    )
+    
+    # 이평선 전용 툴팁 (기존 유지)
+    hover_sma60 = HoverTool(
+        renderers=[sma60_r], # 만약 sma60_r 변수가 있다면
+        tooltips=[("이평선", "SMA 60"), ("가격", "$y{0,0}")], 
+        mode='mouse',  # 마우스가 이평선 위에 올라가면 팝업
+        attachment='right',     # 툴팁 박스가 마우스 오른쪽에 나타남
+        point_policy='snap_to_data' # 마커가 선에 딱 붙어서 표시됨
+    )
+    
+    # [생략된 부분 예시]
+    p1.add_tools(hover_candle)
+    p1.add_tools(hover_sma)
+    p1.add_tools(hover_sma60)
+    p1.xaxis.visible = False
+
+    # --- [신규 추가] P5: 거래량 차트 ---
+    p5 = figure(x_axis_type='datetime', x_range=p1.x_range, height=150, title="거래량", sizing_mode='stretch_width')
+    # 주가 색상과 동일하게 거래량 막대 표시
+    p5.vbar('Date', w, top='Volume', fill_color='color', line_color=None, source=source, alpha=0.7, name='volume')
+    
+    p5.add_tools(HoverTool(tooltips=[
+        ("날짜", "@Date{%F}"), ("거래량", "@Volume{0,0}")
+    ], formatters={'@Date': 'datetime'}, mode='vline'))
+    p5.xaxis.visible = False
+    p5.yaxis.axis_label = "Volume"
+
+    p2 = figure(x_axis_type='datetime', x_range=p1.x_range, height=280, title="자산 변화 및 매매 타점", sizing_mode='stretch_width')
+    equity_line = p2.line('Date', 'Equity', source=equity_source, color='blue', line_width=2, legend_label="Equity")
+
+    if trade_source is not None:
+        buy_m = p2.scatter(x='EntryTime', y='EntryEquity', size=15, color="#2ecc71", marker="triangle", source=trade_source)
+        sell_m = p2.scatter(x='ExitTime', y='ExitEquity', size=15, color="#e74c3c", marker="inverted_triangle", source=trade_source)
+        p2.add_tools(HoverTool(renderers=[buy_m, sell_m], tooltips="""
+            <div style="background: #2c3e50; color: white; padding: 8px; border-radius: 4px;">
+                <b style="color: #f1c40f;">[매매 상세]</b><br>
+                진입: @EntryTime{%F}<br>
+                청산: @ExitTime{%F}<br>
+                수익률: <b style="color: #2ecc71;">@ReturnPct{0.00%}</b><br>
+                손익: $@PnL{0,0}
+            </div>""", formatters={'@EntryTime': 'datetime', '@ExitTime': 'datetime'}, mode='mouse', attachment='above'))
+
+    p2.add_tools(HoverTool(renderers=[equity_line], tooltips=[("날짜", "@Date{%F}"), ("자산", "$@Equity{0,0}")], 
+                           formatters={'@Date': 'datetime'}, mode='vline', attachment='left'))
+    p2.xaxis.visible = False
+
+    p3 = figure(x_axis_type='datetime', x_range=p1.x_range, height=180, title="건별 손익(P/L)", sizing_mode='stretch_width')
+    if trade_source is not None:
+        pl_bar = p3.vbar(x='ExitTime', width=w*2, top='PnL', color='pl_color', source=trade_source)
+        p3.add_tools(HoverTool(renderers=[pl_bar], tooltips=[("청산일", "@ExitTime{%F}"), ("손익", "$@PnL{0,0}")], 
+                               formatters={'@ExitTime': 'datetime'}, mode='vline'))
+
+    # 전략별 보조지표 차트 (정의가 없으면 생략)
+    p4, after_pl = build_panel(strat_name, line_source, p1.x_range, w)
+    if p4 is None:
+        return column(p1, p5, p2, p3, sizing_mode='stretch_width')
+    if after_pl:
+        return column(p1, p5, p2, p3, p4, sizing_mode='stretch_width')
+    return column(p1, p5, p2, p4, p3, sizing_mode='stretch_width')
+
+
+def _chart_title(ticker, strat_name):
+    return f"K-Stock ({ticker}) - {strat_name.upper()} 전략 분석"
+
+
+def render_backtest(ticker, from_date, to_date, strat_name, params=None):
+    """
+    백테스트 실행 후 Bokeh 차트 컴포넌트 생성
+    반환: {'script', 'div', 'stats'} / 데이터 없음·에러 시 {'div': 메시지}
+    """
+    def build(df, version):
+        stats, price_df, line_df, equity_df, trades, bar_ms = _run_frames(df, strat_name, params)
+
+        # 차트에서 쓰는 컬럼만 브라우저로 전송 (축소하지 않았으면 캔들/선이 한 소스를 공유)
+        if len(line_df) == len(price_df):
+            source = ColumnDataSource(pd.concat([price_df, line_df.drop(columns='Date')], axis=1), name='price')
+            line_source = None
+        else:
+            source = ColumnDataSource(price_df, name='price')
+            line_source = ColumnDataSource(line_df, name='lines')
+        equity_source = ColumnDataSource(equity_df, name='equity')
+        trade_source = None if trades.empty else ColumnDataSource(trades[TRADE_COLUMNS], name='trades')
+
+        with span('layout'):
+            layout = build_layout(strat_name, _chart_title(ticker, strat_name), source, equity_source, trade_source,
+                                  line_source, bar_ms, params)
+        with span('embed'):
+            script, div = components(layout)
+        return {'script': script, 'div': div, 'stats': _summary(stats, trades)}
+
+    try:
+        result = _run_cached('html', ticker, from_date, to_date, strat_name, params, build)
+        return result or {'div': "데이터 없음"}
+    except Exception as e:
+        import traceback
+        print(traceback.format_exc())
+        return {'div': f"에러: {e}"}
+
+
+def chart_data(ticker, from_date, to_date, strat_name, params=None):
+    """
+    클라이언트 차트용 컬럼 데이터 (routes/columnar.py 인코딩)
+    반환: {'base_key', 'base', 'rest'} - base/rest는 미리 직렬화한 JSON 문자열
+    - base: 전략과 무관한 캔들(price)/이평선(lines) 컬럼 (base_key가 같으면 다시 보낼 필요 없음)
+    - rest: 전략별 지표 컬럼, 자산 곡선, 매매 내역, 통계
+    데이터가 없으면 None
+    """
+    def build(df, version):
+        stats, price_df, line_df, equity_df, trades, bar_ms = _run_frames(df, strat_name, params)
+        base_key = hashlib.sha1(repr((ticker, len(df), df.index[0], df.index[-1], version)).encode()).hexdigest()[:16]
+        overlay = [c for c in line_df.columns if c not in LINE_COLUMNS]
+        trades = trades.reindex(columns=TRADE_NUMERIC_COLUMNS)
+        with span('encode'):
+            rest = {
+                'title': _chart_title(ticker, strat_name),
+                'length': len(df),
+                'bar_ms': bar_ms,
+                'overlay': encode_frame(line_df, overlay),
+                'equity': encode_frame(equity_df, ['Date', 'Equity'], date_columns=['Date']),
+                'trades': encode_frame(trades, TRADE_NUMERIC_COLUMNS, date_columns=['EntryTime', 'ExitTime']),
+                'stats': _summary(stats, trades),
+            }
+            base = {'price': encode_frame(price_df, PRICE_COLUMNS, date_columns=['Date']),
+                    'lines': encode_frame(line_df, LINE_COLUMNS, date_columns=['Date'])}
+            return {'base_key': base_key, 'base': json.dumps(base), 'rest': json.dumps(rest, ensure_ascii=False)}
+
+    return _run_cached('data', ticker, from_date, to_date, strat_name, params, build)
+
+
+@lru_cache(maxsize=32)
+def chart_template(strat_name):
+    """
+    데이터가 빈 전략별 차트 템플릿 (json_item)
+    브라우저에서 name이 price/lines/equity/trades인 소스에 chart_data() 결과를 채워 넣음
+    """
+    empty = pd.DataFrame({c: pd.Series(dtype='float64') for c in COLUMNS})
+    overlay = overlay_values(strat_name, empty, strategy_params(STRATEGIES.get(strat_name, SmaSlopeStrategy)))
+    source = ColumnDataSource({c: [] for c in PRICE_COLUMNS + ['color']}, name='price')
+    line_source = ColumnDataSource({c: [] for c in LINE_COLUMNS + list(overlay)}, name='lines')
+    equity_source = ColumnDataSource({'Date': [], 'Equity': []}, name='equity')
+    trade_source = ColumnDataSource({c: [] for c in TRADE_COLUMNS}, name='trades')
+    layout = build_layout(strat_name, "", source, equity_source, trade_source, line_source)
+    return json_item(layout)
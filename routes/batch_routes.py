@@ -0,0 +1,48 @@
+from flask import Blueprint, render_template, request, stream_template
+from datetime import datetime, timedelta
+
+from data.trading_calendar import trading_calendar
+from engine.batch import MAX_TICKERS, SUMMARY_METRICS, parse_tickers, iter_batch
+from strategies.registry import STRATEGIES
+
+batch_bp = Blueprint('batch', __name__)
+
+
+@batch_bp.route('/batch', methods=['GET', 'POST'])
+def batch():
+    default_to = datetime.now().strftime('%Y-%m-%d')
+    default_from = (datetime.now() - timedelta(days=365)).strftime('%Y-%m-%d')
+
+    strat_name = request.form.get('strategy', 'slope')
+    if strat_name not in STRATEGIES:
+        strat_name = 'slope'
+    from_date = request.form.get('from_date', default_from)
+    to_date = request.form.get('to_date', default_to)
+
+    # 티커 입력: 스크리너 결과(hidden) / 직접 입력 / 파일 업로드
+    text = request.form.get('tickers', '')
+    upload = request.files.get('ticker_file')
+    if upload and upload.filename:
+        text += '\n' + upload.read().decode('utf-8', errors='ignore')
+    tickers = parse_tickers(text)
+
+    ctx = dict(strategy=strat_name, strategies=list(STRATEGIES), from_date=from_date, to_date=to_date,
+               tickers='\n'.join(tickers), n_tickers=len(tickers), metrics=SUMMARY_METRICS)
+
+    # 'run' 없이 들어온 POST는 스크리너에서 넘어온 티커로 폼만 채워서 보여줌
+    if request.method != 'POST' or 'run' not in request.form or not tickers:
+        return render_template('batch.html', rows=[], **ctx)
+
+    if len(tickers) > MAX_TICKERS:
+        return render_template('batch.html', rows=[], error=f"종목이 너무 많습니다 (최대 {MAX_TICKERS:,}종목)", **ctx)
+
+    try:
+        pykrx_from, pykrx_to = trading_calendar.trim(from_date, to_date)
+    except ValueError:
+        return render_template('batch.html', rows=[], error="날짜 형식 오류", **ctx)
+    if pykrx_from is None:
+        return render_template('batch.html', rows=[], error="데이터 없음", **ctx)
+
+    # 종목별 결과를 완료 순서대로 스트리밍
+    rows = iter_batch(tickers, strat_name, pykrx_from, pykrx_to)
+    return stream_template('batch.html', rows=rows, running=True, **ctx)
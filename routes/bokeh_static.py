@@ -0,0 +1,103 @@
+import gzip
+import hashlib
+import threading
+from functools import lru_cache
+
+import bokeh
+from bokeh.resources import Resources
+from bokeh.util.paths import bokehjs_path
+from flask import Blueprint, Response, abort, request
+from werkzeug.security import safe_join
+
+try:  # brotli 모듈이 설치된 경우에만 br 압축 제공
+    import brotli
+except ImportError:
+    brotli = None
+
+bokeh_static_bp = Blueprint('bokeh_static', __name__)
+
+# URL에 Bokeh 버전을 넣어서 버전이 바뀌면 주소도 바뀜 -> 브라우저 캐시를 1년 유지해도 안전
+BOKEH_VERSION = bokeh.__version__
+URL_PREFIX = f'/bokeh/{BOKEH_VERSION}/'
+CACHE_CONTROL = 'public, max-age=31536000, immutable'
+CONTENT_TYPES = {'.js': 'application/javascript; charset=utf-8', '.css': 'text/css; charset=utf-8'}
+
+_assets = {}   # 파일 경로 -> {'identity', 'gzip', 'br', 'etag', 'type'}
+_lock = threading.Lock()
+
+
+def _load_asset(filename):
+    """정적 파일을 읽어서 원본/압축본을 메모리에 올려둠 (파일당 한 번만)"""
+    asset = _assets.get(filename)
+    if asset is not None:
+        return asset
+    with _lock:
+        asset = _assets.get(filename)
+        if asset is not None:
+            return asset
+
+        ext = '.' + filename.rsplit('.', 1)[-1] if '.' in filename else ''
+        path = safe_join(bokehjs_path(), filename)
+        if ext not in CONTENT_TYPES or path is None:
+            return None
+        try:
+            with open(path, 'rb') as f:
+                body = f.read()
+        except OSError:
+            return None
+
+        asset = {'identity': body, 'gzip': gzip.compress(body, 9, mtime=0), 'type': CONTENT_TYPES[ext],
+                 'etag': hashlib.sha1(body).hexdigest()[:20]}
+        if brotli is not None:
+            asset['br'] = brotli.compress(body)
+        _assets[filename] = asset
+        return asset
+
+
+def _pick_encoding(asset):
+    accepted = request.accept_encodings
+    if 'br' in asset and accepted['br']:
+        return 'br'
+    if accepted['gzip']:
+        return 'gzip'
+    return 'identity'
+
+
+@bokeh_static_bp.route(URL_PREFIX + 'static/<path:filename>')
+def bokeh_asset(filename):
+    """BokehJS 번들 제공 (ETag + gzip/br 압축, 장기 캐시)"""
+    asset = _load_asset(filename)
+    if asset is None:
+        abort(404)
+
+    encoding = _pick_encoding(asset)
+    # 압축 방식마다 본문이 다르므로 ETag도 구분
+    etag = f"{asset['etag']}-{encoding}"
+    headers = {'Cache-Control': CACHE_CONTROL, 'Vary': 'Accept-Encoding'}
+    if etag in request.if_none_match:
+        resp = Response(status=304, headers=headers)
+        resp.set_etag(etag)
+        return resp
+
+    resp = Response(asset[encoding], content_type=asset['type'], headers=headers)
+    if encoding != 'identity':
+        resp.headers['Content-Encoding'] = encoding
+    resp.set_etag(etag)
+    return resp
+
+
+def preload_assets():
+    """BokehJS 번들을 미리 읽고 압축해 둠 (운영 서버 시작 시 호출, 반환: 파일 개수)"""
+    files = Resources(mode='server', root_url=URL_PREFIX).js_files
+    names = [url.split('?')[0][len(URL_PREFIX + 'static/'):] for url in files]
+    return sum(_load_asset(name) is not None for name in names)
+
+
+@lru_cache(maxsize=8)
+def _render_resources(script_root):
+    return Resources(mode='server', root_url=script_root + URL_PREFIX).render()
+
+
+def bokeh_resources():
+    """템플릿 <head>에 넣을 BokehJS <script> 태그 (번들 본문은 위 라우트에서 따로 받음)"""
+    return _render_resources(request.script_root)
@@ -0,0 +1,47 @@
+import json
+from flask import Blueprint, Response, jsonify, request
+
+from routes.backtest_view import chart_data, chart_template
+
+chart_data_bp = Blueprint('chart_data', __name__)
+
+
+@chart_data_bp.route('/api/chart')
+def get_chart_data():
+    """
+    클라이언트 차트용 컬럼 데이터
+    입력: ticker, from_date, to_date, strategy, params(JSON), base_key(브라우저가 이미 가진 가격 데이터 키)
+    base_key가 일치하면 가격/이평선 컬럼(price)은 null로 보내고 전략별 컬럼만 전송
+    """
+    args = request.args
+    try:
+        params = json.loads(args.get('params') or '{}')
+    except ValueError as e:
+        return jsonify({'error': f'파라미터 오류: {e}'}), 400
+    try:
+        payload = chart_data(args.get('ticker', '005930'), args['from_date'], args['to_date'],
+                             args.get('strategy', 'slope'), params)
+    except KeyError as e:
+        return jsonify({'error': f'{e.args[0]} 값이 필요합니다.'}), 400
+    except Exception as e:
+        import traceback
+        print(traceback.format_exc())
+        return jsonify({'error': f'에러: {e}'}), 500
+
+    if payload is None:
+        return jsonify({'error': '데이터 없음'}), 404
+
+    # 캐시에 JSON 문자열로 저장해 두었으므로 다시 직렬화하지 않고 이어 붙임
+    price = 'null' if args.get('base_key') == payload['base_key'] else payload['base']
+    body = f'{{"base_key": {json.dumps(payload["base_key"])}, "price": {price}, {payload["rest"][1:]}'
+    return Response(body, mimetype='application/json')
+
+
+@chart_data_bp.route('/api/chart/template/<strat_name>')
+def get_chart_template(strat_name):
+    """데이터가 빈 전략별 Bokeh 차트 템플릿 (json_item, 본문 해시를 ETag로 사용)"""
+    resp = jsonify(chart_template(strat_name))
+    resp.add_etag()
+    resp.cache_control.public = True
+    resp.cache_control.max_age = 86400
+    return resp.make_conditional(request)
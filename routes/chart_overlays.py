@@ -0,0 +1,181 @@
+import numpy as np
+from bokeh.plotting import figure
+from bokeh.models import HoverTool, Span
+
+from strategies.indicators import (SMA, HIGHEST, LOWEST, RSI_Indicator, MACD_Indicator,
+                                   ADX_Indicator, VWAP_Indicator)
+
+
+# --- 전략별 차트 컬럼 계산 함수: (OHLCV df, 전략 파라미터) -> {컬럼명: 값} ---
+def _fib_columns(d, p):
+    hh = HIGHEST(d['High'], p['n_lookback'], 1)
+    ll = LOWEST(d['Low'], p['n_lookback'], 1)
+    diff = hh - ll
+    return {'Fib382': hh - diff * 0.382, 'Fib500': hh - diff * 0.500, 'Fib618': hh - diff * 0.618}
+
+
+def _target_columns(d, p):
+    prev_range = (d['High'] - d['Low']).shift(1)
+    return {'Target': d['Open'] + prev_range * p['k']}
+
+
+def _adx_columns(d, p):
+    adx, plus_di, minus_di = ADX_Indicator(d['High'], d['Low'], d['Close'], p['n'])
+    return {'ADX': adx, 'PlusDI': plus_di, 'MinusDI': minus_di}
+
+
+def _macd_columns(d, p):
+    m_line, s_line, h_bar = MACD_Indicator(d['Close'], p['n_fast'], p['n_slow'], p['n_signal'])
+    return {'MACD': m_line, 'MACD_Signal': s_line, 'MACD_Hist': h_bar}
+
+
+def _rsi_columns(d, p):
+    return {'RSI': RSI_Indicator(d['Close'], p['n_rsi'])}
+
+
+_RSI_HOVER = {'tooltips': [("날짜", "@Date{%F}"), ("RSI", "@RSI{0.0}")], 'formatters': {'@Date': 'datetime'}, 'mode': 'vline'}
+
+# --- 전략별 차트 구성 정의 ---
+# columns: 계산할 컬럼 / price: 가격 차트(p1) 오버레이 / panel: 보조지표 차트(p4)
+# legend_label은 문자열 또는 전략 파라미터 -> 문자열 함수
+# panel.after_pl: True면 손익 차트(p3) 아래, 아니면 자산 차트(p2)와 손익 차트 사이에 배치
+OVERLAYS = {
+    'cross': {
+        'columns': lambda d, p: {'SMA_fast': SMA(d['Close'], p['n_fast'])},
+        'price': [{'glyph': 'line', 'y': 'SMA_fast', 'color': 'blue', 'line_width': 1.5,
+                   'legend_label': lambda p: f"SMA {p['n_fast']}"}],
+    },
+    'sr_flip': {
+        # 저항선 그리기 (회색 점선)
+        'columns': lambda d, p: {'Resistance': HIGHEST(d['High'], p['n_lookback'], 1)},
+        'price': [{'glyph': 'step', 'y': 'Resistance', 'color': 'gray', 'line_dash': 'dashed', 'legend_label': "Resistance Level"}],
+    },
+    'v_breakout': {
+        # 매수 타겟 라인 (검은색 점선 계단형)
+        'columns': _target_columns,
+        'price': [{'glyph': 'step', 'y': 'Target', 'color': 'black', 'line_dash': 'dotted', 'line_alpha': 0.6,
+                   'legend_label': "Breakout Target"}],
+    },
+    'fibonacci': {
+        # 피보나치 되돌림 레벨 (0.382, 0.500, 0.618)
+        'columns': _fib_columns,
+        'price': [{'glyph': 'line', 'y': 'Fib382', 'color': 'blue', 'line_dash': 'dashed', 'legend_label': "Fib 38.2%"},
+                  {'glyph': 'line', 'y': 'Fib500', 'color': 'green', 'line_dash': 'dashed', 'legend_label': "Fib 50.0%"},
+                  {'glyph': 'line', 'y': 'Fib618', 'color': 'red', 'line_dash': 'dashed', 'legend_label': "Fib 61.8%"}],
+    },
+    'vwap': {
+        # VWAP 라인 (검은색 실선)
+        'columns': lambda d, p: {'VWAP': VWAP_Indicator(d['High'], d['Low'], d['Close'], d['Volume'])},
+        'price': [{'glyph': 'line', 'y': 'VWAP', 'color': 'black', 'line_width': 2, 'legend_label': "VWAP"}],
+    },
+    'adx': {
+        'columns': _adx_columns,
+        'panel': {
+            'title': "ADX 지표", 'height': 180, 'after_pl': True,
+            'glyphs': [{'glyph': 'line', 'y': 'ADX', 'color': 'purple', 'legend_label': "ADX"},
+                       {'glyph': 'line', 'y': 'PlusDI', 'color': 'green', 'legend_label': "+DI"},
+                       {'glyph': 'line', 'y': 'MinusDI', 'color': 'red', 'legend_label': "-DI"}],
+            'legend': {'location': "top_left"},
+        },
+    },
+    'macd': {
+        'columns': _macd_columns,
+        'panel': {
+            'title': "MACD 지표", 'height': 200, 'hide_xaxis': True,
+            'glyphs': [{'glyph': 'line', 'y': 'MACD', 'color': 'blue', 'line_width': 1.5, 'legend_label': "MACD"},
+                       {'glyph': 'line', 'y': 'MACD_Signal', 'color': 'orange', 'line_width': 1.5, 'legend_label': "Signal"},
+                       # MACD 히스토그램 (막대)
+                       {'glyph': 'vbar', 'y': 'MACD_Hist', 'color': 'gray', 'alpha': 0.5, 'legend_label': "Histogram"}],
+            'hover': {'tooltips': [("MACD", "@MACD{0.00}"), ("Signal", "@MACD_Signal{0.00}")], 'mode': 'vline'},
+            'legend': {'location': "top_left", 'orientation': "horizontal"},
+        },
+    },
+    'rsi': {
+        'columns': _rsi_columns,
+        'panel': {
+            'title': "RSI (상대강도지수)", 'height': 180, 'y_range': (0, 100), 'hide_xaxis': True,
+            'glyphs': [{'glyph': 'line', 'y': 'RSI', 'color': 'purple', 'line_width': 1.5, 'legend_label': "RSI (14)"}],
+            # 과매수/과매도 가이드 라인 (30, 70)
+            'spans': [{'location': 70, 'line_color': 'red', 'line_dash': 'dashed', 'line_alpha': 0.5},
+                      {'location': 30, 'line_color': 'green', 'line_dash': 'dashed', 'line_alpha': 0.5}],
+            'hover': {**_RSI_HOVER, 'renderer': 0, 'attachment': 'left'},
+            'legend': {'location': "top_left"},
+        },
+    },
+    'rsi_div': {
+        'columns': _rsi_columns,
+        'panel': {
+            'title': "RSI 다이버전스 지표", 'height': 200, 'y_range': (0, 100),
+            'glyphs': [{'glyph': 'line', 'y': 'RSI', 'color': '#8E44AD', 'line_width': 2, 'legend_label': "RSI"}],
+            'spans': [{'location': 70, 'line_color': 'red', 'line_dash': 'dashed', 'line_alpha': 0.5},
+                      {'location': 30, 'line_color': 'green', 'line_dash': 'dashed', 'line_alpha': 0.5}],
+            'hover': {**_RSI_HOVER, 'tooltips': [("날짜", "@Date{%F}"), ("RSI", "@RSI{0.1}")], 'renderer': 0},
+        },
+    },
+    'rsi_support': {
+        'columns': _rsi_columns,
+        'panel': {
+            'title': "RSI 40-50 지지 분석", 'height': 200,
+            'glyphs': [{'glyph': 'line', 'y': 'RSI', 'color': 'purple', 'line_width': 2}],
+            # 과매수/과매도선과 40-50 지지 구간
+            'spans': [{'location': 70, 'line_color': 'red', 'line_dash': 'dashed'},
+                      {'location': 50, 'line_color': 'orange', 'line_dash': 'dotted', 'line_alpha': 0.6},
+                      {'location': 40, 'line_color': 'orange', 'line_dash': 'dotted', 'line_alpha': 0.6},
+                      {'location': 30, 'line_color': 'green', 'line_dash': 'dashed'}],
+        },
+    },
+}
+
+
+def strategy_params(strategy, params=None):
+    """전략 클래스 기본 파라미터에 사용자 지정 파라미터를 덮어쓴 dict"""
+    defaults = {k: v for k, v in vars(strategy).items() if not k.startswith('_') and not callable(v)}
+    return {**defaults, **(params or {})}
+
+
+def overlay_values(strat_name, df, params):
+    """선택된 전략이 그리는 컬럼만 계산 ({컬럼명: numpy 배열})"""
+    spec = OVERLAYS.get(strat_name, {})
+    extra = spec['columns'](df, params) if 'columns' in spec else {}
+    return {name: np.asarray(values, dtype='float64') for name, values in extra.items()}
+
+
+def add_glyph(fig, spec, source, w, params=None):
+    g = dict(spec)
+    kind, y = g.pop('glyph'), g.pop('y')
+    if callable(g.get('legend_label')):
+        g['legend_label'] = g['legend_label'](params)
+    if kind == 'vbar':
+        return fig.vbar('Date', w, top=y, source=source, **g)
+    return getattr(fig, kind)('Date', y, source=source, **g)
+
+
+def add_price_overlays(p1, strat_name, source, w, params):
+    for g in OVERLAYS.get(strat_name, {}).get('price', []):
+        add_glyph(p1, g, source, w, params)
+
+
+def build_panel(strat_name, source, x_range, w):
+    """보조지표 차트(p4) 생성, 정의가 없으면 (None, False)"""
+    spec = OVERLAYS.get(strat_name, {}).get('panel')
+    if spec is None:
+        return None, False
+
+    extra = {'y_range': spec['y_range']} if 'y_range' in spec else {}
+    p4 = figure(x_axis_type='datetime', x_range=x_range, height=spec['height'],
+                title=spec['title'], sizing_mode='stretch_width', **extra)
+    renderers = [add_glyph(p4, g, source, w) for g in spec['glyphs']]
+    for s in spec.get('spans', []):
+        p4.add_layout(Span(dimension='width', **s))
+
+    if 'hover' in spec:
+        hover = dict(spec['hover'])
+        if 'renderer' in hover:
+            hover['renderers'] = [renderers[hover.pop('renderer')]]
+        p4.add_tools(HoverTool(**hover))
+
+    if spec.get('hide_xaxis'):
+        p4.xaxis.visible = False
+    for k, v in spec.get('legend', {}).items():
+        setattr(p4.legend, k, v)
+    return p4, spec.get('after_pl', False)
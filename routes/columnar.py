@@ -0,0 +1,37 @@
+import base64
+import numpy as np
+import pandas as pd
+
+# 브라우저 TypedArray와 1:1로 대응하는 dtype만 사용 (리틀 엔디언)
+_INT32 = np.iinfo(np.int32)
+
+
+def to_epoch_ms(values):
+    """날짜 컬럼 -> Bokeh datetime 축 단위(ms, float64), NaT는 NaN"""
+    dt = pd.to_datetime(pd.Series(values))
+    ms = dt.to_numpy(dtype='datetime64[ms]').astype('int64').astype('float64')
+    ms[dt.isna().to_numpy()] = np.nan
+    return ms
+
+
+def encode_array(values):
+    """
+    1차원 숫자 배열 -> {'dtype', 'data'(base64)}
+    정수값으로만 이루어지고 int32 범위면 int32, 아니면 float64 (NaN 포함)
+    """
+    arr = np.asarray(values, dtype='float64')
+    if len(arr) and np.isfinite(arr).all() and (arr == np.round(arr)).all() \
+            and arr.min() >= _INT32.min and arr.max() <= _INT32.max:
+        dtype, arr = 'int32', arr.astype('<i4')
+    else:
+        dtype, arr = 'float64', arr.astype('<f8')
+    return {'dtype': dtype, 'data': base64.b64encode(arr.tobytes()).decode('ascii')}
+
+
+def encode_frame(df, columns, date_columns=()):
+    """DataFrame의 지정 컬럼들을 {컬럼명: 인코딩 배열} 형태로 변환"""
+    out = {}
+    for c in columns:
+        values = to_epoch_ms(df[c]) if c in date_columns else df[c]
+        out[c] = encode_array(values)
+    return out
@@ -0,0 +1,78 @@
+import os
+import numpy as np
+import pandas as pd
+
+# 차트로 보내는 최대 버킷 수 (대략 화면 가로 픽셀 수)
+MAX_POINTS = int(os.environ.get('JTRADER_CHART_POINTS', 2000))
+DAY_MS = 24 * 60 * 60 * 1000
+
+
+def bucket_starts(n, max_points=MAX_POINTS):
+    """n개 봉을 max_points개 이하의 같은 크기 버킷으로 나눈 시작 위치 (나눌 필요 없으면 None)"""
+    if n <= max_points:
+        return None
+    k = -(-n // max_points)
+    return np.arange(0, n, k)
+
+
+def _bucket_ends(starts, n):
+    return np.r_[starts[1:], n] - 1
+
+
+def decimate_ohlc(df, starts):
+    """
+    버킷별 OHLCV 집계 (인덱스: Date)
+    날짜/시가=첫 봉, 고가=최대, 저가=최소, 종가=마지막 봉, 거래량=합계
+    """
+    ends = _bucket_ends(starts, len(df))
+    return pd.DataFrame({
+        'Date': df.index.values[starts],
+        'Open': df['Open'].values[starts],
+        'High': np.maximum.reduceat(df['High'].values, starts),
+        'Low': np.minimum.reduceat(df['Low'].values, starts),
+        'Close': df['Close'].values[ends],
+        'Volume': np.add.reduceat(df['Volume'].values, starts),
+    })
+
+
+def _min_max_pairs(values, starts):
+    # 버킷마다 (최솟값, 최댓값)을 발생 순서대로 2개 점으로 (NaN만 있는 버킷은 NaN)
+    n, nb = len(values), len(starts)
+    k = starts[1] - starts[0] if nb > 1 else n
+    m = np.full(nb * k, np.nan)
+    m[:n] = values
+    m = m.reshape(nb, k)
+    nan = np.isnan(m)
+    i_min = np.where(nan, np.inf, m).argmin(axis=1)
+    i_max = np.where(nan, -np.inf, m).argmax(axis=1)
+    rows = np.arange(nb)
+    v_min, v_max = m[rows, i_min], m[rows, i_max]
+    min_first = i_min <= i_max
+    out = np.empty(nb * 2)
+    out[0::2] = np.where(min_first, v_min, v_max)
+    out[1::2] = np.where(min_first, v_max, v_min)
+    return out
+
+
+def decimate_lines(dates, columns, starts):
+    """
+    선 차트용 버킷 축소: 컬럼마다 버킷별 최솟값/최댓값 2개 점 (버킷 첫 봉/마지막 봉 날짜에 배치)
+    급등락이나 낙폭이 축소 후에도 사라지지 않음
+    """
+    dates = np.asarray(dates)
+    ends = _bucket_ends(starts, len(dates))
+    out_dates = np.empty(len(starts) * 2, dtype=dates.dtype)
+    out_dates[0::2] = dates[starts]
+    out_dates[1::2] = dates[ends]
+    frame = {'Date': out_dates}
+    for name, values in columns.items():
+        frame[name] = _min_max_pairs(np.asarray(values, dtype='float64'), starts)
+    return pd.DataFrame(frame)
+
+
+def bar_width_ms(dates):
+    """봉(버킷) 간격 중앙값(ms), 캔들/막대 폭 계산용"""
+    dates = np.asarray(dates, dtype='datetime64[ms]')
+    if len(dates) < 2:
+        return DAY_MS
+    return int(np.median(np.diff(dates).astype('int64')))
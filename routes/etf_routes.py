@@ -1,65 +1,51 @@
 from flask import Blueprint, render_template, request
 from pykrx import stock
-from datetime import datetime, timedelta
+from datetime import datetime
 import pandas as pd
+from data.snapshot_cache import snapshot_cache
+from data.trading_calendar import trading_calendar
+from engine.screener import DEFAULT_SORT, PER_PAGE, screen, screen_table, page_args
+from monitoring.timing import span
+from data.ticker_names import attach_etf_names
 
 etf_bp = Blueprint('etf', __name__)
 
-def get_filtered_etfs(date_str, params, retry_days=5):
+# ETF 화면에서 쓰는 조건 (engine/screener.py FILTERS 중 일부)
+ETF_FILTERS = ['min_change', 'max_change', 'min_amount', 'min_volume', 'min_close', 'max_close']
+
+def get_filtered_etfs(date_str, params, sort=DEFAULT_SORT, descending=True, page=1, per_page=PER_PAGE):
     """
-    pykrx를 이용해 ETF 종목 필터링 수행
+    pykrx ETF 스냅샷에서 조건 검색 (engine/screener.py)
+    반환: (screen() 결과, 실제 기준일) / 스냅샷이 비어 있으면 결과는 None
     """
-    df = pd.DataFrame()
-    target_date = date_str
-    
-    # 주말/공휴일 대비 재시도 로직
-    for i in range(retry_days):
-        current_attempt_date = (datetime.strptime(target_date, "%Y%m%d") - timedelta(days=i)).strftime("%Y%m%d")
-        # ETF 등락 및 특수 지표 가져오기
-        df = stock.get_etf_price_change_by_ticker(current_attempt_date, current_attempt_date)
-        if not df.empty:
-            target_date = current_attempt_date
-            break
-            
-    if df.empty:
-        return df, target_date
+    # 주말/공휴일이면 거래일 캘린더에서 직전 거래일로 보정 (네트워크 재시도 없음)
+    with span('calendar'):
+        target_date = trading_calendar.latest_session(date_str) or date_str
+    with span('snapshot'):
+        df = snapshot_cache.get('etf_price_change', target_date,
+                                lambda: stock.get_etf_price_change_by_ticker(target_date, target_date))
 
-    df = df.reset_index() # 티커를 컬럼으로
-    
-    # 종목명 추가
-    df['종목명'] = df['티커'].apply(lambda x: stock.get_etf_ticker_name(x))
+    if df.empty:
+        return None, target_date
 
-    # 필터링 조건 적용
-    try:
-        if params.get('min_change'): df = df[df['등락률'] >= float(params['min_change'])]
-        if params.get('max_change'): df = df[df['등락률'] <= float(params['max_change'])]
-        if params.get('min_amount'): df = df[df['거래대금'] >= int(params['min_amount'])]
-        if params.get('min_volume'): df = df[df['거래량'] >= int(params['min_volume'])]
-        if params.get('min_close'): df = df[df['종가'] >= int(params['min_close'])]
-        if params.get('max_close'): df = df[df['종가'] <= int(params['max_close'])]
-        
-    except ValueError:
-        pass
+    with span('filter'):
+        table = screen_table('etf_price_change', target_date, df)
+        result = screen(table, params, sort, descending, page, per_page)
 
-    # 등락률 내림차순 정렬
-    df = df.sort_values(by='등락률', ascending=False)
+    # 종목명 추가 (현재 페이지 행만 마스터 테이블과 일괄 merge)
+    with span('names'):
+        result['rows'] = attach_etf_names(result['rows'])
     
-    return df, target_date
+    return result, target_date
 
 @etf_bp.route('/etf', methods=['GET', 'POST'])
 def etf_list():
     default_date = datetime.now().strftime("%Y-%m-%d")
     
-    if request.method == 'POST':
-        date_input = request.form.get('date', default_date).replace('-', '')
-        params = {
-            'min_change': request.form.get('min_change'),
-            'max_change': request.form.get('max_change'),
-            'min_amount': request.form.get('min_amount'),
-            'min_volume': request.form.get('min_volume'),
-            'min_close': request.form.get('min_close'),
-            'max_close': request.form.get('max_close')
-        }
+    # 폼 제출(POST) 또는 페이지/정렬 링크(GET 쿼리)에 조건이 담겨 옴
+    if request.method == 'POST' or 'date' in request.args:
+        date_input = request.values.get('date', default_date).replace('-', '')
+        params = {name: request.values.get(name) for name in ETF_FILTERS}
     else:
         date_input = default_date.replace('-', '')
         params = {
@@ -69,10 +55,13 @@ def etf_list():
             'min_close': '10000'
         }
 
-    df, final_date = get_filtered_etfs(date_input, params)
-    
+    result, final_date = get_filtered_etfs(date_input, params, **page_args(request.values))
+    date = datetime.strptime(final_date, "%Y%m%d").strftime("%Y-%m-%d")
+
+    # 현재 페이지 행만 변환해서 템플릿에 전달
     etfs_data = []
-    if not df.empty:
+    if result and not result['rows'].empty:
+        df = result['rows']
         # 1. 컬럼명을 안전하게 강제 변환 (문자열 포함 여부 확인)
         new_cols = {}
         for col in df.columns:
@@ -96,11 +85,15 @@ def etf_list():
         df = df.fillna(0)
         etfs_data = df.to_dict('records')
 
-    # 총 건수 계산
-    total_count = len(etfs_data)
+    # 총 건수 계산 (페이지와 무관한 전체 결과 건수)
+    total_count = result['total'] if result else 0
+    query = {'date': date, **{k: v for k, v in params.items() if v}}
 
-    return render_template('etf.html', 
-                           etfs=etfs_data, 
-                           total_count=total_count, 
-                           date=datetime.strptime(final_date, "%Y%m%d").strftime("%Y-%m-%d"),
-                           params=params)
\ No newline at end of file
+    with span('template'):
+        return render_template('etf.html',
+                               etfs=etfs_data,
+                               result=result,
+                               query=query,
+                               total_count=total_count,
+                               date=date,
+                               params=params)
\ No newline at end of file
@@ -0,0 +1,75 @@
+import json
+from datetime import datetime
+from flask import Blueprint, Response, jsonify, request, url_for, stream_with_context
+
+from engine.jobs import job_queue, job_view
+
+job_bp = Blueprint('jobs', __name__)
+
+
+@job_bp.route('/api/jobs', methods=['POST'])
+def submit_job():
+    """
+    백테스트 작업 제출
+    입력(JSON 또는 폼): ticker, from_date, to_date, strategy, params(dict 또는 JSON 문자열)
+    """
+    data = request.get_json(silent=True) or request.form
+    params = data.get('params') or {}
+    try:
+        if isinstance(params, str):
+            params = json.loads(params)
+    except ValueError as e:
+        return jsonify({'error': f'params JSON 오류: {e}'}), 400
+    if not isinstance(params, dict):
+        return jsonify({'error': 'params는 객체(dict)여야 합니다.'}), 400
+
+    dates = []
+    for field in ('from_date', 'to_date'):
+        value = data.get(field)
+        if not value:
+            return jsonify({'error': f'{field} 값이 필요합니다.'}), 400
+        try:
+            datetime.strptime(value.replace('-', ''), '%Y%m%d')
+        except (AttributeError, ValueError):
+            return jsonify({'error': f'{field} 날짜 형식 오류: {value!r} (YYYY-MM-DD)'}), 400
+        dates.append(value)
+
+    job = job_queue.submit(data.get('ticker', '005930'), dates[0], dates[1],
+                           data.get('strategy', 'slope'), params)
+
+    body = job_view(job)
+    body['poll_url'] = url_for('jobs.get_job', job_id=job['id'])
+    body['stream_url'] = url_for('jobs.stream_job', job_id=job['id'])
+    return jsonify(body), 200 if job['status'] == 'done' else 202
+
+
+@job_bp.route('/api/jobs/<job_id>')
+def get_job(job_id):
+    """작업 상태 조회 (?wait=초 지정 시 완료될 때까지 최대 그만큼 대기)"""
+    wait = min(request.args.get('wait', 0, type=float), 30)
+    job = job_queue.wait(job_id, wait) if wait else job_queue.get(job_id)
+    if job is None:
+        return jsonify({'error': '작업을 찾을 수 없습니다.'}), 404
+    return jsonify(job_view(job))
+
+
+@job_bp.route('/api/jobs/<job_id>/stream')
+def stream_job(job_id):
+    """Server-Sent Events로 상태를 보내다가 완료되면 결과를 보내고 종료"""
+    if job_queue.get(job_id) is None:
+        return jsonify({'error': '작업을 찾을 수 없습니다.'}), 404
+
+    def events():
+        while True:
+            job = job_queue.wait(job_id, timeout=5)
+            if job is None:
+                # 보관 기간이 지나 작업이 정리됨
+                yield f"event: error\ndata: {json.dumps({'error': '작업을 찾을 수 없습니다.'}, ensure_ascii=False)}\n\n"
+                break
+            view = job_view(job)
+            yield f"event: {view['status']}\ndata: {json.dumps(view, ensure_ascii=False)}\n\n"
+            if job['status'] in ('done', 'error'):
+                break
+
+    return Response(stream_with_context(events()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache'})
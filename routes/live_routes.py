@@ -0,0 +1,113 @@
+import os
+import json
+import time
+import threading
+from flask import Blueprint, render_template, request
+from flask_sock import Sock
+from simple_websocket import ConnectionClosed
+from datetime import datetime, timedelta
+
+from data.ohlcv_store import ohlcv_store
+from data.trading_calendar import trading_calendar
+from engine.streaming import STREAMS, SignalStream, replay_feed, live_feed
+
+live_bp = Blueprint('live', __name__)
+# 웹소켓 연결 하나가 gthread 워커 스레드 하나를 연결이 끝날 때까지 점유함 (gunicorn.conf.py threads)
+sock = Sock()
+
+MAX_INTERVAL = 5.0
+LIVE_POLL = 60
+# 워커 프로세스당 동시 피드 수 / 피드 하나의 최대 연결 시간(초)
+# (피드가 요청 스레드를 모두 차지해 일반 HTTP 요청이 밀리지 않도록)
+MAX_FEEDS = int(os.environ.get('JTRADER_MAX_FEEDS', 2))
+MAX_FEED_SECONDS = int(os.environ.get('JTRADER_MAX_FEED_SECONDS', 60 * 60))
+_feed_slots = threading.BoundedSemaphore(MAX_FEEDS)
+
+
+def _float_arg(args, name, default, low, high):
+    try:
+        return max(low, min(high, float(args.get(name, default))))
+    except (TypeError, ValueError):
+        return default
+
+
+@live_bp.route('/live')
+def live():
+    default_to = datetime.now().strftime('%Y-%m-%d')
+    default_from = (datetime.now() - timedelta(days=365)).strftime('%Y-%m-%d')
+    return render_template('live.html', strategies=list(STREAMS), default_from=default_from, default_to=default_to)
+
+
+@sock.route('/ws/signals', bp=live_bp)
+def signal_feed(ws):
+    """
+    봉 단위 신호 피드 (웹소켓, 서버 -> 클라이언트 JSON 메시지)
+    입력(쿼리): ticker, strategy, params(JSON), mode=replay|live, from_date, to_date, interval(재생 간격 초)
+    - replay: 저장된 일봉을 interval초 간격으로 재생 (지표는 봉마다 증분 갱신)
+    - live: from_date부터 이력을 먼저 흘려보낸 뒤 LIVE_POLL초마다 새 봉 확인
+    메시지: start / bar(지표, 진입·청산 신호, 주문) / tick(장중 미확정 봉) / wait(live 조회 주기마다) / end / error
+    워커 프로세스당 MAX_FEEDS개까지, 피드 하나는 최대 MAX_FEED_SECONDS초 동안만 유지
+    """
+    if not _feed_slots.acquire(blocking=False):
+        ws.send(json.dumps({'type': 'error', 'error': f'동시 신호 피드가 가득 찼습니다 (최대 {MAX_FEEDS}개). 잠시 후 다시 시도하세요.'}))
+        return
+    try:
+        _run_feed(ws, request.args)
+    except ConnectionClosed:
+        pass   # 브라우저가 연결을 끊음
+    except Exception as e:
+        import traceback
+        print(traceback.format_exc())
+        try:
+            ws.send(json.dumps({'type': 'error', 'error': f'에러: {e}'}))
+        except ConnectionClosed:
+            pass
+    finally:
+        _feed_slots.release()
+
+
+def _run_feed(ws, args):
+    strat_name = args.get('strategy', 'slope')
+    if strat_name not in STREAMS:
+        ws.send(json.dumps({'type': 'error', 'error': f'스트리밍을 지원하지 않는 전략: {strat_name}'}))
+        return
+    ticker = args.get('ticker', '005930')
+    mode = args.get('mode', 'replay')
+    try:
+        stream = SignalStream(strat_name, json.loads(args.get('params') or '{}'))
+    except (ValueError, AttributeError, TypeError) as e:
+        ws.send(json.dumps({'type': 'error', 'error': f'파라미터 오류: {e}'}))
+        return
+
+    from_date = args.get('from_date') or (datetime.now() - timedelta(days=365)).strftime('%Y-%m-%d')
+    to_date = args.get('to_date') or datetime.now().strftime('%Y-%m-%d')
+    try:
+        for d in (from_date, to_date):
+            datetime.strptime(d.replace('-', ''), '%Y%m%d')
+    except ValueError:
+        ws.send(json.dumps({'type': 'error', 'error': f'날짜 형식 오류: {from_date} ~ {to_date}'}))
+        return
+
+    if mode == 'live':
+        feed = live_feed(ticker, from_date.replace('-', ''), poll=LIVE_POLL)
+    else:
+        pykrx_from, pykrx_to = trading_calendar.trim(from_date, to_date)
+        df = ohlcv_store.get(ticker, pykrx_from, pykrx_to) if pykrx_from else None
+        if df is None or df.empty:
+            ws.send(json.dumps({'type': 'error', 'error': '데이터 없음'}))
+            return
+        feed = replay_feed(df, _float_arg(args, 'interval', 0.2, 0, MAX_INTERVAL))
+
+    ws.send(json.dumps({'type': 'start', 'ticker': ticker, 'strategy': strat_name, 'mode': mode,
+                        'params': stream.params}))
+    deadline = time.monotonic() + MAX_FEED_SECONDS
+    for kind, bar in feed:
+        if time.monotonic() >= deadline:
+            ws.send(json.dumps({'type': 'error', 'error': f'최대 연결 시간({MAX_FEED_SECONDS}초)이 지나 종료합니다. 다시 시작하세요.'}))
+            return
+        if kind == 'wait':
+            # 새 봉이 없는 동안에도 보내서 끊긴 연결을 감지 (클라이언트는 무시)
+            ws.send(json.dumps({'type': 'wait'}))
+            continue
+        ws.send(json.dumps(stream.update(bar) if kind == 'bar' else stream.tick(bar)))
+    ws.send(json.dumps({'type': 'end', 'bars': stream.count}))
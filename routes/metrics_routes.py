@@ -0,0 +1,11 @@
+from flask import Blueprint, Response
+
+from monitoring.timing import render_metrics
+
+metrics_bp = Blueprint('metrics', __name__)
+
+
+@metrics_bp.route('/metrics')
+def metrics():
+    """Prometheus 수집용 요청/구간별 처리 시간 (텍스트 포맷)"""
+    return Response(render_metrics(), content_type='text/plain; version=0.0.4; charset=utf-8')
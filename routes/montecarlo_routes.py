@@ -0,0 +1,29 @@
+from flask import Blueprint, jsonify, request
+
+from engine import montecarlo
+from monitoring.timing import span
+
+montecarlo_bp = Blueprint('montecarlo', __name__)
+
+
+@montecarlo_bp.route('/api/montecarlo', methods=['POST'])
+def run_montecarlo():
+    """
+    매매 수익률 몬테카를로 요약 (백테스트 화면에서 버튼을 누를 때만 계산)
+    입력(JSON): returns(매매별 수익률 리스트, 백테스트 결과 stats.TradeReturns), method=bootstrap|shuffle
+    """
+    data = request.get_json(silent=True) or {}
+    method = data.get('method', 'bootstrap')
+    if method not in montecarlo.METHODS:
+        return jsonify({'error': f'지원하지 않는 방식: {method}'}), 400
+    returns = data.get('returns')
+    if not isinstance(returns, list) or not all(isinstance(r, (int, float)) for r in returns):
+        return jsonify({'error': 'returns는 숫자 리스트여야 합니다.'}), 400
+    if len(returns) > montecarlo.MAX_TRADES:
+        return jsonify({'error': f'매매 수가 너무 많습니다 (최대 {montecarlo.MAX_TRADES:,}건)'}), 400
+
+    with span('montecarlo'):
+        mc = montecarlo.summary(returns, method=method)
+    if mc is None:
+        return jsonify({'error': '매매가 2건 이상 필요합니다.'}), 400
+    return jsonify(mc)
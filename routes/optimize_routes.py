@@ -0,0 +1,153 @@
+from flask import Blueprint, render_template, request
+from datetime import datetime, timedelta
+import time
+import pandas as pd
+from bokeh.plotting import figure
+from bokeh.embed import components
+from bokeh.models import HoverTool, ColumnDataSource, ColorBar, Span
+from bokeh.transform import linear_cmap
+from bokeh.palettes import RdYlGn11
+
+from data.ohlcv_store import ohlcv_store
+from data.trading_calendar import trading_calendar
+from strategies.registry import STRATEGIES, DEFAULT_GRIDS
+from engine.sweep import METRICS, MAX_COMBOS, combo_count, parse_grid, run_sweep, heatmap_frame
+from engine.walkforward import DEFAULT_TRAIN, DEFAULT_TEST, run_walkforward
+from routes.bokeh_static import bokeh_resources
+
+optimize_bp = Blueprint('optimize', __name__)
+
+MODES = ['sweep', 'walkforward']
+
+
+def _grid_text(strat_name):
+    return '\n'.join(f'{k}={v}' for k, v in DEFAULT_GRIDS.get(strat_name, {}).items())
+
+
+def _sweep_chart(result, names, metric):
+    """파라미터 2개 이상이면 히트맵, 1개면 라인 차트"""
+    if len(names) >= 2:
+        x, y = names[0], names[1]
+        hm = heatmap_frame(result, x, y, metric)
+        hm[x], hm[y] = hm[x].astype(str), hm[y].astype(str)
+        x_range = [str(v) for v in sorted(result[x].unique())]
+        y_range = [str(v) for v in sorted(result[y].unique())]
+        mapper = linear_cmap(metric, RdYlGn11[::-1], low=hm[metric].min(), high=hm[metric].max())
+        p = figure(title=f"{metric} 히트맵 ({x} x {y})", x_range=x_range, y_range=y_range,
+                   height=450, sizing_mode='stretch_width', tools="hover,save", toolbar_location='right',
+                   tooltips=[(x, f"@{{{x}}}"), (y, f"@{{{y}}}"), (metric, f"@{{{metric}}}{{0.00}}")])
+        p.rect(x=x, y=y, width=1, height=1, source=ColumnDataSource(hm), fill_color=mapper, line_color=None)
+        p.add_layout(ColorBar(color_mapper=mapper['transform']), 'right')
+        p.xaxis.axis_label, p.yaxis.axis_label = x, y
+        return p
+
+    x = names[0]
+    line_df = result.sort_values(x)
+    p = figure(title=f"{metric} vs {x}", height=350, sizing_mode='stretch_width')
+    r = p.line(x, metric, source=ColumnDataSource(line_df), line_width=2)
+    p.scatter(x, metric, source=ColumnDataSource(line_df), size=6)
+    p.add_tools(HoverTool(renderers=[r], tooltips=[(x, f"@{{{x}}}"), (metric, f"@{{{metric}}}{{0.00}}")]))
+    return p
+
+
+def _walkforward_chart(result):
+    """이어 붙인 표본 외 자산 곡선 + 같은 구간 보유, 폴드 경계는 세로선"""
+    equity, benchmark = result['equity'], result['benchmark']
+    source = ColumnDataSource({'date': equity.index, 'equity': equity.values, 'benchmark': benchmark.values})
+    p = figure(title="표본 외 자산 곡선 (워크 포워드)", x_axis_type='datetime', height=380,
+               sizing_mode='stretch_width', tools="pan,xwheel_zoom,box_zoom,reset,save")
+    r = p.line('date', 'equity', source=source, line_width=2, color='#27ae60', legend_label='워크 포워드')
+    p.line('date', 'benchmark', source=source, line_width=1, color='#7f8c8d', line_dash='dashed',
+           legend_label='보유')
+    for test in result['folds']['Test']:
+        p.add_layout(Span(location=pd.Timestamp(test.split(' ~ ')[0]), dimension='height',
+                          line_color='#bdc3c7', line_dash='dotted', line_width=1))
+    p.add_tools(HoverTool(renderers=[r], mode='vline', formatters={'@date': 'datetime'},
+                          tooltips=[('날짜', '@date{%F}'), ('자산', '@equity{0,0}'), ('보유', '@benchmark{0,0}')]))
+    p.legend.location = 'top_left'
+    return p
+
+
+def _int_arg(name, default, low, high):
+    try:
+        return max(low, min(high, int(request.form.get(name, default))))
+    except (TypeError, ValueError):
+        return default
+
+
+@optimize_bp.route('/optimize', methods=['GET', 'POST'])
+def optimize():
+    default_to = datetime.now().strftime('%Y-%m-%d')
+    default_from = (datetime.now() - timedelta(days=365 * 3)).strftime('%Y-%m-%d')
+
+    ticker = request.values.get('ticker', '005930')
+    strat_name = request.values.get('strategy', 'cross')
+    if strat_name not in STRATEGIES:
+        strat_name = 'cross'
+    from_date = request.form.get('from_date', default_from)
+    to_date = request.form.get('to_date', default_to)
+    metric = request.form.get('metric', 'Return [%]')
+    grid_text = request.form.get('grid') or _grid_text(strat_name)
+    mode = request.form.get('mode', 'sweep')
+    if mode not in MODES:
+        mode = 'sweep'
+    train = _int_arg('train', DEFAULT_TRAIN, 20, 2500)
+    test = _int_arg('test', DEFAULT_TEST, 5, 1000)
+
+    ctx = dict(ticker=ticker, strategy=strat_name, strategies=list(STRATEGIES), from_date=from_date,
+               to_date=to_date, metric=metric, metrics=METRICS, grid=grid_text, mode=mode, train=train, test=test,
+               resources=bokeh_resources())
+
+    if request.method != 'POST':
+        return render_template('optimize.html', **ctx)
+
+    if metric not in METRICS:
+        return render_template('optimize.html', error=f"지원하지 않는 지표: {metric}", **ctx), 400
+    try:
+        grid = parse_grid(grid_text)
+    except ValueError as e:
+        return render_template('optimize.html', error=f"파라미터 범위 오류: {e}", **ctx), 400
+
+    try:
+        if not grid:
+            return render_template('optimize.html', error="탐색할 파라미터를 입력하세요.", **ctx)
+        n_combos = combo_count(grid)
+        if n_combos > MAX_COMBOS:
+            return render_template('optimize.html', error=f"조합이 너무 많습니다 ({n_combos:,}개, 최대 {MAX_COMBOS:,}개)",
+                                   **ctx), 400
+
+        pykrx_from, pykrx_to = trading_calendar.trim(from_date, to_date)
+        df = ohlcv_store.get(ticker, pykrx_from, pykrx_to) if pykrx_from else pd.DataFrame()
+        if df.empty:
+            return render_template('optimize.html', error="데이터 없음", **ctx)
+
+        if mode == 'walkforward':
+            started = time.perf_counter()
+            result = run_walkforward(df, strat_name, grid, metric=metric, train=train, test=test)
+            elapsed = time.perf_counter() - started
+
+            script, div = components(_walkforward_chart(result))
+            folds = result['folds']
+            return render_template('optimize.html', script=script, div=div, summary=result['stats'],
+                                   fold_rows=folds.round(4).to_dict('records'), fold_columns=list(folds.columns),
+                                   n_folds=len(folds), n_combos=n_combos,
+                                   elapsed=f"{elapsed:.2f}", **ctx)
+
+        started = time.perf_counter()
+        result = run_sweep(df, strat_name, grid, metric=metric)
+        elapsed = time.perf_counter() - started
+
+        # 실패한 조합은 메시지별 건수로 따로 표시 (결과표/차트에는 NaN으로 남음)
+        failed = result['Error'] != ''
+        errors = result.loc[failed, 'Error'].value_counts().head(5)
+        result = result.drop(columns='Error')
+        script, div = components(_sweep_chart(result, list(grid), metric))
+        return render_template('optimize.html', script=script, div=div,
+                               rows=result.head(30).round(4).to_dict('records'), columns=list(result.columns),
+                               n_combos=len(result), n_failed=int(failed.sum()), errors=errors.items(),
+                               elapsed=f"{elapsed:.2f}", **ctx)
+
+    except Exception as e:
+        import traceback
+        print(traceback.format_exc())
+        return render_template('optimize.html', error=f"에러: {e}", **ctx)
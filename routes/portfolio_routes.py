@@ -0,0 +1,108 @@
+from flask import Blueprint, render_template, request
+from datetime import datetime, timedelta
+import time
+from bokeh.plotting import figure
+from bokeh.embed import components
+from bokeh.layouts import column
+from bokeh.models import HoverTool, ColumnDataSource
+
+from data.trading_calendar import trading_calendar
+from engine import portfolio
+from engine.batch import parse_tickers
+from monitoring.timing import span
+from routes.bokeh_static import bokeh_resources
+from strategies.registry import STRATEGIES
+
+portfolio_bp = Blueprint('portfolio', __name__)
+
+MAX_TRADE_ROWS = 200
+
+
+def _int_arg(name, default, low, high):
+    try:
+        return max(low, min(high, int(request.form.get(name, default))))
+    except (TypeError, ValueError):
+        return default
+
+
+def _equity_chart(result):
+    """포트폴리오 자산 곡선 + 균등 비중 기준선, 아래에 보유 종목 수"""
+    source = ColumnDataSource({'date': result['equity'].index, 'equity': result['equity'].values,
+                               'benchmark': result['benchmark'].values, 'positions': result['positions'].values})
+    p = figure(title="자산 곡선", x_axis_type='datetime', height=380, sizing_mode='stretch_width',
+               tools="pan,xwheel_zoom,box_zoom,reset,save")
+    r = p.line('date', 'equity', source=source, line_width=2, color='#27ae60', legend_label='포트폴리오')
+    p.line('date', 'benchmark', source=source, line_width=1, color='#7f8c8d', line_dash='dashed',
+           legend_label='균등 비중 보유')
+    p.add_tools(HoverTool(renderers=[r], mode='vline', formatters={'@date': 'datetime'},
+                          tooltips=[('날짜', '@date{%F}'), ('자산', '@equity{0,0}'), ('기준', '@benchmark{0,0}'),
+                                    ('보유 종목', '@positions')]))
+    p.legend.location = 'top_left'
+
+    pos = figure(x_range=p.x_range, x_axis_type='datetime', height=120, sizing_mode='stretch_width',
+                 tools="", toolbar_location=None)
+    pos.step('date', 'positions', source=source, mode='after', color='#2c3e50')
+    pos.yaxis.axis_label = '보유 종목'
+    return column(p, pos, sizing_mode='stretch_width')
+
+
+@portfolio_bp.route('/portfolio', methods=['GET', 'POST'])
+def portfolio_backtest():
+    default_to = datetime.now().strftime('%Y-%m-%d')
+    default_from = (datetime.now() - timedelta(days=365 * 3)).strftime('%Y-%m-%d')
+
+    strat_name = request.form.get('strategy', 'slope')
+    if strat_name not in STRATEGIES:
+        strat_name = 'slope'
+    from_date = request.form.get('from_date', default_from)
+    to_date = request.form.get('to_date', default_to)
+    top = _int_arg('top', 10, 1, 100)
+    rebalance = _int_arg('rebalance', 21, 0, 250)
+    lookback = _int_arg('lookback', 60, 1, 250)
+    weighting = request.form.get('weighting', 'equal')
+    if weighting not in portfolio.WEIGHTINGS:
+        weighting = 'equal'
+
+    # 티커 입력: ETF/종목 필터링 결과(hidden) 또는 직접 입력
+    tickers = parse_tickers(request.form.get('tickers', ''))
+
+    ctx = dict(strategy=strat_name, strategies=list(STRATEGIES), from_date=from_date, to_date=to_date,
+               top=top, rebalance=rebalance, lookback=lookback, weighting=weighting,
+               weightings=portfolio.WEIGHTINGS, tickers='\n'.join(tickers), n_tickers=len(tickers),
+               metrics=portfolio.SUMMARY_METRICS, resources=bokeh_resources())
+
+    # 'run' 없이 들어온 POST는 필터링 화면에서 넘어온 티커로 폼만 채워서 보여줌
+    if request.method != 'POST' or 'run' not in request.form or not tickers:
+        return render_template('portfolio.html', **ctx)
+
+    try:
+        pykrx_from, pykrx_to = trading_calendar.trim(from_date, to_date)
+        if pykrx_from is None:
+            return render_template('portfolio.html', error="데이터 없음", **ctx)
+
+        with span('ohlcv'):
+            panel, errors = portfolio.load_panel(tickers, pykrx_from, pykrx_to)
+        if panel is None or len(panel) < 2:
+            return render_template('portfolio.html', error="데이터 없음", errors=errors, **ctx)
+
+        started = time.perf_counter()
+        with span('portfolio'):
+            result = portfolio.run(panel, strat_name, top=top, rebalance=rebalance, lookback=lookback,
+                                   weighting=weighting)
+        elapsed = time.perf_counter() - started
+
+        with span('layout'):
+            script, div = components(_equity_chart(result))
+
+        stats = result['stats']
+        summary = {m: stats[m] for m in portfolio.SUMMARY_METRICS if m in stats}
+        trades = result['trades'].iloc[::-1].head(MAX_TRADE_ROWS)
+        return render_template('portfolio.html', script=script, div=div, summary=summary,
+                               trades=trades.to_dict('records'), n_trades=len(result['trades']),
+                               holdings=result['holdings'].to_dict('records'), errors=errors,
+                               shape=panel.shape, elapsed=f"{elapsed:.2f}", **ctx)
+
+    except Exception as e:
+        import traceback
+        print(traceback.format_exc())
+        return render_template('portfolio.html', error=f"에러: {e}", **ctx)
@@ -0,0 +1,77 @@
+from flask import Blueprint, render_template, request
+from pykrx import stock
+from datetime import datetime
+import time
+
+from data.snapshot_cache import snapshot_cache
+from data.trading_calendar import trading_calendar
+from engine.scanner import SIDES, signal_table
+from monitoring.timing import span
+from strategies.registry import STRATEGIES
+
+scan_bp = Blueprint('scan', __name__)
+
+
+def _names(date):
+    """티커 -> 종목명 (종목 필터링 화면과 같은 전종목 스냅샷)"""
+    df = snapshot_cache.get('market_price_change', date, lambda: stock.get_market_price_change(date, date))
+    return df['종목명'].to_dict() if '종목명' in df else {}
+
+
+@scan_bp.route('/scan')
+def scan():
+    """
+    전종목 장 마감 신호 조회
+    입력(쿼리): date, strategy, side=entry|exit, run=1(저장된 스캔이 없을 때 백그라운드 스캔 시작)
+    저장된 날짜별 신호 테이블에서 조회만 하고, 스캔은 python -m engine.scanner(장 마감 후) 또는
+    run=1일 때 백그라운드 스레드에서 실행 (화면은 끝날 때까지 몇 초마다 새로고침)
+    """
+    default_date = datetime.now().strftime('%Y-%m-%d')
+    date_input = request.args.get('date', default_date)
+    strat_name = request.args.get('strategy', 'slope')
+    if strat_name not in STRATEGIES:
+        strat_name = 'slope'
+    side = request.args.get('side', 'entry')
+    if side not in SIDES:
+        side = 'entry'
+    ctx = dict(strategy=strat_name, strategies=list(STRATEGIES), side=side)
+
+    try:
+        with span('calendar'):
+            session = trading_calendar.latest_session(date_input)
+    except ValueError:
+        return render_template('scan.html', date=date_input, error=f"날짜 형식 오류: {date_input}", **ctx), 400
+    if session is None:
+        return render_template('scan.html', date=date_input, error="거래일 없음", **ctx)
+    ctx['date'] = datetime.strptime(session, '%Y%m%d').strftime('%Y-%m-%d')
+
+    try:
+        started = time.perf_counter()
+        with span('scan'):
+            table = signal_table.get(session, scan=False)
+        if table is None:
+            future = signal_table.scan_async(session) if request.args.get('run') == '1' else signal_table.pending(session)
+            if future is None:
+                return render_template('scan.html', missing=True, **ctx)
+            if not future.done():
+                return render_template('scan.html', scanning=True, **ctx)
+            if future.exception() is not None:
+                return render_template('scan.html', missing=True, error=f"스캔 실패: {future.exception()}", **ctx)
+            table = future.result()
+        elapsed = time.perf_counter() - started
+
+        rows = signal_table.lookup(session, strat_name, side)
+        if rows is None:
+            return render_template('scan.html', counts=table['counts'], error=f"스캔 결과에 없는 전략: {strat_name}",
+                                   **ctx)
+        with span('names'):
+            names = _names(session)
+        rows['종목명'] = rows['티커'].map(names).fillna('')
+        return render_template('scan.html', counts=table['counts'], rows=rows.to_dict('records'),
+                               tickers=rows['티커'].tolist(), universe=len(table['tickers']),
+                               elapsed=f"{elapsed:.2f}", **ctx)
+
+    except Exception as e:
+        import traceback
+        print(traceback.format_exc())
+        return render_template('scan.html', error=f"에러: {e}", **ctx)
@@ -1,23 +1,11 @@
-import pandas as pd
 from backtesting import Strategy
 from backtesting.lib import crossover
+from strategies.indicators import SMA, RSI_Indicator as RSI, MACD_Indicator
 
 # --- 지표 계산용 보조 함수들 ---
-def SMA(values, n):
-    return pd.Series(values).rolling(n).mean()
-
-def RSI(values, n=14):
-    delta = pd.Series(values).diff()
-    gain = (delta.where(delta > 0, 0)).rolling(n).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(n).mean()
-    rs = gain / loss
-    return 100 - (100 / (1 + rs))
-
 def MACD(values, n_fast=12, n_slow=26, n_signal=9):
-    fast_ema = pd.Series(values).ewm(span=n_fast).mean()
-    slow_ema = pd.Series(values).ewm(span=n_slow).mean()
-    macd_line = fast_ema - slow_ema
-    signal_line = macd_line.ewm(span=n_signal).mean()
+    # 복합 전략은 ewm 기본값(adjust=True) 기준 MACD 사용
+    macd_line, signal_line, _ = MACD_Indicator(values, n_fast, n_slow, n_signal, adjust=True)
     return macd_line, signal_line
 
 # --- 복합 전략 클래스 ---
@@ -1,14 +1,14 @@
-import pandas as pd
 import numpy as np
 from backtesting import Strategy
+from strategies.indicators import HIGHEST, LOWEST
 
 class FibonacciStrategy(Strategy):
     n_lookback = 50  # 고점/저점을 찾을 기간
     
     def init(self):
         # 1. 특정 기간 내 최고가와 최저가 탐색 (Indicator 등록)
-        self.hh = self.I(lambda x: pd.Series(x).rolling(self.n_lookback).max().shift(1), self.data.High)
-        self.ll = self.I(lambda x: pd.Series(x).rolling(self.n_lookback).min().shift(1), self.data.Low)
+        self.hh = self.I(HIGHEST, self.data.High, self.n_lookback, 1)
+        self.ll = self.I(LOWEST, self.data.Low, self.n_lookback, 1)
 
     def next(self):
         if np.isnan(self.hh[-1]) or np.isnan(self.ll[-1]):
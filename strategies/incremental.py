@@ -0,0 +1,226 @@
+import math
+from collections import deque
+import numpy as np
+
+# --- 증분 지표: 새 봉 하나를 받아 상수 시간에 갱신 (strategies/indicators.py의 전체 재계산과 같은 값) ---
+# 모든 클래스는 update(...)가 현재 값을 반환하고 value(또는 values)에 마지막 값을 보관
+# 유효값이 나오기 전(워밍업)에는 NaN
+
+
+def _div(a, b):
+    # pandas 나눗셈과 같은 결과 (0으로 나누면 inf/NaN, 예외 없음)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return float(np.float64(a) / b)
+
+
+class RollingMean:
+    """
+    n기간 단순 이동평균 (pandas rolling(n).mean()과 같은 보정 합산)
+    구간 합은 더하기/빼기 보정값을 따로 두는 Kahan 합산, 구간 안에 NaN이 있으면 NaN
+    """
+
+    def __init__(self, n):
+        self.n = n
+        self.window = deque()
+        self.nobs = 0
+        self.sum = 0.0
+        self.neg_ct = 0
+        self.comp_add = 0.0
+        self.comp_remove = 0.0
+        self.same_ct = 0
+        self.prev = math.nan
+        self.value = math.nan
+
+    def _add(self, x):
+        if x != x:
+            return
+        self.nobs += 1
+        y = x - self.comp_add
+        t = self.sum + y
+        self.comp_add = t - self.sum - y
+        self.sum = t
+        if math.copysign(1, x) < 0:
+            self.neg_ct += 1
+        self.same_ct = self.same_ct + 1 if x == self.prev else 1
+        self.prev = x
+
+    def _remove(self, x):
+        if x != x:
+            return
+        self.nobs -= 1
+        y = -x - self.comp_remove
+        t = self.sum + y
+        self.comp_remove = t - self.sum - y
+        self.sum = t
+        if math.copysign(1, x) < 0:
+            self.neg_ct -= 1
+
+    def update(self, x):
+        x = float(x)
+        if self.n <= 1:
+            # 구간 길이 1은 입력값 그대로 (pandas도 매 봉 합계를 새로 시작)
+            self.value = x
+            return x
+        self.window.append(x)
+        if len(self.window) > self.n:
+            self._remove(self.window.popleft())
+        self._add(x)
+
+        if self.nobs >= self.n and self.nobs > 0:
+            value = self.sum / self.nobs
+            if self.same_ct >= self.nobs:
+                value = self.prev
+            elif self.neg_ct == 0 and value < 0:
+                value = 0.0
+            elif self.neg_ct == self.nobs and value > 0:
+                value = 0.0
+        else:
+            value = math.nan
+        self.value = value
+        return value
+
+
+class RollingExtreme:
+    """
+    n기간 최고값/최저값 (단조 deque, 봉당 분할 상환 O(1))
+    shift=1이면 직전 봉까지의 값 (indicators.HIGHEST/LOWEST의 shift와 같음)
+    """
+
+    def __init__(self, n, mode='max', shift=0):
+        self.n = n
+        self.sign = 1 if mode == 'max' else -1
+        self.shift = shift
+        self.count = 0
+        self.nobs = deque()        # 구간 안 유효값 위치
+        self.candidates = deque()  # (위치, 값) - 값이 단조 감소(max) / 증가(min)
+        self.history = deque(maxlen=shift + 1)
+        self.value = math.nan
+
+    def update(self, x):
+        x = float(x)
+        i = self.count
+        self.count += 1
+        if x == x:
+            self.nobs.append(i)
+            while self.candidates and self.sign * self.candidates[-1][1] <= self.sign * x:
+                self.candidates.pop()
+            self.candidates.append((i, x))
+        while self.nobs and self.nobs[0] <= i - self.n:
+            self.nobs.popleft()
+        while self.candidates and self.candidates[0][0] <= i - self.n:
+            self.candidates.popleft()
+
+        current = self.candidates[0][1] if len(self.nobs) >= self.n and self.candidates else math.nan
+        self.history.append(current)
+        self.value = self.history[0] if len(self.history) > self.shift else math.nan
+        return self.value
+
+
+class Ewm:
+    """
+    지수 가중 평균 (pandas ewm(alpha|span, adjust).mean(), ignore_na=False와 같은 계산)
+    NaN 입력은 이전 값을 유지하고 가중치만 감소
+    """
+
+    def __init__(self, alpha=None, span=None, adjust=False):
+        self.alpha = alpha if alpha is not None else 2 / (span + 1)
+        self.adjust = adjust
+        self.old_wt = 1.0
+        self.value = math.nan
+
+    def update(self, x):
+        x = float(x)
+        new_wt = 1.0 if self.adjust else self.alpha
+        if self.value == self.value:
+            self.old_wt *= 1 - self.alpha
+            if x == x:
+                if self.value != x:
+                    self.value = (self.old_wt * self.value + new_wt * x) / (self.old_wt + new_wt)
+                self.old_wt = self.old_wt + new_wt if self.adjust else 1.0
+        elif x == x:
+            self.value = x
+        return self.value
+
+
+class RSI:
+    """RSI_Indicator 증분 버전 (상승폭/하락폭 n기간 단순 평균)"""
+
+    def __init__(self, n=14):
+        self.gain = RollingMean(n)
+        self.loss = RollingMean(n)
+        self.prev = math.nan
+        self.value = math.nan
+
+    def update(self, close):
+        close = float(close)
+        delta = close - self.prev
+        self.prev = close
+        gain = self.gain.update(delta if delta > 0 else 0.0)
+        loss = self.loss.update(-(delta if delta < 0 else 0.0))
+        self.value = 100 - _div(100, 1 + _div(gain, loss))
+        return self.value
+
+
+class MACD:
+    """MACD_Indicator 증분 버전 -> (macd, signal, histogram)"""
+
+    def __init__(self, n_fast=12, n_slow=26, n_signal=9, adjust=False):
+        self.fast = Ewm(span=n_fast, adjust=adjust)
+        self.slow = Ewm(span=n_slow, adjust=adjust)
+        self.signal = Ewm(span=n_signal, adjust=adjust)
+        self.values = (math.nan, math.nan, math.nan)
+
+    def update(self, close):
+        macd = self.fast.update(close) - self.slow.update(close)
+        signal = self.signal.update(macd)
+        self.values = (macd, signal, macd - signal)
+        return self.values
+
+
+class ADX:
+    """ADX_Indicator 증분 버전 (Wilder 평활) -> (adx, +DI, -DI)"""
+
+    def __init__(self, n=14):
+        alpha = 1 / n
+        self.atr = Ewm(alpha=alpha)
+        self.plus = Ewm(alpha=alpha)
+        self.minus = Ewm(alpha=alpha)
+        self.adx = Ewm(alpha=alpha)
+        self.prev = (math.nan, math.nan, math.nan)   # 직전 봉 (고가, 저가, 종가)
+        self.values = (math.nan, math.nan, math.nan)
+
+    def update(self, high, low, close):
+        high, low, close = float(high), float(low), float(close)
+        prev_high, prev_low, prev_close = self.prev
+        self.prev = (high, low, close)
+
+        tr = float(np.fmax(np.fmax(high - low, abs(high - prev_close)), abs(low - prev_close)))
+        up, down = high - prev_high, -(low - prev_low)
+        plus_dm = up if up != up or up >= 0 else 0.0
+        minus_dm = down if down != down or down >= 0 else 0.0
+
+        atr = self.atr.update(tr)
+        plus_di = 100 * _div(self.plus.update(plus_dm), atr)
+        minus_di = 100 * _div(self.minus.update(minus_dm), atr)
+        dx = _div(100 * abs(plus_di - minus_di), plus_di + minus_di)
+        self.values = (self.adx.update(dx), plus_di, minus_di)
+        return self.values
+
+
+class VWAP:
+    """VWAP_Indicator 증분 버전 (누적 거래대금 / 누적 거래량, NaN 봉은 누적에서 제외)"""
+
+    def __init__(self):
+        self.pv = 0.0
+        self.volume = 0.0
+        self.value = math.nan
+
+    def update(self, high, low, close, volume):
+        volume = float(volume)
+        pv = (float(high) + float(low) + float(close)) / 3 * volume
+        if pv == pv:
+            self.pv += pv
+        if volume == volume:
+            self.volume += volume
+        self.value = _div(self.pv, self.volume) if pv == pv and volume == volume else math.nan
+        return self.value
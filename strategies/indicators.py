@@ -0,0 +1,149 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import wraps
+import numpy as np
+import pandas as pd
+
+# --- 공용 지표 캐시 ---
+# 키: (입력 시계열 fingerprint, 지표 이름, 파라미터)
+# 전략(self.I)과 차트 생성부가 같은 요청 안에서 같은 계산을 공유
+# 항목 수와 전체 바이트 중 하나라도 넘으면 오래된 것부터 제거 (긴 분봉 이력 대비)
+CACHE_SIZE = 256
+CACHE_BYTES = 256 * 1024 * 1024
+_cache = OrderedDict()
+_cache_bytes = 0
+_cache_lock = threading.Lock()
+
+
+def fingerprint(values):
+    """시계열 내용 기반 해시 (pandas Series / numpy 배열 / backtesting _Array 모두 동일 취급, 2차원은 열 단위 시계열)"""
+    arr = np.ascontiguousarray(np.asarray(values, dtype='float64'))
+    return f"{arr.shape}:{hashlib.blake2b(arr.tobytes(), digest_size=16).hexdigest()}"
+
+
+def _freeze(result):
+    # 캐시된 배열이 호출측에서 수정되지 않도록 읽기 전용으로 고정
+    if isinstance(result, tuple):
+        return tuple(_freeze(r) for r in result)
+    arr = np.asarray(result, dtype='float64')
+    arr.flags.writeable = False
+    return arr
+
+
+def _nbytes(result):
+    return sum(r.nbytes for r in result) if isinstance(result, tuple) else result.nbytes
+
+
+def _frame(values):
+    arr = np.asarray(values, dtype='float64')
+    return pd.Series(arr) if arr.ndim == 1 else pd.DataFrame(arr)
+
+
+def memoized(n_series):
+    """앞의 n_series개 인자를 시계열로 보고 결과를 LRU 캐시하는 데코레이터"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            global _cache_bytes
+            series, params = args[:n_series], args[n_series:]
+            key = (tuple(fingerprint(s) for s in series), func.__name__, params, tuple(sorted(kwargs.items())))
+            with _cache_lock:
+                if key in _cache:
+                    _cache.move_to_end(key)
+                    return _cache[key]
+            # 2차원 입력(날짜 x 종목)은 DataFrame으로 넘겨서 열마다 같은 계산
+            arrays = [_frame(s) for s in series]
+            result = _freeze(func(*arrays, *params, **kwargs))
+            with _cache_lock:
+                if key not in _cache:
+                    _cache[key] = result
+                    _cache_bytes += _nbytes(result)
+                while _cache and (len(_cache) > CACHE_SIZE or _cache_bytes > CACHE_BYTES):
+                    _cache_bytes -= _nbytes(_cache.popitem(last=False)[1])
+            return result
+        return wrapper
+    return decorator
+
+
+def clear_cache():
+    global _cache_bytes
+    with _cache_lock:
+        _cache.clear()
+        _cache_bytes = 0
+
+
+# --- 지표 함수 (입력: 시계열, 반환: numpy 배열 또는 배열 튜플) ---
+@memoized(1)
+def SMA(values, n):
+    """단순 이동평균"""
+    return values.rolling(n).mean()
+
+
+@memoized(1)
+def HIGHEST(values, n, shift=0):
+    """n기간 최고값 (shift=1이면 전일까지의 최고값)"""
+    return values.rolling(n).max().shift(shift)
+
+
+@memoized(1)
+def LOWEST(values, n, shift=0):
+    """n기간 최저값 (shift=1이면 전일까지의 최저값)"""
+    return values.rolling(n).min().shift(shift)
+
+
+@memoized(1)
+def RSI_Indicator(values, n=14):
+    """
+    RSI (Relative Strength Index) 계산
+    """
+    delta = values.diff()
+    gain = (delta.where(delta > 0, 0)).rolling(window=n).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=n).mean()
+    rs = gain / loss
+    return 100 - (100 / (1 + rs))
+
+
+@memoized(1)
+def MACD_Indicator(values, n_fast=12, n_slow=26, n_signal=9, adjust=False):
+    """
+    MACD Line, Signal Line, Histogram을 계산하여 반환
+    adjust: pandas ewm의 adjust 옵션 (복합 전략은 True 사용)
+    """
+    fast_ema = values.ewm(span=n_fast, adjust=adjust).mean()
+    slow_ema = values.ewm(span=n_slow, adjust=adjust).mean()
+    macd_line = fast_ema - slow_ema
+    signal_line = macd_line.ewm(span=n_signal, adjust=adjust).mean()
+    histogram = macd_line - signal_line
+    return macd_line, signal_line, histogram
+
+
+@memoized(3)
+def ADX_Indicator(high, low, close, n=14):
+    """ADX, +DI, -DI를 계산하여 반환"""
+    # 세 값 중 최댓값 (NaN은 무시, Series/DataFrame 공용)
+    tr = np.fmax(np.fmax(high - low, (high - close.shift(1)).abs()), (low - close.shift(1)).abs())
+
+    plus_dm = high.diff().clip(lower=0)
+    minus_dm = (-low.diff()).clip(lower=0)
+
+    # Wilder's Smoothing (EMA와 유사)
+    atr = tr.ewm(alpha=1/n, adjust=False).mean()
+    plus_di = 100 * (plus_dm.ewm(alpha=1/n, adjust=False).mean() / atr)
+    minus_di = 100 * (minus_dm.ewm(alpha=1/n, adjust=False).mean() / atr)
+
+    dx = 100 * abs(plus_di - minus_di) / (plus_di + minus_di)
+    adx = dx.ewm(alpha=1/n, adjust=False).mean()
+    return adx, plus_di, minus_di
+
+
+@memoized(4)
+def VWAP_Indicator(high, low, close, volume):
+    """
+    데일리 차트 기준 누적 VWAP 계산
+    Typical Price = (High + Low + Close) / 3
+    VWAP = Cumulative(Typical Price * Volume) / Cumulative(Volume)
+    """
+    typical_price = (high + low + close) / 3
+    pv = typical_price * volume
+    return pv.cumsum() / volume.cumsum()
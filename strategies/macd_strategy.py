@@ -1,21 +1,6 @@
-import pandas as pd
 from backtesting import Strategy
 from backtesting.lib import crossover
-
-# --- MACD 계산 함수 ---
-def MACD_Indicator(values, n_fast=12, n_slow=26, n_signal=9):
-    """
-    MACD Line, Signal Line, Histogram을 계산하여 반환
-    """
-    close_ser = pd.Series(values)
-    fast_ema = close_ser.ewm(span=n_fast, adjust=False).mean()
-    slow_ema = close_ser.ewm(span=n_slow, adjust=False).mean()
-    
-    macd_line = fast_ema - slow_ema
-    signal_line = macd_line.ewm(span=n_signal, adjust=False).mean()
-    histogram = macd_line - signal_line
-    
-    return macd_line, signal_line, histogram
+from strategies.indicators import MACD_Indicator
 
 # --- MACD 전략 클래스 ---
 class MacdStrategy(Strategy):
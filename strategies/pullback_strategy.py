@@ -1,6 +1,6 @@
-import pandas as pd
 from backtesting import Strategy
 from backtesting.lib import crossover
+from strategies.indicators import SMA
 
 class SmaPullbackStrategy(Strategy):
     n_fast = 20
@@ -8,9 +8,8 @@ class SmaPullbackStrategy(Strategy):
     
     def init(self):
         # 지표 계산
-        close = pd.Series(self.data.Close)
-        self.sma20 = self.I(lambda x: x.rolling(self.n_fast).mean(), close)
-        self.sma60 = self.I(lambda x: x.rolling(self.n_slow).mean(), close)
+        self.sma20 = self.I(SMA, self.data.Close, self.n_fast)
+        self.sma60 = self.I(SMA, self.data.Close, self.n_slow)
 
     def next(self):
         # 1. 상승 추세 필터: 주가가 60일선 위에 있고, 20일선이 60일선 위에 있을 때 (정배열)
@@ -0,0 +1,43 @@
+from strategies.fibonacci_strategy import FibonacciStrategy
+from strategies.macd_strategy import MacdStrategy
+from strategies.rsi_divergence import RsiDivergenceStrategy
+from strategies.rsi_strategy import RsiStrategy
+from strategies.rsi_support_strategy import RsiSupportStrategy
+from strategies.sma_strategies import SmaSlopeStrategy, SmaCrossStrategy
+from strategies.custom_strategies import ComplexTrendStrategy
+from strategies.adx_strategy import AdxStrategy
+from strategies.sr_flip_strategy import SrFlipStrategy
+from strategies.volatility_breakout import VolatilityBreakout
+from strategies.vwap_strategy import VwapStrategy
+
+# 전략 매핑 딕셔너리 (화면/배치/최적화 공용)
+STRATEGIES = {
+    'slope': SmaSlopeStrategy,
+    'cross': SmaCrossStrategy,
+    'complex': ComplexTrendStrategy,
+    'adx': AdxStrategy,
+    'macd': MacdStrategy,
+    'rsi': RsiStrategy,
+    'rsi_div': RsiDivergenceStrategy,
+    'rsi_support': RsiSupportStrategy,
+    'v_breakout': VolatilityBreakout,
+    'fibonacci': FibonacciStrategy,
+    'vwap': VwapStrategy,
+    'sr_flip': SrFlipStrategy
+}
+
+# 파라미터 최적화 화면의 기본 탐색 범위 (start:stop:step 또는 콤마 목록)
+DEFAULT_GRIDS = {
+    'slope': {'n1': '5:60:5'},
+    'cross': {'n_fast': '3:30:3', 'n_slow': '10:120:10'},
+    'complex': {'n_sma': '100:250:50', 'n_rsi': '7,14,21', 'n_macd_f': '8,12', 'n_macd_s': '21,26', 'n_macd_sig': '9'},
+    'adx': {'n': '7:28:7', 'adx_threshold': '15:40:5'},
+    'macd': {'n_fast': '6:18:2', 'n_slow': '20:40:4', 'n_signal': '5,7,9,11'},
+    'rsi': {'n_rsi': '7:28:7', 'rsi_low': '20:40:5', 'rsi_high': '60:80:5'},
+    'rsi_div': {'n_rsi': '7:28:7', 'lookback': '15:60:5'},
+    'rsi_support': {'n_rsi': '7:28:7', 'n_fast': '10:30:5', 'n_slow': '40:120:20'},
+    'v_breakout': {'k': '0.2:1.0:0.1'},
+    'fibonacci': {'n_lookback': '20:120:10'},
+    'vwap': {},
+    'sr_flip': {'n_lookback': '10:60:5', 'retest_threshold': '0.0025:0.02:0.0025'},
+}
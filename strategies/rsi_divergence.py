@@ -1,14 +1,23 @@
-import pandas as pd
 import numpy as np
 from backtesting import Strategy
 from backtesting.lib import crossover
+from strategies.indicators import RSI_Indicator
+
+def last_pivots(rsi):
+    """
+    위치 k 이하에서 가장 최근 RSI 저점/고점 인덱스 배열 (없으면 -1)
+    저점: rsi[p] < rsi[p-1] and rsi[p] < rsi[p+1] (NaN 비교는 False)
+    """
+    n = len(rsi)
+    is_low = np.zeros(n, dtype=bool)
+    is_high = np.zeros(n, dtype=bool)
+    with np.errstate(invalid='ignore'):
+        is_low[1:-1] = (rsi[1:-1] < rsi[:-2]) & (rsi[1:-1] < rsi[2:])
+        is_high[1:-1] = (rsi[1:-1] > rsi[:-2]) & (rsi[1:-1] > rsi[2:])
+    idx = np.arange(n)
+    return (np.maximum.accumulate(np.where(is_low, idx, -1)),
+            np.maximum.accumulate(np.where(is_high, idx, -1)))
 
-def RSI_Indicator(values, n=14):
-    delta = pd.Series(values).diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=n).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=n).mean()
-    rs = gain / loss
-    return 100 - (100 / (1 + rs))
 
 class RsiDivergenceStrategy(Strategy):
     n_rsi = 14
@@ -17,6 +26,12 @@ class RsiDivergenceStrategy(Strategy):
     def init(self):
         self.rsi = self.I(RSI_Indicator, self.data.Close, self.n_rsi)
 
+        # 각 봉 기준 가장 최근 RSI 저점/고점 위치를 미리 계산 (next()에서 O(1) 조회)
+        # 지표(self.I)로 등록하지 않아야 워밍업 구간이 바뀌지 않음
+        self._rsi = np.asarray(self.rsi, dtype=float)
+        self._close = np.asarray(self.data.Close, dtype=float)
+        self._last_low, self._last_high = last_pivots(self._rsi)
+
     def next(self):
         if len(self.data.Close) < self.lookback + 5:
             return
@@ -28,15 +43,15 @@ class RsiDivergenceStrategy(Strategy):
             current_price_low = self.data.Close[-2]
             
             # 그 이전의 저점 탐색 (lookback 범위 내)
+            # (5 ~ lookback-1봉 전 중 가장 최근 저점 = 4봉 전까지의 마지막 저점이 범위 안에 있을 때)
             prev_rsi_low = None
             prev_price_low = None
             
-            for i in range(5, self.lookback):
-                idx = -i
-                if self.rsi[idx] < self.rsi[idx-1] and self.rsi[idx] < self.rsi[idx+1]:
-                    prev_rsi_low = self.rsi[idx]
-                    prev_price_low = self.data.Close[idx]
-                    break
+            t = len(self.data.Close) - 1
+            p = self._last_low[t - 4]
+            if p >= t + 2 - self.lookback:
+                prev_rsi_low = self._rsi[p]
+                prev_price_low = self._close[p]
             
             # 조건: 주가 저점은 낮아졌는데, RSI 저점은 높아졌을 때
             if prev_rsi_low and current_rsi_low > prev_rsi_low and current_price_low < prev_price_low:
@@ -51,12 +66,11 @@ class RsiDivergenceStrategy(Strategy):
             prev_rsi_high = None
             prev_price_high = None
             
-            for i in range(5, self.lookback):
-                idx = -i
-                if self.rsi[idx] > self.rsi[idx-1] and self.rsi[idx] > self.rsi[idx+1]:
-                    prev_rsi_high = self.rsi[idx]
-                    prev_price_high = self.data.Close[idx]
-                    break
+            t = len(self.data.Close) - 1
+            p = self._last_high[t - 4]
+            if p >= t + 2 - self.lookback:
+                prev_rsi_high = self._rsi[p]
+                prev_price_high = self._close[p]
             
             # 조건: 주가 고점은 높아졌는데, RSI 고점은 낮아졌을 때
             if prev_rsi_high and current_rsi_high < prev_rsi_high and current_price_high > prev_price_high:
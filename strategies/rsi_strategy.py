@@ -1,19 +1,6 @@
-import pandas as pd
 from backtesting import Strategy
 from backtesting.lib import crossover
-
-# --- RSI 계산 함수 ---
-def RSI_Indicator(values, n=14):
-    """
-    RSI (Relative Strength Index) 계산
-    """
-    delta = pd.Series(values).diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=n).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=n).mean()
-    
-    rs = gain / loss
-    rsi = 100 - (100 / (1 + rs))
-    return rsi
+from strategies.indicators import RSI_Indicator
 
 # --- RSI 전략 클래스 ---
 class RsiStrategy(Strategy):
@@ -1,13 +1,6 @@
-import pandas as pd
 from backtesting import Strategy
 from backtesting.lib import crossover
-
-def RSI_Indicator(values, n=14):
-    delta = pd.Series(values).diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=n).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=n).mean()
-    rs = gain / loss
-    return 100 - (100 / (1 + rs))
+from strategies.indicators import RSI_Indicator, SMA
 
 class RsiSupportStrategy(Strategy):
     n_rsi = 14
@@ -15,10 +8,9 @@ class RsiSupportStrategy(Strategy):
     n_slow = 60
 
     def init(self):
-        close = pd.Series(self.data.Close)
-        self.rsi = self.I(RSI_Indicator, close, self.n_rsi)
-        self.sma20 = self.I(lambda x: x.rolling(self.n_fast).mean(), close)
-        self.sma60 = self.I(lambda x: x.rolling(self.n_slow).mean(), close)
+        self.rsi = self.I(RSI_Indicator, self.data.Close, self.n_rsi)
+        self.sma20 = self.I(SMA, self.data.Close, self.n_fast)
+        self.sma60 = self.I(SMA, self.data.Close, self.n_slow)
 
     def next(self):
         # 1. 상승장 필터: 20일선이 60일선 위에 있는 정배열 상태
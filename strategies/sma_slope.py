@@ -1,5 +1,5 @@
 from backtesting import Backtest, Strategy
-import pandas as pd
+from strategies.indicators import SMA
 
 
 class SmaSlopeStrategy(Strategy):
@@ -7,8 +7,7 @@ class SmaSlopeStrategy(Strategy):
 
     def init(self):
         # 20일 이동평균 계산 (self.I를 사용하여 지표 등록)
-        close = pd.Series(self.data.Close)
-        self.sma = self.I(lambda x: x.rolling(self.n1).mean(), close)
+        self.sma = self.I(SMA, self.data.Close, self.n1)
 
     def next(self):
         # 데이터가 충분하지 않으면 패스
@@ -1,13 +1,12 @@
-import pandas as pd
 from backtesting import Strategy
 from backtesting.lib import crossover
+from strategies.indicators import SMA
 
 # --- [전략 1] 이평선 기울기 반전 전략 ---
 class SmaSlopeStrategy(Strategy):
     n1 = 20
     def init(self):
-        close = pd.Series(self.data.Close)
-        self.sma = self.I(lambda x: x.rolling(self.n1).mean(), close)
+        self.sma = self.I(SMA, self.data.Close, self.n1)
 
     def next(self):
         if len(self.sma) < 3: return
@@ -23,9 +22,8 @@ class SmaCrossStrategy(Strategy):
     n_fast = 5
     n_slow = 20
     def init(self):
-        close = pd.Series(self.data.Close)
-        self.sma_f = self.I(lambda x: x.rolling(self.n_fast).mean(), close)
-        self.sma_s = self.I(lambda x: x.rolling(self.n_slow).mean(), close)
+        self.sma_f = self.I(SMA, self.data.Close, self.n_fast)
+        self.sma_s = self.I(SMA, self.data.Close, self.n_slow)
 
     def next(self):
         if crossover(self.sma_f, self.sma_s):
@@ -1,16 +1,13 @@
-import pandas as pd
-import numpy as np
 from backtesting import Strategy
+from strategies.indicators import HIGHEST
 
 class SrFlipStrategy(Strategy):
     n_lookback = 20  # 박스권 상단을 정의할 기간
     retest_threshold = 0.005  # 리테스트로 인정할 오차 범위 (0.5%)
 
     def init(self):
-        close = pd.Series(self.data.Close)
-        high = pd.Series(self.data.High)
         # 과거 n일 동안의 최고가 (저항선) 계산
-        self.resistance = self.I(lambda x: x.rolling(self.n_lookback).max().shift(1), high)
+        self.resistance = self.I(HIGHEST, self.data.High, self.n_lookback, 1)
         self.state = "IDLE"  # IDLE -> BREAKOUT -> RETEST -> LONG
         self.breakout_level = 0
 
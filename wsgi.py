@@ -0,0 +1,38 @@
+"""
+운영 서버 진입점: gunicorn -c gunicorn.conf.py wsgi:app
+(app.py의 app.run(debug=True)는 단일 프로세스 + 리로더 + 디버거라 개발용)
+
+- 백테스트는 요청 스레드가 아닌 프로세스 풀에서 실행 (JTRADER_OFFLOAD_BACKTESTS)
+- preload_app으로 마스터에서 한 번 임포트/캐시 준비 후 fork -> 워커가 그대로 공유
+- 지난 실행의 워커별 지표 파일은 fork 전에 삭제 (JTRADER_METRICS_DIR)
+"""
+import os
+import time
+
+os.environ.setdefault('JTRADER_OFFLOAD_BACKTESTS', '1')
+
+from app import app
+from monitoring.timing import clear_shared_metrics
+from data.trading_calendar import trading_calendar
+from routes.backtest_view import chart_template
+from routes.bokeh_static import preload_assets
+from strategies.registry import STRATEGIES
+
+
+def warm_caches():
+    """부팅 시 캐시 준비: 거래일 캘린더, BokehJS 번들 압축본, 전략별 차트 템플릿"""
+    start = time.perf_counter()
+    try:
+        trading_calendar.sessions()
+    except Exception as e:
+        # KRX 접속 실패로 서버가 뜨지 않는 일은 없도록 (첫 요청 때 다시 시도)
+        print(f'[warmup] 거래일 캘린더 조회 실패: {e}')
+    assets = preload_assets()
+    for strat_name in STRATEGIES:
+        chart_template(strat_name)
+    print(f'[warmup] BokehJS {assets}개, 차트 템플릿 {len(STRATEGIES)}개 준비 '
+          f'({time.perf_counter() - start:.2f}s)')
+
+
+clear_shared_metrics()
+warm_caches()